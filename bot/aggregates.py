@@ -0,0 +1,151 @@
+"""
+Recalcul des totaux des joueurs à partir de l'historique des matchs.
+
+    cd bot && python -m aggregates                 # rapport de dérive seulement
+    cd bot && python -m aggregates --appliquer     # corrige data.json
+
+Un seul passage sur les matchs : on n'accumule que les totaux par joueur,
+la mémoire ne dépend donc pas du nombre de matchs.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Champs des joueurs qui ne sont que la somme des contributions des matchs
+AGGREGATE_FIELDS = ("points", "wins", "losses", "draws", "matches", "goals", "assists", "mvps")
+
+# Écart toléré sur les points (parts de MVP arrondies à 1e-6 par le ledger)
+POINTS_TOLERANCE = 1e-5
+
+
+def match_contributions(match: dict):
+    """
+    Contributions d'un match : (pid, {champ: delta}).
+
+    Match avec ledger : les entrées telles qu'elles ont été appliquées.
+    Match d'avant le ledger : résultat et MVP recalculés d'après le score et
+    mvp_winners (les buts / passes de ces matchs ne sont connus nulle part).
+    """
+    ledger = match.get("ledger")
+    if ledger is not None:
+        for entry in ledger:
+            for pid, fields in entry["deltas"].items():
+                yield int(pid), fields
+        return
+
+    if match.get("result_recorded"):
+        score_a, score_b = match["score_a"], match["score_b"]
+        for team, own, other in (("team_a", score_a, score_b), ("team_b", score_b, score_a)):
+            for pid in match[team]:
+                if pid <= 0:
+                    continue
+                if own > other:
+                    yield pid, {"matches": 1, "wins": 1, "points": 1}
+                elif own < other:
+                    yield pid, {"matches": 1, "losses": 1}
+                else:
+                    yield pid, {"matches": 1, "draws": 1}
+
+    winners = match.get("mvp_winners") or []
+    if not match.get("mvp_open", True) and winners:
+        for pid in winners:
+            if pid > 0:
+                yield pid, {"points": 1.0 / len(winners), "mvps": 1}
+
+
+def rebuild_totals(matches, player_ids) -> tuple[dict[str, dict], dict]:
+    """
+    Totaux recalculés pour `player_ids` en un passage sur `matches` (itérable).
+    Renvoie (totaux par pid en str, infos : nb de matchs, matchs sans ledger,
+    buts/passes incomplets).
+    """
+    totals = {str(pid): dict.fromkeys(AGGREGATE_FIELDS, 0) for pid in player_ids}
+    info = {"matches": 0, "legacy_matches": 0, "legacy_stats": 0}
+
+    for match in matches:
+        info["matches"] += 1
+        if match.get("ledger") is None:
+            info["legacy_matches"] += 1
+            if match.get("stats_entered"):
+                info["legacy_stats"] += 1
+        for pid, fields in match_contributions(match):
+            total = totals.get(str(pid))
+            if total is None:
+                continue
+            for key, delta in fields.items():
+                if key in total:
+                    total[key] += delta
+
+    for total in totals.values():
+        total["points"] = round(total["points"], 6)
+        if float(total["points"]).is_integer():
+            total["points"] = int(total["points"])
+    return totals, info
+
+
+def diff_totals(players, totals: dict[str, dict], fields=AGGREGATE_FIELDS) -> list[dict]:
+    """Écarts entre totaux stockés et recalculés : [{pid, name, field, stored, rebuilt}]."""
+    drift = []
+    for pid, player in players.items():
+        rebuilt = totals.get(pid)
+        if rebuilt is None:
+            continue
+        for field in fields:
+            stored = player.get(field, 0)
+            tolerance = POINTS_TOLERANCE if field == "points" else 0
+            if abs(stored - rebuilt[field]) > tolerance:
+                drift.append({
+                    "pid": pid,
+                    "name": player.get("name", pid),
+                    "field": field,
+                    "stored": stored,
+                    "rebuilt": rebuilt[field],
+                })
+    return drift
+
+
+def format_drift(report: dict, limit: int = 20) -> str:
+    lines = [
+        f"{report['matches']} matchs parcourus ({report['legacy_matches']} sans ledger), "
+        f"{report['players']} joueurs.",
+    ]
+    if report["skipped_fields"]:
+        lines.append(
+            f"⚠️ {report['legacy_stats']} ancien(s) match(s) avec stats sans ledger : "
+            f"{', '.join(report['skipped_fields'])} non recalculés."
+        )
+    if not report["drift"]:
+        lines.append("Aucune dérive : les totaux stockés sont cohérents avec l'historique.")
+        return "\n".join(lines)
+
+    drifted = len({d["pid"] for d in report["drift"]})
+    lines.append(f"{len(report['drift'])} écart(s) sur {drifted} joueur(s) :")
+    for d in report["drift"][:limit]:
+        lines.append(f"  - {d['name']} · {d['field']} : {d['stored']} → {d['rebuilt']}")
+    if len(report["drift"]) > limit:
+        lines.append(f"  … et {len(report['drift']) - limit} autre(s)")
+    if report["applied"]:
+        lines.append("✅ Totaux corrigés.")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(prog="python -m aggregates", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--donnees", default="data/data.json", help="Fichier de données du bot")
+    parser.add_argument("--appliquer", action="store_true", help="Écrit les totaux recalculés")
+    args = parser.parse_args()
+
+    if not Path(args.donnees).exists():
+        print(f"Fichier introuvable : {args.donnees}")
+        return 2
+
+    # Le bot ne doit pas tourner en même temps : il réécrirait ses propres totaux
+    report = DataManager(args.donnees).rebuild_aggregates(apply=args.appliquer)
+    print(format_drift(report, limit=100))
+    return 1 if report["drift"] and not args.appliquer else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Archive des matchs terminés (stockage froid).
+
+    cd bot && python -m archive                  # archive les matchs terminés depuis ARCHIVE_AFTER_DAYS
+    cd bot && python -m archive --jours 0        # … quel que soit leur âge
+
+Les matchs clos (score enregistré, vote MVP fermé) quittent data.json pour
+des segments mensuels en ajout seul, `archive/matches-AAAA-MM.jsonl.gz`
+(une ligne JSON par match, chacune dans son propre membre gzip).
+`archive/index.json` garde, par match archivé, son segment, ses joueurs et
+la position de son membre : de quoi retrouver l'historique d'un joueur sans
+rien décompresser au démarrage, et relire un match sans décompresser le mois.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from metrics import registry as metrics
+from serializers import get_serializer
+
+# Segments décompressés gardés en mémoire (un mois de matchs chacun), pour
+# les entrées d'index écrites sans position de membre
+SEGMENT_CACHE_SIZE = 2
+
+
+def segment_name(match: dict) -> str:
+    """Segment d'un match : mois de création (AAAA-MM)."""
+    created = str(match.get("created_at") or "")
+    month = created[:7] if len(created) >= 7 and created[4] == "-" else "inconnu"
+    return f"matches-{month}.jsonl.gz"
+
+
+class MatchArchive:
+    """
+    Segments gzip JSONL en ajout seul + index id → (segment, joueurs, position).
+    Un match peut apparaître plusieurs fois dans un segment (ré-archivé après
+    une modification) : c'est la dernière ligne qui compte, celle de l'index.
+
+    Un ajout réécrit le segment (ancien contenu + nouveau membre gzip) dans un
+    fichier temporaire renommé ensuite : un crash laisse l'ancien segment ou
+    le nouveau, jamais un membre tronqué au milieu du fichier.
+
+    Écriture en deux temps pour ne pas bloquer la boucle : `encode` (dans la
+    boucle) puis `write_segments` / `write_index` (thread), et `add` pour
+    indexer les matchs une fois leurs segments écrits.
+    """
+
+    def __init__(self, directory):
+        self.dir = Path(directory)
+        self.index_path = self.dir / "index.json"
+        self._json = get_serializer("json")
+        self._segments: OrderedDict[str, dict[int, dict]] = OrderedDict()
+        # id du match → [segment, [ids des joueurs], début du membre gzip, taille]
+        # (les deux derniers absents des entrées écrites avant qu'on les note)
+        self.index: dict[int, list] = {}
+        # Instantanés de l'index : un thread ne doit pas écraser un index plus récent
+        self._index_lock = threading.Lock()
+        self._index_version = 0
+        self._index_written = 0
+        if self.index_path.exists():
+            raw = self._json.loads(self.index_path.read_bytes())
+            self.index = {int(mid): entry for mid, entry in raw.items()}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, match_id) -> bool:
+        return int(match_id) in self.index
+
+    # ---------- ÉCRITURE ----------
+
+    def encode(self, match: dict) -> bytes:
+        """Ligne JSONL d'un match (à faire dans la boucle : le match ne doit pas bouger)."""
+        return self._json.dumps(match) + b"\n"
+
+    def write_segments(self, lines: dict[str, list[tuple[int, bytes]]]) -> dict[int, tuple[str, int, int]]:
+        """
+        Ajoute des lignes encodées à leurs segments (segment → [(id, ligne)]),
+        fsync compris. Que des fichiers : peut tourner dans un thread.
+        Renvoie la position de chaque membre écrit : id → (segment, début, taille).
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        positions = {}
+        for name, group in lines.items():
+            raw, moved = self._valid_segment_bytes(name)
+            positions.update(moved)
+            # Un membre gzip par match : lisible seul, et gzip relit les membres à la suite
+            members = [raw]
+            offset = len(raw)
+            for match_id, line in group:
+                member = gzip.compress(line)
+                positions[match_id] = (name, offset, len(member))
+                members.append(member)
+                offset += len(member)
+            self._replace(self.dir / name, b"".join(members))
+        return positions
+
+    def add(self, matches: list[dict], positions: dict[int, tuple[str, int, int]]):
+        """
+        Indexe des matchs dont les segments sont écrits (index sauvé à part,
+        voir write_index), et suit les matchs déplacés par une réparation.
+        """
+        for match_id, (name, offset, size) in positions.items():
+            self._segments.pop(name, None)
+            entry = self.index.get(match_id)
+            if entry is not None and entry[0] == name:
+                self.index[match_id] = [name, entry[1], offset, size]
+        for match in matches:
+            name, offset, size = positions[int(match["id"])]
+            pids = [pid for pid in match["team_a"] + match["team_b"] if pid > 0]
+            self.index[int(match["id"])] = [name, pids, offset, size]
+
+    def remove(self, match_id):
+        """Oublie un match supprimé (index sauvé tout de suite) ; sa ligne reste, ignorée."""
+        if self.index.pop(int(match_id), None) is not None:
+            self._save_index()
+
+    def discard(self, match_ids):
+        """Oublie des matchs revenus dans data.json (index sauvé à part, voir write_index)."""
+        for match_id in match_ids:
+            self.index.pop(int(match_id), None)
+
+    def index_snapshot(self) -> tuple[bytes, int]:
+        self._index_version += 1
+        return self._json.dumps({str(mid): entry for mid, entry in self.index.items()}), self._index_version
+
+    def write_index(self, raw: bytes, version: int):
+        """Écrit un instantané de l'index (thread possible), sauf si un plus récent l'est déjà."""
+        with self._index_lock:
+            if version <= self._index_written:
+                return
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._replace(self.index_path, raw)
+            self._index_written = version
+
+    def _save_index(self):
+        self.write_index(*self.index_snapshot())
+
+    def _replace(self, path: Path, raw: bytes):
+        """Écriture atomique : fichier temporaire + fsync, renommage, fsync du dossier."""
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _valid_segment_bytes(self, name: str) -> tuple[bytes, dict[int, tuple[str, int, int]]]:
+        """
+        Contenu actuel du segment, à compléter. S'il est abîmé (écrit par une
+        ancienne version en ajout direct), on repart des matchs encore
+        lisibles : sinon tout ce qui suivrait le membre abîmé serait illisible.
+        Renvoie aussi la nouvelle position des matchs réécrits.
+        """
+        path = self.dir / name
+        if not path.exists():
+            return b"", {}
+        raw = path.read_bytes()
+        try:
+            gzip.decompress(raw)
+            return raw, {}
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            pass
+        matches = self._load_segment(name)
+        print(f"[Archive] {name} réparé : {len(matches)} match(s) lisible(s) réécrit(s)")
+        metrics.incr("archive_segment_repairs_total")
+        members, positions, offset = [], {}, 0
+        for match_id, match in matches.items():
+            member = gzip.compress(self.encode(match))
+            positions[match_id] = (name, offset, len(member))
+            members.append(member)
+            offset += len(member)
+        return b"".join(members), positions
+
+    # ---------- LECTURE ----------
+
+    def _load_segment(self, name: str) -> dict[int, dict]:
+        matches = {}
+        try:
+            with gzip.open(self.dir / name, "rb") as f:
+                for line in f:
+                    match = self._json.loads(line)
+                    matches[int(match["id"])] = match
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            # On garde ce qui a pu être lu, mais ça ne doit pas passer inaperçu
+            print(f"[Archive] {name} illisible après {len(matches)} match(s) : {e!r}")
+            metrics.incr("archive_segment_errors_total")
+        return matches
+
+    def _read_segment(self, name: str) -> dict[int, dict]:
+        matches = self._segments.get(name)
+        if matches is not None:
+            self._segments.move_to_end(name)
+            return matches
+
+        matches = self._segments[name] = self._load_segment(name)
+        while len(self._segments) > SEGMENT_CACHE_SIZE:
+            self._segments.popitem(last=False)
+        return matches
+
+    def _read_member(self, match_id: int, name: str, offset: int, size: int) -> dict | None:
+        """Un seul match : lecture et décompression de son membre gzip."""
+        try:
+            with open(self.dir / name, "rb") as f:
+                f.seek(offset)
+                match = self._json.loads(gzip.decompress(f.read(size)))
+            if int(match["id"]) == match_id:
+                return match
+            error = f"match {match['id']} trouvé à sa place"
+        except (OSError, EOFError, zlib.error, ValueError, KeyError, TypeError) as e:
+            error = repr(e)
+        print(f"[Archive] Match {match_id} illisible dans {name} ({error})")
+        metrics.incr("archive_segment_errors_total")
+        return None
+
+    def get(self, match_id) -> dict | None:
+        match_id = int(match_id)
+        entry = self.index.get(match_id)
+        if entry is None:
+            return None
+        if len(entry) >= 4:
+            return self._read_member(match_id, entry[0], entry[2], entry[3])
+        return self._read_segment(entry[0]).get(match_id)
+
+    def iter_matches(self, entries=None):
+        """
+        Tous les matchs archivés, segment par segment (un seul segment en
+        mémoire à la fois). `entries` : instantané de l'index
+        (`list(index.items())`), pour lire depuis un thread.
+        """
+        if entries is None:
+            entries = list(self.index.items())
+        wanted: dict[str, set[int]] = {}
+        for mid, entry in entries:
+            wanted.setdefault(entry[0], set()).add(mid)
+        for name in sorted(wanted):
+            for mid, match in self._load_segment(name).items():
+                if mid in wanted[name]:
+                    yield match
+
+    def player_index(self):
+        """(id du match, joueurs) pour chaque match archivé, sans rien décompresser."""
+        for mid, entry in self.index.items():
+            yield mid, entry[1]
+
+
+def main() -> int:
+    from data_manager import ARCHIVE_AFTER_DAYS, DataManager
+
+    parser = argparse.ArgumentParser(prog="python -m archive", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--donnees", default="data/data.json", help="Fichier de données du bot")
+    parser.add_argument("--jours", type=float, default=ARCHIVE_AFTER_DAYS, help="Âge minimum des matchs archivés")
+    parser.add_argument("--max", type=int, default=None, help="Nombre maximum de matchs archivés")
+    args = parser.parse_args()
+
+    if not Path(args.donnees).exists():
+        print(f"Fichier introuvable : {args.donnees}")
+        return 2
+
+    # Le bot ne doit pas tourner en même temps : il réécrirait data.json
+    dm = DataManager(args.donnees)
+
+    async def run() -> int:
+        moved = await dm.archive_matches(min_age_days=args.jours, limit=args.max)
+        await dm.flush()
+        return moved
+
+    moved = asyncio.run(run())
+    print(f"{moved} match(s) archivé(s) ; {len(dm.archive)} au total dans {dm.archive.dir}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Benchmarks du bot : DataManager, balance_teams, cartes FUT et classements,
+à plusieurs tailles de données. Résultats JSON comparés à une référence
+(`baseline.json`) : toute régression au-delà de la tolérance fait échouer
+la commande.
+
+    cd bot && python -m benchmarks                      # profil rapide + comparaison
+    cd bot && python -m benchmarks --profil complet     # 100 / 1k / 10k joueurs × 1k / 100k matchs
+    cd bot && python -m benchmarks --maj-reference      # remplace la référence
+"""
@@ -0,0 +1,67 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from .suite import PROFILES, compare, run_suite
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks du bot Five.")
+    parser.add_argument("--profil", choices=sorted(PROFILES), default="rapide", help="Tailles de données testées")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--sortie", type=Path, help="Écrit les résultats JSON à ce chemin")
+    parser.add_argument("--reference", type=Path, default=DEFAULT_BASELINE, help="Résultats de référence")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Ralentissement toléré (1.0 = ×2)")
+    parser.add_argument("--maj-reference", action="store_true", help="Remplace la référence par ces résultats")
+    args = parser.parse_args()
+
+    results = run_suite(args.profil, args.graine)
+    payload = {
+        "meta": {
+            "profil": args.profil,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    print()
+    for name, res in sorted(results.items()):
+        if "median" not in res:
+            print(f"{name:<60} {res['bytes'] / 1024:>10.0f} Ko")
+            continue
+        size = f", {res['bytes'] / 1024:.0f} Ko" if "bytes" in res else ""
+        print(f"{name:<60} {res['median'] * 1000:>10.2f} ms  (min {res['min'] * 1000:.2f}, {res['runs']} runs{size})")
+
+    if args.sortie:
+        args.sortie.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    if args.maj_reference:
+        args.reference.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"\nRéférence mise à jour : {args.reference}")
+        return 0
+
+    if not args.reference.exists():
+        print(f"\nPas de référence ({args.reference}) : rien à comparer.")
+        return 0
+
+    baseline = json.loads(args.reference.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de +{args.tolerance:.0%} :")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n✅ Aucune régression au-delà de +{args.tolerance:.0%} par rapport à la référence.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from cogs.matches import balance_teams, rebalance_teams
+from cogs.players import Players
+from cogs.rankings import Rankings, general_sort_key, rank_general
+from data_manager import DataManager, normalize_ids
+from loadtest.datagen import generate_data, write_data
+from serializers import JsonSerializer, available_serializers
+from loadtest.fakes import FakeBot, FakeInteraction, FakeMember
+from player_store import PlayerStore
+
+# (joueurs, matchs) par profil
+PROFILES = {
+    "rapide": [(100, 1_000), (1_000, 1_000)],
+    "complet": [(p, m) for p in (100, 1_000, 10_000) for m in (1_000, 100_000)],
+}
+
+# Tailles de match pour balance_teams
+BALANCE_SIZES = (10, 12, 14, 16)
+# Poids de synergie mesuré (désactivé par défaut dans le bot)
+BALANCE_SYNERGY_WEIGHT = 3.0
+
+
+def measure(fn, min_time: float = 0.3, max_runs: int = 30) -> dict:
+    """Répète `fn` jusqu'à `min_time` secondes cumulées (au moins une fois)."""
+    times = []
+    while not times or (sum(times) < min_time and len(times) < max_runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "runs": len(times)}
+
+
+def ameasure(make_coro, **kwargs) -> dict:
+    loop = asyncio.new_event_loop()
+    try:
+        return measure(lambda: loop.run_until_complete(make_coro()), **kwargs)
+    finally:
+        loop.close()
+
+
+def bench_datamanager(workdir: Path, n_players: int, n_matches: int, seed: int = 0) -> dict:
+    # Un dossier par taille : l'archive des matchs vit à côté de data.json
+    path = write_data(workdir / f"data_{n_players}_{n_matches}" / "data.json", n_players, n_matches, seed=seed, open_votes=200)
+    rng = random.Random(seed)
+    dm = DataManager(str(path))
+
+    data = dm._read()
+    player_ids = [int(pid) for pid in data["players"]]
+    open_votes = [int(mid) for mid, m in data["matches"].items() if m["result_recorded"] and m["mvp_open"]]
+    created: list[int] = []
+    del data
+
+    def create_match():
+        roster = rng.sample(player_ids, 10)
+        created.append(dm.create_match(roster[:5], roster[5:], channel_id=1)["id"])
+
+    def delete_match():
+        dm.delete_match(created.pop() if created else rng.randint(1, n_matches))
+
+    def finalize_mvp():
+        mid = open_votes.pop() if open_votes else rng.randint(1, n_matches)
+        dm.finalize_mvp(mid)
+
+    ops = {
+        "get_players": dm.get_players,
+        "get_player": lambda: dm.get_player(rng.choice(player_ids)),
+        "upsert_player": lambda: dm.upsert_player(rng.choice(player_ids), "Bench", 5, 6, 7, 8, 2),
+        "update_player_stats": lambda: dm.update_player_stats(rng.choice(player_ids), card_tagline="bench"),
+        "increment_player_stats": lambda: dm.increment_player_stats(rng.choice(player_ids), goals=1, assists=1),
+        "get_match": lambda: dm.get_match(rng.randint(1, n_matches)),
+        "update_match": lambda: dm.update_match(rng.randint(1, n_matches), channel_id=2),
+        "add_mvp_vote": lambda: dm.add_mvp_vote(rng.randint(1, n_matches), rng.choice(player_ids), rng.choice(player_ids)),
+        "create_match": create_match,
+        "delete_match": delete_match,
+        "finalize_mvp": finalize_mvp,
+        "player_matches": lambda: dm.player_matches(rng.choice(player_ids), rng.randint(0, 2) * 10, 10),
+        "rebuild_aggregates": lambda: dm.rebuild_aggregates(),
+        "rebuild_pairs": dm.rebuild_pairs,
+    }
+
+    results = {}
+    for name, fn in ops.items():
+        results[f"datamanager.{name}"] = measure(fn, max_runs=10)
+
+    # Rafale d'après-match : 50 modifications concurrentes, chacune attend sa durabilité
+    async def burst():
+        async def one():
+            dm.increment_player_stats(rng.choice(player_ids), goals=1)
+            await dm.durable()
+        await asyncio.gather(*(one() for _ in range(50)))
+
+    results["datamanager.rafale_50"] = ameasure(burst, max_runs=10)
+
+    # Archivage des matchs clos (une seule fois), puis lectures / écritures sur data.json allégé
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(dm.archive_matches(min_age_days=0, limit=None))
+        elapsed = time.perf_counter() - start
+        loop.run_until_complete(dm.flush())
+    finally:
+        loop.close()
+    results["datamanager.archive_matches"] = {"median": elapsed, "min": elapsed, "runs": 1}
+    archived = list(dm.archive.index) or [1]
+    results["datamanager.get_match_archive"] = measure(lambda: dm.get_match(rng.choice(archived)), max_runs=10)
+    results["datamanager.rafale_50_archive"] = ameasure(burst, max_runs=10)
+
+    # Classement : tri seul, puis commande complète (lecture + tri + rendu)
+    players = dm.get_players()
+    results["classement.tri"] = measure(lambda: sorted(players.values(), key=general_sort_key, reverse=True))
+    store = PlayerStore.from_dicts(players)
+    results["classement.tri_colonnes"] = measure(lambda: rank_general(store))
+
+    bot = FakeBot(dm)
+    rankings = Rankings(bot)
+    viewer = FakeMember(1, "Bench")
+    results["classement.commande"] = ameasure(
+        lambda: rankings.classement.callback(rankings, FakeInteraction(bot, viewer)), max_runs=10
+    )
+    return results
+
+
+def bench_serializers(n_players: int, n_matches: int, seed: int = 0) -> dict:
+    """Sérialisation / désérialisation de l'état complet, pour chaque format installé."""
+    data = normalize_ids(generate_data(n_players, n_matches, seed=seed))
+    results = {}
+    for name, serializer in available_serializers().items():
+        raw = serializer.dumps(data)
+        results[f"format.{name}.ecriture"] = {**measure(lambda: serializer.dumps(data), max_runs=10), "bytes": len(raw)}
+        results[f"format.{name}.lecture"] = {**measure(lambda: serializer.loads(raw), max_runs=10), "bytes": len(raw)}
+    return results
+
+
+def traced_bytes(build) -> int:
+    """Mémoire allouée (et encore vivante) par `build()`."""
+    tracemalloc.start()
+    try:
+        kept = build()  # noqa: F841 — gardé en vie pendant la mesure
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(n_players: int, seed: int = 0) -> dict:
+    """Mémoire des joueurs chargés : dicts vs PlayerStore en colonnes (sans durée)."""
+    raw = JsonSerializer().dumps(normalize_ids(generate_data(n_players, 0, seed=seed))["players"])
+    loads = JsonSerializer().loads
+    return {
+        "memoire.joueurs.dict": {"bytes": traced_bytes(lambda: loads(raw))},
+        "memoire.joueurs.colonnes": {"bytes": traced_bytes(lambda: PlayerStore.from_dicts(loads(raw)))},
+    }
+
+
+def bench_balance_teams(seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    results = {}
+    for n in BALANCE_SIZES:
+        players_stats = {
+            pid: {k: float(rng.randint(2, 10)) for k in ("tir", "passes", "physique", "influence", "gardien", "rating")}
+            for pid in range(1, n + 1)
+        }
+        results[f"balance_teams[n={n}]"] = measure(lambda: balance_teams(players_stats), max_runs=10)
+        synergy = {(a, b): rng.uniform(-0.3, 0.3) for a in range(1, n + 1) for b in range(a + 1, n + 1)}
+        results[f"balance_teams.synergie[n={n}]"] = measure(
+            lambda: balance_teams(players_stats, synergy, BALANCE_SYNERGY_WEIGHT), max_runs=10
+        )
+        # Lobby : dernier arrivé ajouté à la répartition des n-1 premiers
+        first = {pid: stats for pid, stats in players_stats.items() if pid < n}
+        team_a, team_b, _a, _b = rebalance_teams(first, [], [])
+        results[f"balance_teams.incremental[n={n}]"] = measure(
+            lambda: rebalance_teams(players_stats, team_a, team_b), max_runs=10
+        )
+    return results
+
+
+def bench_card(workdir: Path) -> dict:
+    path = write_data(workdir / "data_card.json", 10, 0)
+    dm = DataManager(str(path))
+    cog = Players(FakeBot(dm))
+    pid, player = next(iter(dm.get_players().items()))
+    member = FakeMember(int(pid), player["name"])
+    avatar = asyncio.run(member.display_avatar.read())
+
+    def cold():
+        cog._card_cache.clear()
+        cog._build_fut_card(member, player, avatar)
+
+    cog._build_fut_card(member, player, avatar)
+    return {
+        "card.froid": measure(cold, max_runs=10),
+        "card.chaud": ameasure(lambda: cog._get_fut_card(member, player)),
+    }
+
+
+def run_suite(profile: str = "rapide", seed: int = 0, log=print) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="fivebot-bench-") as tmp:
+        workdir = Path(tmp)
+
+        log("• balance_teams")
+        results.update(bench_balance_teams(seed))
+
+        log("• cartes FUT")
+        results.update(bench_card(workdir))
+
+        for n_players, n_matches in PROFILES[profile]:
+            log(f"• DataManager / classement — {n_players} joueurs, {n_matches} matchs")
+            suffix = f"[p={n_players},m={n_matches}]"
+            for name, res in bench_datamanager(workdir, n_players, n_matches, seed).items():
+                results[name + suffix] = res
+            for name, res in bench_serializers(n_players, n_matches, seed).items():
+                results[name + suffix] = res
+
+        for n_players in sorted({p for p, _m in PROFILES[profile]}):
+            log(f"• mémoire — {n_players} joueurs")
+            for name, res in bench_memory(n_players, seed).items():
+                results[f"{name}[p={n_players}]"] = res
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, noise_floor: float = 0.001) -> list[str]:
+    """
+    Liste des régressions : meilleur temps > référence × (1 + tolérance), hors bruit.
+    On compare les minimums, bien plus stables que les médianes sur une machine partagée.
+    """
+    regressions = []
+    for name, res in sorted(results.items()):
+        ref = baseline.get(name)
+        if ref is None or "min" not in ref or "min" not in res:
+            continue
+        limit = ref["min"] * (1 + tolerance)
+        if res["min"] > limit and res["min"] - ref["min"] > noise_floor:
+            regressions.append(
+                f"{name} : {res['min'] * 1000:.2f} ms (référence {ref['min'] * 1000:.2f} ms, "
+                f"×{res['min'] / ref['min']:.2f})"
+            )
+    return regressions
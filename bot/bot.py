@@ -1,8 +1,22 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from data_manager import DataManager
+from instrumentation import InstrumentedTree, finish_trace
+from loop_monitor import LoopMonitor
+from member_cache import MemberCache
+from metrics import registry as metrics
+from metrics_server import MetricsServer
+from mvp_votes import MvpVoteBuffer
+from scheduler import Scheduler
+from profiler import CommandProfiler
 from dotenv import load_dotenv
+import hashlib
+import json
 import os
+import time
+
+# Démarrage du process, pour mesurer le temps jusqu'à on_ready
+STARTED_AT = time.perf_counter()
 
 # Charge le .env
 load_dotenv()
@@ -19,31 +33,201 @@ intents.guilds = True
 
 GUILD_ID = 1020352225811386449  # ton serveur
 
+# Politique de cache des membres :
+#  - "players" : pas de chunking au démarrage, aucun membre gardé par discord.py ;
+#    les membres sont récupérés à la demande (MemberCache : TTL + taille bornée)
+#  - "full" : comportement par défaut de discord.py (tout le serveur en mémoire)
+MEMBER_CACHE_POLICY = os.getenv("MEMBER_CACHE_POLICY", "players")
+MEMBER_CACHE_TTL = int(os.getenv("MEMBER_CACHE_TTL", "600"))
+MEMBER_CACHE_SIZE = int(os.getenv("MEMBER_CACHE_SIZE", "1000"))
+
+# Intervalle (secondes) du dump des métriques dans data/metrics.json
+METRICS_DUMP_INTERVAL = int(os.getenv("METRICS_DUMP_INTERVAL", "300"))
+
+# Serveur /metrics + /healthz (désactivé si METRICS_PORT n'est pas défini)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Blocage de la boucle asyncio (secondes) à partir duquel on enregistre le fautif
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "0.1"))
+# Mode debug asyncio (slow callbacks détaillés, mais plus coûteux)
+LOOP_DEBUG = os.getenv("LOOP_DEBUG", "0") == "1"
+
+# Intervalle (heures) de l'archivage des matchs clos (0 = désactivé, voir archive.py)
+ARCHIVE_INTERVAL_HOURS = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24"))
+
+
+def resident_memory_bytes() -> int:
+    """Mémoire résidente du process (Linux), sinon pic mémoire via `resource`."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
 class FiveBot(commands.Bot):
     def __init__(self):
+        if MEMBER_CACHE_POLICY == "full":
+            cache_options = {}
+        else:
+            cache_options = {
+                "chunk_guilds_at_startup": False,
+                "member_cache_flags": discord.MemberCacheFlags.none(),
+            }
+
         super().__init__(
             command_prefix="!",
             intents=intents,
+            tree_cls=InstrumentedTree,
+            **cache_options,
         )
         self.data_manager = DataManager()
+        self.member_cache = MemberCache(ttl=MEMBER_CACHE_TTL, max_size=MEMBER_CACHE_SIZE)
+        self.mvp_votes = MvpVoteBuffer(self.data_manager)
+        # Tâches différées persistées (clôture auto du MVP, rappels…), lancées après le login
+        self.scheduler = Scheduler(self.data_manager, ready=self.wait_until_ready)
+        self.metrics_server = MetricsServer(self, METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        self.loop_monitor = LoopMonitor(threshold=LOOP_STALL_THRESHOLD, asyncio_debug=LOOP_DEBUG)
+        self.profiler = CommandProfiler(self.data_manager.path.parent / "profiles")
+        self._ready_measured = False
 
     async def setup_hook(self):
         # Charge les cogs
         await self.load_extension("cogs.players")
         await self.load_extension("cogs.matches")
+        await self.load_extension("cogs.lobby")
         await self.load_extension("cogs.rankings")
         await self.load_extension("cogs.misc")
+        await self.load_extension("cogs.admin")
 
-        guild = discord.Object(id=GUILD_ID)
+        # Archivage périodique des matchs clos, comme tâche planifiée
+        if ARCHIVE_INTERVAL_HOURS > 0:
+            self.scheduler.register("archive_matches", self._archive_matches)
+            if self.data_manager.get_job("archive_matches") is None:
+                self.scheduler.schedule("archive_matches", "archive_matches", ARCHIVE_INTERVAL_HOURS * 3600)
+
+        # Les cogs ont déclaré leurs handlers : on replanifie les tâches stockées
+        self.scheduler.start()
+
+        # Sync les commandes instant local guild (seulement si elles ont changé)
+        await self.sync_commands()
+
+        self.dump_metrics.start()
+        self.loop_monitor.register_commands(self.tree)
+        self.loop_monitor.start()
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+
+    async def close(self):
+        self.scheduler.stop()
+        self.loop_monitor.stop()
+        if self.dump_metrics.is_running():
+            self.dump_metrics.cancel()
+            self._write_metrics()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+        self.mvp_votes.flush_now()
+        await self.data_manager.flush()
+        await super().close()
+
+    async def _archive_matches(self, payload: dict):
+        # Replanifiée avant tout : un échec ne doit pas arrêter l'archivage
+        self.scheduler.schedule("archive_matches", "archive_matches", ARCHIVE_INTERVAL_HOURS * 3600)
+        # Par lots (ARCHIVE_BATCH) : la boucle reprend la main entre deux lots
+        moved = 0
+        while batch := await self.data_manager.archive_matches():
+            moved += batch
+        if moved:
+            print(f"🗄️ {moved} match(s) archivé(s) ({len(self.data_manager.archive)} au total).")
 
-        # Sync les commandes instant local guild
+    # ---------- MÉTRIQUES ----------
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        finish_trace(interaction)
+
+    @property
+    def metrics_path(self):
+        return self.data_manager.path.parent / "metrics.json"
+
+    def _write_metrics(self):
+        snapshot = metrics.snapshot()
+        snapshot["generated_at"] = time.time()
+        snapshot["loop_stalls"] = self.loop_monitor.snapshot()
+        tmp = self.metrics_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        tmp.replace(self.metrics_path)
+
+    @tasks.loop(seconds=METRICS_DUMP_INTERVAL)
+    async def dump_metrics(self):
+        self._write_metrics()
+
+    @dump_metrics.before_loop
+    async def _before_dump_metrics(self):
+        await self.wait_until_ready()
+
+    # ---------- SYNC DES SLASH COMMANDS ----------
+
+    @property
+    def commands_hash_path(self):
+        return self.data_manager.path.parent / "commands_hash.json"
+
+    def commands_hash(self, guild: discord.abc.Snowflake) -> str:
+        """Hash stable de l'arbre de commandes tel qu'il serait envoyé à Discord."""
+        payload = [cmd.to_dict(self.tree) for cmd in self.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda c: (c.get("type", 1), c["name"]))
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load_commands_hash(self) -> str | None:
+        try:
+            with self.commands_hash_path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return stored.get(str(GUILD_ID))
+
+    def _save_commands_hash(self, digest: str):
+        with self.commands_hash_path.open("w", encoding="utf-8") as f:
+            json.dump({str(GUILD_ID): digest}, f, indent=2)
+
+    async def sync_commands(self, force: bool = False) -> int | None:
+        """
+        Sync les slash commands sur la guild si l'arbre a changé depuis
+        la dernière sync (ou si `force`). Retourne le nb de commandes
+        synchronisées, ou None si la sync a été sautée.
+        """
+        guild = discord.Object(id=GUILD_ID)
         self.tree.copy_global_to(guild=guild)
+
+        digest = self.commands_hash(guild)
+        if not force and digest == self._load_commands_hash():
+            print(f"Slash commands inchangées pour la guild {GUILD_ID} : sync ignorée.")
+            return None
+
         synced = await self.tree.sync(guild=guild)
+        self._save_commands_hash(digest)
         print(f"Slash commands synchro pour la guild {GUILD_ID} : {len(synced)} commandes.")
+        return len(synced)
 
     async def on_ready(self):
         print(f"Connecté en tant que {self.user} (id: {self.user.id})")
 
+        # Mesure du démarrage (une seule fois : on_ready peut revenir après une reconnexion)
+        if not self._ready_measured:
+            self._ready_measured = True
+            ready_s = time.perf_counter() - STARTED_AT
+            rss = resident_memory_bytes()
+            cached_members = sum(len(g.members) for g in self.guilds)
+            metrics.set_gauge("startup_ready_seconds", ready_s, policy=MEMBER_CACHE_POLICY)
+            metrics.set_gauge("process_resident_memory_bytes", rss)
+            print(
+                f"Prêt en {ready_s:.2f}s — RSS {rss / 1_048_576:.1f} Mo — "
+                f"{cached_members} membres en cache (politique : {MEMBER_CACHE_POLICY})."
+            )
+
 
 if __name__ == "__main__":
     bot = FiveBot()
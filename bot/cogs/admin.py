@@ -0,0 +1,241 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from aggregates import format_drift
+from metrics import registry as metrics
+
+# Ordre d'affichage des phases dans /stats_bot
+PHASES = ("resolve", "storage", "render", "send", "other")
+
+
+def _fmt_seconds(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "> 10 s"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _fmt_bytes(size: float) -> str:
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} Go"
+
+
+class Admin(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def _check_admin(self, interaction: discord.Interaction) -> bool:
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ Cette commande est réservée aux administrateurs.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    # ---------------- SYNC COMMANDES ----------------
+
+    @app_commands.command(
+        name="sync_commandes",
+        description="(Admin) Force la synchronisation des slash commands avec Discord."
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def sync_commandes(self, interaction: discord.Interaction):
+        if not await self._check_admin(interaction):
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        count = await self.bot.sync_commands(force=True)
+        await interaction.followup.send(
+            f"✅ {count} slash commands synchronisées avec Discord.",
+            ephemeral=True
+        )
+
+    # ---------------- STATS BOT ----------------
+
+    @app_commands.command(
+        name="stats_bot",
+        description="(Admin) Latences par commande et accès au fichier de données."
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def stats_bot(self, interaction: discord.Interaction):
+        if not await self._check_admin(interaction):
+            return
+
+        latencies = {labels["command"]: hist for labels, hist in metrics.collect("command_latency_seconds")}
+        errors = {labels["command"]: v for labels, v in metrics.collect("command_errors_total")}
+
+        phases: dict[str, dict[str, float]] = {}
+        for labels, hist in metrics.collect("command_phase_seconds"):
+            if hist.count:
+                phases.setdefault(labels["command"], {})[labels["phase"]] = hist.sum / hist.count
+
+        embed = discord.Embed(
+            title="📊 Stats du bot",
+            description="Latences depuis le dernier démarrage (p50 / p95 : bornes de bucket).",
+            color=discord.Color.dark_teal()
+        )
+
+        # Les commandes les plus utilisées d'abord (limite de 25 champs par embed)
+        for name, hist in sorted(latencies.items(), key=lambda kv: kv[1].count, reverse=True)[:20]:
+            detail = " · ".join(
+                f"{p} {_fmt_seconds(phases[name][p])}"
+                for p in PHASES if p in phases.get(name, {})
+            )
+            embed.add_field(
+                name=f"/{name}",
+                value=(
+                    f"{hist.count} appel(s), {int(errors.get(name, 0))} erreur(s)\n"
+                    f"moy {_fmt_seconds(hist.sum / hist.count)} · "
+                    f"p50 ≤ {_fmt_seconds(hist.quantile(0.5))} · "
+                    f"p95 ≤ {_fmt_seconds(hist.quantile(0.95))}\n"
+                    f"{detail}"
+                ),
+                inline=False
+            )
+
+        if not latencies:
+            embed.add_field(name="Commandes", value="Aucune commande enregistrée pour le moment.", inline=False)
+
+        def total(name: str) -> float:
+            return sum(v for _labels, v in metrics.collect(name))
+
+        embed.add_field(
+            name="Fichier de données",
+            value=(
+                f"• Lectures : **{int(total('storage_reads_total'))}** "
+                f"(chargement : {_fmt_bytes(total('storage_read_bytes_total'))})\n"
+                f"• Modifications : **{int(total('storage_mutations_total'))}**\n"
+                f"• Écritures disque : **{int(total('storage_writes_total'))}** "
+                f"({_fmt_bytes(total('storage_write_bytes_total'))})"
+            ),
+            inline=False
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # ---------------- LENTEURS ----------------
+
+    @app_commands.command(
+        name="lenteurs",
+        description="(Admin) Commandes qui ont bloqué la boucle du bot récemment."
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def lenteurs(self, interaction: discord.Interaction):
+        if not await self._check_admin(interaction):
+            return
+
+        monitor = self.bot.loop_monitor
+        offenders = monitor.offenders()
+
+        embed = discord.Embed(
+            title="🐢 Blocages de la boucle",
+            description=(
+                f"Seuil : **{_fmt_seconds(monitor.threshold)}** — "
+                f"{len(monitor.snapshot())} blocage(s) dans le rapport."
+            ),
+            color=discord.Color.dark_red()
+        )
+
+        if not offenders:
+            embed.add_field(name="\u200b", value="Aucun blocage enregistré. 👌", inline=False)
+
+        for agg in offenders[:10]:
+            label = f"/{agg['command']} ({agg['cog']})" if agg["command"] != "-" else "Hors commande"
+            stack = "\n".join(agg["stack"][-5:]) or "(pas d'échantillon de pile)"
+            embed.add_field(
+                name=label,
+                value=(
+                    f"{agg['count']} blocage(s) · max {_fmt_seconds(agg['max'])} · "
+                    f"cumul {_fmt_seconds(agg['total'])}\n"
+                    f"```txt\n{stack[:800]}```"
+                ),
+                inline=False
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # ---------------- PROFILER ----------------
+
+    async def _command_autocomplete(self, interaction: discord.Interaction, current: str):
+        names = sorted(cmd.qualified_name for cmd in self.bot.tree.walk_commands())
+        current = current.lower()
+        return [app_commands.Choice(name=n, value=n) for n in names if current in n][:25]
+
+    @app_commands.command(
+        name="profiler",
+        description="(Admin) Profile (cProfile + tracemalloc) les N prochaines exécutions d'une commande."
+    )
+    @app_commands.describe(
+        commande="Nom de la commande à profiler (ex: creer_match)",
+        nombre="Nombre d'exécutions à profiler (0 pour annuler)"
+    )
+    @app_commands.autocomplete(commande=_command_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    async def profiler(
+        self,
+        interaction: discord.Interaction,
+        commande: str,
+        nombre: app_commands.Range[int, 0, 50] = 1
+    ):
+        if not await self._check_admin(interaction):
+            return
+
+        known = {cmd.qualified_name for cmd in self.bot.tree.walk_commands()}
+        commande = commande.strip().lstrip("/")
+        if commande not in known:
+            await interaction.response.send_message(f"❌ Commande `/{commande}` inconnue.", ephemeral=True)
+            return
+
+        self.bot.profiler.arm(commande, nombre)
+
+        if nombre == 0:
+            text = f"🛑 Profilage de `/{commande}` annulé."
+        else:
+            text = (
+                f"🔬 Les **{nombre}** prochaine(s) exécution(s) de `/{commande}` seront profilées.\n"
+                f"Rapports (.pstats + allocations) dans `{self.bot.profiler.out_dir}`."
+            )
+
+        armed = ", ".join(f"/{c} ×{n}" for c, n in self.bot.profiler.armed.items())
+        if armed:
+            text += f"\n\nEn attente : {armed}"
+
+        await interaction.response.send_message(text, ephemeral=True)
+
+    # ---------------- RECALCUL DES TOTAUX ----------------
+
+    @app_commands.command(
+        name="recalculer_stats",
+        description="(Admin) Recalcule les totaux des joueurs depuis l'historique des matchs."
+    )
+    @app_commands.describe(
+        appliquer="Corriger les totaux (sinon : rapport des écarts seulement)"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def recalculer_stats(self, interaction: discord.Interaction, appliquer: bool = False):
+        if not await self._check_admin(interaction):
+            return
+
+        report = await self.bot.data_manager.rebuild_aggregates_async(apply=appliquer)
+        if report["applied"]:
+            await self.bot.data_manager.durable()
+
+        embed = discord.Embed(
+            title="🧮 Recalcul des totaux" + (" — appliqué" if report["applied"] else " — simulation"),
+            description=format_drift(report)[:4000],
+            color=discord.Color.green() if not report["drift"] or report["applied"] else discord.Color.orange()
+        )
+        if report["drift"] and not appliquer:
+            embed.set_footer(text="Relance avec appliquer:True pour corriger ces totaux.")
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,211 @@
+import asyncio
+import os
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from cogs.matches import SYNERGY_WEIGHT, _player_stats, rebalance_teams
+from metrics import enter_phase
+
+# Nombre de joueurs du lobby : le match est créé dès qu'il est atteint (pair)
+LOBBY_SIZE = int(os.getenv("LOBBY_SIZE", "10"))
+
+
+class Lobby(commands.Cog):
+    """
+    File d'attente d'un salon : /rejoindre et /quitter, un message épinglé
+    tenu à jour, et des équipes recalculées à chaque arrivée / départ à partir
+    de la répartition précédente (rebalance_teams). Le match est créé
+    automatiquement quand le lobby est complet.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.data = bot.data_manager
+        # Un verrou par salon pour ne jamais poster deux messages de lobby
+        self._message_locks: dict[int, asyncio.Lock] = {}
+
+    # ---------- ÉQUIPES ----------
+
+    def _rebalance(self, lobby: dict, players: dict):
+        stats = {pid: _player_stats(players[str(pid)]) for pid in lobby["players"] if str(pid) in players}
+        synergy = self.data.pairs.synergy_matrix(stats) if SYNERGY_WEIGHT else None
+        team_a, team_b, avgs_a, avgs_b = rebalance_teams(stats, lobby["team_a"], lobby["team_b"], synergy)
+        lobby["team_a"], lobby["team_b"] = team_a, team_b
+        return avgs_a, avgs_b
+
+    @staticmethod
+    def _team_lines(team: list[int], players: dict) -> str:
+        lines = []
+        for idx, pid in enumerate(team, start=1):
+            p = players.get(str(pid))
+            lines.append(f"{idx}. {p['name']} ({p['rating']}/10)" if p else f"{idx}. <@{pid}>")
+        return "\n".join(lines) or "—"
+
+    def _lobby_embed(self, lobby: dict | None, players: dict) -> discord.Embed:
+        if not lobby or not lobby["players"]:
+            return discord.Embed(
+                title="⚽ Lobby fermé",
+                description="Plus personne dans le lobby. `/rejoindre` pour en relancer un.",
+                color=discord.Color.dark_grey()
+            )
+
+        embed = discord.Embed(
+            title=f"⚽ Lobby — {len(lobby['players'])}/{LOBBY_SIZE} joueurs",
+            description="Équipes provisoires, recalculées à chaque arrivée / départ.",
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="🔴 Équipe A", value=self._team_lines(lobby["team_a"], players), inline=True)
+        embed.add_field(name="🔵 Équipe B", value=self._team_lines(lobby["team_b"], players), inline=True)
+        embed.set_footer(text="/rejoindre pour jouer · /quitter pour sortir du lobby")
+        return embed
+
+    # ---------- MESSAGE ÉPINGLÉ ----------
+
+    async def _refresh_message(self, channel, channel_id: int, embed: discord.Embed | None = None,
+                               message_id: int | None = None, unpin: bool = False):
+        """
+        Met à jour le message épinglé du lobby (créé et épinglé au premier
+        passage). `embed` / `message_id` : état final d'un lobby déjà clos.
+        """
+        if channel is None:
+            return
+        lock = self._message_locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            lobby = self.data.get_lobby(channel_id)
+            if embed is None:
+                embed = self._lobby_embed(lobby, self.data.get_players())
+            if message_id is None and lobby is not None:
+                message_id = lobby.get("message_id")
+
+            if message_id is not None:
+                message = channel.get_partial_message(message_id)
+                try:
+                    await message.edit(embed=embed)
+                    if unpin:
+                        await message.unpin()
+                    return
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException:
+                    return
+
+            if lobby is None:
+                return
+            try:
+                message = await channel.send(embed=embed)
+            except discord.HTTPException:
+                return
+            lobby["message_id"] = message.id
+            self.data.save_lobby(channel_id, lobby)
+            try:
+                await message.pin()
+            except discord.HTTPException:
+                # Pas la permission d'épingler : le message reste utilisable
+                pass
+
+    # ---------- COMMANDES ----------
+
+    @app_commands.command(name="rejoindre", description="Rejoint le lobby du salon (match créé quand il est complet).")
+    async def rejoindre(self, interaction: discord.Interaction):
+        # Synergies prêtes avant de lire le lobby (premier calcul : archive lue dans un thread)
+        if SYNERGY_WEIGHT:
+            await self.data.load_pairs()
+        players = self.data.get_players()
+        if str(interaction.user.id) not in players:
+            await interaction.response.send_message(
+                "❌ Tu n'as pas encore de profil : demande un `/set_joueur` à un admin.",
+                ephemeral=True
+            )
+            return
+
+        channel_id = interaction.channel_id
+        lobby = self.data.get_lobby(channel_id) or {"players": [], "team_a": [], "team_b": [], "message_id": None}
+        if interaction.user.id in lobby["players"]:
+            await interaction.response.send_message("ℹ️ Tu es déjà dans le lobby.", ephemeral=True)
+            return
+
+        lobby["players"].append(interaction.user.id)
+        self._rebalance(lobby, players)
+
+        if len(lobby["players"]) < LOBBY_SIZE:
+            self.data.save_lobby(channel_id, lobby)
+            await self.data.durable()
+
+            enter_phase("send")
+            await interaction.response.send_message(
+                f"✅ Tu as rejoint le lobby ({len(lobby['players'])}/{LOBBY_SIZE}).",
+                ephemeral=True
+            )
+            await self._refresh_message(interaction.channel, channel_id)
+            return
+
+        # Lobby complet : les équipes sont déjà équilibrées, on crée le match
+        self.data.delete_lobby(channel_id)
+        match = self.data.create_match(lobby["team_a"], lobby["team_b"], channel_id)
+
+        enter_phase("render")
+        embed = discord.Embed(
+            title=f"⚽ Match #{match['id']}",
+            description=(
+                f"Lobby complet : **Match #{match['id']}** créé !\n"
+                f"➡️ Pensez à noter l'ID du match : **#{match['id']}** "
+                f"(utile pour le résultat, le MVP et les stats)."
+            ),
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="🔴 Équipe A", value=self._team_lines(lobby["team_a"], players), inline=True)
+        embed.add_field(name="🔵 Équipe B", value=self._team_lines(lobby["team_b"], players), inline=True)
+        embed.set_footer(text="Utilise /resultat_match pour le score, puis vote MVP et /stats_match.")
+
+        await self.data.durable()
+
+        enter_phase("send")
+        await interaction.response.send_message(
+            content=" ".join(f"<@{pid}>" for pid in lobby["players"]),
+            embed=embed
+        )
+
+        if lobby.get("message_id"):
+            done = discord.Embed(
+                title=f"✅ Lobby complet — Match #{match['id']}",
+                description="`/rejoindre` pour lancer le prochain lobby.",
+                color=discord.Color.green()
+            )
+            await self._refresh_message(interaction.channel, channel_id, done, lobby["message_id"], unpin=True)
+
+    @app_commands.command(name="quitter", description="Quitte le lobby du salon.")
+    async def quitter(self, interaction: discord.Interaction):
+        if SYNERGY_WEIGHT:
+            await self.data.load_pairs()
+        channel_id = interaction.channel_id
+        lobby = self.data.get_lobby(channel_id)
+        if not lobby or interaction.user.id not in lobby["players"]:
+            await interaction.response.send_message("ℹ️ Tu n'es pas dans le lobby de ce salon.", ephemeral=True)
+            return
+
+        lobby["players"].remove(interaction.user.id)
+        if lobby["players"]:
+            self._rebalance(lobby, self.data.get_players())
+            self.data.save_lobby(channel_id, lobby)
+            closed = None
+        else:
+            self.data.delete_lobby(channel_id)
+            closed = lobby.get("message_id")
+
+        await self.data.durable()
+
+        enter_phase("send")
+        await interaction.response.send_message(
+            f"👋 Tu as quitté le lobby ({len(lobby['players'])}/{LOBBY_SIZE}).",
+            ephemeral=True
+        )
+        if closed:
+            await self._refresh_message(interaction.channel, channel_id, self._lobby_embed(None, {}), closed, unpin=True)
+        elif lobby["players"]:
+            await self._refresh_message(interaction.channel, channel_id)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Lobby(bot))
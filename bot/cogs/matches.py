@@ -1,10 +1,16 @@
+import os
 import re
+import time
 import discord
 from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
 from itertools import combinations
 
+from data_manager import MVP_VOTE_CLOSED, MVP_VOTE_DUPLICATE
+from mvp_votes import MvpVoteBuffer
+from metrics import registry as metrics, enter_phase
+
 # Poids des stats pour l'équilibrage
 STAT_WEIGHTS = {
     "tir": 5.0,
@@ -14,6 +20,16 @@ STAT_WEIGHTS = {
     "gardien": 2.0,
 }
 
+# Poids de l'écart de synergie entre équipes (paires qui gagnent toujours
+# ensemble) dans l'équilibrage. Désactivé par défaut (équilibrage sur les
+# stats seules) : à activer avec BALANCE_SYNERGY_WEIGHT (ex: 1 à 3)
+SYNERGY_WEIGHT = float(os.getenv("BALANCE_SYNERGY_WEIGHT", "0"))
+
+# Clôture automatique du vote MVP N heures après le résultat (0 = désactivée),
+# avec un rappel aux joueurs qui n'ont pas voté MVP_REMINDER_HOURS avant
+MVP_AUTO_CLOSE_HOURS = float(os.getenv("MVP_AUTO_CLOSE_HOURS", "24"))
+MVP_REMINDER_HOURS = float(os.getenv("MVP_REMINDER_HOURS", "2"))
+
 # Clés de stats qu'on calcule comme moyennes par équipe (affichage)
 STAT_AVG_KEYS = ("tir", "passes", "physique", "influence", "gardien", "rating")
 
@@ -33,14 +49,55 @@ def _compute_team_avgs(team_ids: list[int], players_stats: dict[int, dict[str, f
     return {k: sums[k] / n for k in STAT_AVG_KEYS}
 
 
-def balance_teams(players_stats: dict[int, dict[str, float]]):
+def _player_stats(pdata: dict) -> dict[str, float]:
+    """Stats d'équilibrage d'un joueur enregistré (note globale par défaut)."""
+    rating = float(pdata["rating"])
+    return {
+        "rating": rating,
+        "tir": float(pdata.get("tir", rating)),
+        "passes": float(pdata.get("passes", rating)),
+        "physique": float(pdata.get("physique", rating)),
+        "influence": float(pdata.get("influence", rating)),
+        "gardien": float(pdata.get("gardien", rating)),
+    }
+
+
+def _team_synergy(team_ids: list[int], synergy: dict[tuple[int, int], float]) -> float:
+    """Somme des synergies des paires d'une équipe (clés (a, b) avec a < b)."""
+    total = 0.0
+    for a, b in combinations(team_ids, 2):
+        total += synergy.get((a, b) if a < b else (b, a), 0.0)
+    return total
+
+
+def _split_cost(team_a, team_b, avgs_a, avgs_b, synergy, synergy_weight: float) -> float:
+    """Coût d'une répartition : écarts de moyennes au carré pondérés (+ écart de synergie)."""
+    # coût = somme des écarts au carré sur chaque stat, pondéré
+    cost = 0.0
+    for key, weight in STAT_WEIGHTS.items():
+        diff = avgs_a[key] - avgs_b[key]
+        cost += weight * (diff ** 2)
+
+    if synergy and synergy_weight:
+        diff = _team_synergy(team_a, synergy) - _team_synergy(team_b, synergy)
+        cost += synergy_weight * (diff ** 2)
+    return cost
+
+
+def balance_teams(
+    players_stats: dict[int, dict[str, float]],
+    synergy: dict[tuple[int, int], float] | None = None,
+    synergy_weight: float = SYNERGY_WEIGHT,
+):
     """
     players_stats : {id: {tir, passes, physique, influence, gardien, rating}, ...}
+    synergy (optionnel) : {(a, b): synergie de la paire}, voir PairStats.synergy_matrix
     Retourne (team_a_ids, team_b_ids, avgs_a, avgs_b)
 
     On teste toutes les combinaisons possibles (C(10,5)=252),
     et on prend celle qui minimise la différence de stats pondérée
-    avec les poids définis dans STAT_WEIGHTS.
+    avec les poids définis dans STAT_WEIGHTS (+ l'écart de synergie
+    entre les deux équipes, pour ne pas regrouper les duos qui gagnent toujours).
     """
     ids = list(players_stats.keys())
     n = len(ids)
@@ -57,12 +114,7 @@ def balance_teams(players_stats: dict[int, dict[str, float]]):
 
         avgs_a = _compute_team_avgs(team_a, players_stats)
         avgs_b = _compute_team_avgs(team_b, players_stats)
-
-        # coût = somme des écarts au carré sur chaque stat, pondéré
-        cost = 0.0
-        for key, weight in STAT_WEIGHTS.items():
-            diff = avgs_a[key] - avgs_b[key]
-            cost += weight * (diff ** 2)
+        cost = _split_cost(team_a, team_b, avgs_a, avgs_b, synergy, synergy_weight)
 
         # On choisit la combinaison avec le coût minimal
         if best is None or cost < best_cost:
@@ -75,10 +127,374 @@ def balance_teams(players_stats: dict[int, dict[str, float]]):
     return best  # team_a_ids, team_b_ids, avgs_a, avgs_b
 
 
+def rebalance_teams(
+    players_stats: dict[int, dict[str, float]],
+    team_a: list[int],
+    team_b: list[int],
+    synergy: dict[tuple[int, int], float] | None = None,
+    synergy_weight: float = SYNERGY_WEIGHT,
+):
+    """
+    Équilibrage incrémental (lobby) : part de la répartition précédente
+    (team_a, team_b), retire les joueurs absents de players_stats, place
+    chaque nouveau là où le coût est le plus bas, puis échange 1 ou 2 joueurs
+    entre les équipes tant que ça améliore le coût. Partant de la répartition
+    précédente, une ou deux passes suffisent (au lieu des C(n, n/2)
+    combinaisons de balance_teams). Les tailles des équipes diffèrent d'au
+    plus 1 (nombre impair en cours de remplissage).
+    Retourne (team_a_ids, team_b_ids, avgs_a, avgs_b).
+    """
+    def cost_of(a, b):
+        return _split_cost(a, b, _compute_team_avgs(a, players_stats), _compute_team_avgs(b, players_stats),
+                           synergy, synergy_weight)
+
+    team_a = [pid for pid in team_a if pid in players_stats]
+    team_b = [pid for pid in team_b if pid in players_stats]
+    placed = set(team_a) | set(team_b)
+
+    # Nouveaux joueurs : dans l'équipe la moins remplie, ou la moins chère à égalité
+    for pid in players_stats:
+        if pid in placed:
+            continue
+        if len(team_a) != len(team_b):
+            (team_a if len(team_a) < len(team_b) else team_b).append(pid)
+        elif cost_of(team_a + [pid], team_b) <= cost_of(team_a, team_b + [pid]):
+            team_a.append(pid)
+        else:
+            team_b.append(pid)
+
+    # Départs : on rééquilibre les effectifs avant d'optimiser
+    while abs(len(team_a) - len(team_b)) > 1:
+        if len(team_a) > len(team_b):
+            pid = min(team_a, key=lambda p: cost_of([x for x in team_a if x != p], team_b + [p]))
+            team_a.remove(pid)
+            team_b.append(pid)
+        else:
+            pid = min(team_b, key=lambda p: cost_of(team_a + [p], [x for x in team_b if x != p]))
+            team_b.remove(pid)
+            team_a.append(pid)
+
+    # Recherche locale : meilleur échange de 1 (sinon 2) joueurs A <-> B,
+    # jusqu'à ne plus rien gagner
+    current = cost_of(team_a, team_b)
+    while True:
+        best_swap, best_cost = None, current
+        for size in (1, 2):
+            for out_a in combinations(team_a, size):
+                for out_b in combinations(team_b, size):
+                    cand_a = [p for p in team_a if p not in out_a] + list(out_b)
+                    cand_b = [p for p in team_b if p not in out_b] + list(out_a)
+                    cost = cost_of(cand_a, cand_b)
+                    if cost < best_cost - 1e-12:
+                        best_swap, best_cost = (cand_a, cand_b), cost
+            if best_swap is not None:
+                break
+        if best_swap is None:
+            break
+        team_a, team_b = best_swap
+        current = best_cost
+
+    return team_a, team_b, _compute_team_avgs(team_a, players_stats), _compute_team_avgs(team_b, players_stats)
+
+
+def _result_text(score_a: int, score_b: int) -> str:
+    if score_a > score_b:
+        return "Victoire de **l'équipe A 🔴**"
+    if score_b > score_a:
+        return "Victoire de **l'équipe B 🔵**"
+    return "Match **nul**."
+
+
+# Matchs affichés par page dans /historique
+HISTORY_PAGE_SIZE = 10
+
+
+def _history_line(match: dict, pid: int) -> str:
+    """Une ligne de /historique : date, équipe, score, buts / passes, MVP."""
+    in_a = pid in match["team_a"]
+    team = "🔴 A" if in_a else "🔵 B"
+
+    try:
+        date = datetime.fromisoformat(match["created_at"]).strftime("%d/%m/%Y")
+    except (KeyError, ValueError):
+        date = "?"
+
+    if match.get("result_recorded"):
+        own, other = (match["score_a"], match["score_b"]) if in_a else (match["score_b"], match["score_a"])
+        outcome = "✅" if own > other else "❌" if own < other else "➖"
+        score = f"{outcome} {own}-{other}"
+    else:
+        score = "⏳ pas de score"
+
+    # Buts / passes : entrées "stats" du ledger (inconnus pour les anciens matchs)
+    key = str(pid)
+    if not match.get("stats_entered", {}).get(key):
+        stats = "stats : —"
+    elif "ledger" not in match:
+        stats = "stats : ?"
+    else:
+        goals = assists = 0
+        for entry in match["ledger"]:
+            if entry["kind"] == "stats" and key in entry["deltas"]:
+                goals += entry["deltas"][key].get("goals", 0)
+                assists += entry["deltas"][key].get("assists", 0)
+        stats = f"⚽ {goals} · 🅰️ {assists}"
+
+    mvp = " · 🏆 MVP" if pid in (match.get("mvp_winners") or []) else ""
+    return f"**#{match['id']}** · {date} · {team} · {score} · {stats}{mvp}"
+
+
+class HistoryView(discord.ui.View):
+    """Pagination de /historique : chaque page ne lit que ses matchs via l'index."""
+
+    def __init__(self, data, member: discord.Member, author_id: int):
+        super().__init__(timeout=180)
+        self.data = data
+        self.member = member
+        self.author_id = author_id
+        self.page = 0
+        self.total = data.count_player_matches(member.id)
+        self.pages = max(1, -(-self.total // HISTORY_PAGE_SIZE))
+        self.interaction: discord.Interaction | None = None
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= self.pages - 1
+
+    def embed(self) -> discord.Embed:
+        matches = self.data.player_matches(self.member.id, self.page * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE)
+        embed = discord.Embed(
+            title=f"📜 Historique de {self.member.display_name}",
+            description="\n".join(_history_line(m, self.member.id) for m in matches) or "Aucun match joué.",
+            color=discord.Color.dark_gold()
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages} — {self.total} match(s)")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "❌ Seule la personne qui a lancé la commande peut changer de page.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(self.pages - 1, page))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="◀️", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="▶️", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def on_timeout(self):
+        if self.interaction is None:
+            return
+        try:
+            await self.interaction.edit_original_response(view=None)
+        except discord.HTTPException:
+            pass
+
+
+# Champs max dans un modal Discord (un par joueur dans /stats_match)
+STATS_MODAL_SIZE = 5
+# Garde-fou contre les fautes de frappe (ex: "22" au lieu de "2 2")
+STATS_MAX_PER_MATCH = 30
+
+
+def _parse_stat_line(raw: str) -> tuple[int, int] | None:
+    """
+    "2 1", "2/1", "2-1" → (buts, passes) ; "3" → (3, 0) ; vide → None.
+    Lève ValueError si la saisie est invalide.
+    """
+    text = (raw or "").strip()
+    if not text:
+        return None
+    parts = re.split(r"[\s/,;-]+", text)
+    if len(parts) == 1:
+        parts.append("0")
+    if len(parts) != 2 or not all(p.isdigit() for p in parts):
+        raise ValueError(text)
+    goals, assists = int(parts[0]), int(parts[1])
+    if goals > STATS_MAX_PER_MATCH or assists > STATS_MAX_PER_MATCH:
+        raise ValueError(text)
+    return goals, assists
+
+
+class MatchStatsDraft:
+    """Saisie /stats_match en cours : joueurs par page de modal et valeurs déjà validées."""
+
+    def __init__(self, cog: "Matches", match_id: int, participants: list[tuple[int, str]], author_id: int):
+        self.cog = cog
+        self.match_id = match_id
+        self.author_id = author_id
+        self.pages = [participants[i:i + STATS_MODAL_SIZE] for i in range(0, len(participants), STATS_MODAL_SIZE)]
+        self.page = 0
+        self.entries: dict[int, tuple[int, int]] = {}
+
+
+class MatchStatsModal(discord.ui.Modal):
+    """Une page de /stats_match : un champ "buts passes" par joueur."""
+
+    def __init__(self, draft: MatchStatsDraft):
+        super().__init__(title=f"Stats du match #{draft.match_id} ({draft.page + 1}/{len(draft.pages)})", timeout=600)
+        self.draft = draft
+        self.fields: list[tuple[int, str, discord.ui.TextInput]] = []
+        for pid, name in draft.pages[draft.page]:
+            field = discord.ui.TextInput(
+                label=name[:45],
+                placeholder="buts passes — ex : 2 1 (vide = ne rien saisir)",
+                required=False,
+                max_length=9,
+            )
+            self.add_item(field)
+            self.fields.append((pid, name, field))
+
+    async def on_submit(self, interaction: discord.Interaction):
+        page: dict[int, tuple[int, int]] = {}
+        invalid = []
+        for pid, name, field in self.fields:
+            try:
+                value = _parse_stat_line(field.value)
+            except ValueError:
+                invalid.append(name)
+                continue
+            if value is not None:
+                page[pid] = value
+
+        if invalid:
+            await interaction.response.send_message(
+                f"❌ Saisie invalide pour : **{', '.join(invalid)}**.\n"
+                f"Format attendu : `buts passes` (ex : `2 1`), au plus {STATS_MAX_PER_MATCH} chacun.",
+                view=MatchStatsView(self.draft, label="Corriger"),
+                ephemeral=True
+            )
+            return
+
+        self.draft.entries.update(page)
+        self.draft.page += 1
+        if self.draft.page < len(self.draft.pages):
+            await interaction.response.send_message(
+                f"✅ Page {self.draft.page}/{len(self.draft.pages)} notée. Rien n'est enregistré avant la dernière page.",
+                view=MatchStatsView(self.draft, label="Joueurs suivants"),
+                ephemeral=True
+            )
+            return
+
+        await self.draft.cog._commit_match_stats(interaction, self.draft)
+
+
+class MatchStatsView(discord.ui.View):
+    """Bouton qui ouvre la page courante de /stats_match (un modal ne peut pas en ouvrir un autre)."""
+
+    def __init__(self, draft: MatchStatsDraft, label: str):
+        super().__init__(timeout=600)
+        self.draft = draft
+        self.open_modal.label = label
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.draft.author_id:
+            await interaction.response.send_message(
+                "❌ Seule la personne qui a lancé /stats_match peut continuer la saisie.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Continuer", style=discord.ButtonStyle.primary, emoji="📝")
+    async def open_modal(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(MatchStatsModal(self.draft))
+        self.stop()
+
+
+def _job_key(kind: str, match_id: int) -> str:
+    """Clé d'une tâche planifiée liée à un match (ex: "mvp_close:42")."""
+    return f"{kind}:{match_id}"
+
+
+def _mvp_vote_error(status: str | None, match_id: int) -> str | None:
+    """Message d'un vote refusé (None si le vote est accepté)."""
+    if status is None:
+        return "❌ Match introuvable."
+    if status == MVP_VOTE_CLOSED:
+        return f"⚠️ Le vote MVP est déjà clôturé pour le match #{match_id}."
+    if status == MVP_VOTE_DUPLICATE:
+        return f"⚠️ Tu as déjà voté pour le MVP du match #{match_id}."
+    return None
+
+
+def _mvp_options(match: dict, players: dict) -> list[discord.SelectOption]:
+    """Joueurs enregistrés du match, proposés dans le menu de vote (25 max, limite Discord)."""
+    options = []
+    for team, emoji in (("team_a", "🔴"), ("team_b", "🔵")):
+        for pid in match[team]:
+            player = players.get(str(pid))
+            if pid > 0 and player is not None:
+                options.append(discord.SelectOption(label=player["name"][:100], value=str(pid), emoji=emoji))
+    return options[:25]
+
+
+class MvpVoteSelect(discord.ui.DynamicItem[discord.ui.Select], template=r"mvp:(?P<match_id>\d+)"):
+    """
+    Menu de vote MVP posté sous le résultat d'un match. Le custom_id
+    (mvp:<match_id>) porte tout ce qu'il faut : le menu reste utilisable
+    après un redémarrage sans rien réenregistrer par match.
+    Les votes passent par le tampon MvpVoteBuffer du bot.
+    """
+
+    def __init__(self, match_id: int, options: list[discord.SelectOption]):
+        super().__init__(
+            discord.ui.Select(
+                custom_id=f"mvp:{match_id}",
+                placeholder="🏆 Vote pour le MVP du match",
+                options=options,
+            )
+        )
+        self.match_id = match_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match, /):
+        return cls(int(match["match_id"]), item.options)
+
+    async def callback(self, interaction: discord.Interaction):
+        target = int(self.item.values[0])
+        data = interaction.client.data_manager
+
+        match = data.get_match(self.match_id)
+        if match is not None and target not in match["team_a"] and target not in match["team_b"]:
+            await interaction.response.send_message(
+                "❌ Ce joueur n'a pas participé à ce match (ou c'est un invité).",
+                ephemeral=True
+            )
+            return
+
+        status = interaction.client.mvp_votes.submit(self.match_id, interaction.user.id, target)
+        error = _mvp_vote_error(status, self.match_id)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
+            return
+
+        name = next((o.label for o in self.item.options if o.value == str(target)), f"<@{target}>")
+        await interaction.response.send_message(
+            f"✅ Ton vote pour **{name}** a été pris en compte pour le match #{self.match_id}.",
+            ephemeral=True
+        )
+
+
 class Matches(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.data = bot.data_manager
+        self.votes: MvpVoteBuffer = bot.mvp_votes
+        bot.scheduler.register("mvp_close", self._auto_close_mvp)
+        bot.scheduler.register("mvp_reminder", self._remind_mvp)
         self._mention_re = re.compile(r"<@!?(\d+)>")
         # *** 7 ou ***7 → invité note 7
         self._guest_re = re.compile(r"^\*\*\*\s*(\d+)$")
@@ -125,39 +541,44 @@ class Matches(commands.Cog):
             if not pdata:
                 raise ValueError(f"{token} n'a pas de profil (/set_joueur).")
 
-            name = pdata["name"]
-            rating = float(pdata["rating"])
-            stats = {
-                "rating": rating,
-                "tir": float(pdata.get("tir", rating)),
-                "passes": float(pdata.get("passes", rating)),
-                "physique": float(pdata.get("physique", rating)),
-                "influence": float(pdata.get("influence", rating)),
-                "gardien": float(pdata.get("gardien", rating)),
-            }
-            return uid, name, rating, False, stats, guest_id
-
-        # 3) Cas pseudo exact d'un joueur enregistré
-        for p in players.values():
-            if p["name"].lower() == token.lower():
-                rating = float(p["rating"])
-                stats = {
-                    "rating": rating,
-                    "tir": float(p.get("tir", rating)),
-                    "passes": float(p.get("passes", rating)),
-                    "physique": float(p.get("physique", rating)),
-                    "influence": float(p.get("influence", rating)),
-                    "gardien": float(p.get("gardien", rating)),
-                }
-                return p["id"], p["name"], rating, False, stats, guest_id
-
-        # 4) Sinon -> erreur explicite
+            stats = _player_stats(pdata)
+            return uid, pdata["name"], stats["rating"], False, stats, guest_id
+
+        # 3) Cas pseudo exact d'un joueur enregistré (casse et accents ignorés)
+        pid = self.data.name_index.lookup(token)
+        p = players.get(str(pid)) if pid is not None else None
+        if p:
+            stats = _player_stats(p)
+            return pid, p["name"], stats["rating"], False, stats, guest_id
+
+        # 4) Sinon -> erreur explicite, avec les noms les plus proches
+        suggestions = self.data.name_index.suggest(token)
+        hint = ""
+        if suggestions:
+            hint = "Tu voulais dire : " + ", ".join(f"`{n}`" for n in suggestions) + " ?\n"
         raise ValueError(
             f"Le joueur `{token}` n'existe pas dans la base.\n"
+            f"{hint}"
             f"- Utilise `/set_joueur` pour l'enregistrer, ou\n"
             f"- utilise `*** 7` pour un invité (*** + note)."
         )
 
+    async def _player_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Suggestions de joueurs enregistrés (préfixe puis approximatif), sans lire le fichier."""
+        current = current.strip()
+        # Invité (*** 7) ou mention déjà saisie : rien à proposer
+        if current.startswith("*") or current.startswith("<@"):
+            return []
+
+        with metrics.timer("autocomplete_seconds", command=interaction.command.name if interaction.command else "?"):
+            results = self.data.name_index.search(current, limit=25)
+
+        # La valeur envoyée est une mention : résolution directe et sans ambiguïté
+        return [
+            app_commands.Choice(name=name[:100] or str(pid), value=f"<@{pid}>")
+            for pid, name in results
+        ]
+
     # ---------------- CREER MATCH ----------------
 
     @app_commands.command(
@@ -176,6 +597,18 @@ class Matches(commands.Cog):
         joueur9="Pseudo / mention / `*** 7` pour invité",
         joueur10="Pseudo / mention / `*** 7` pour invité",
     )
+    @app_commands.autocomplete(
+        joueur1=_player_autocomplete,
+        joueur2=_player_autocomplete,
+        joueur3=_player_autocomplete,
+        joueur4=_player_autocomplete,
+        joueur5=_player_autocomplete,
+        joueur6=_player_autocomplete,
+        joueur7=_player_autocomplete,
+        joueur8=_player_autocomplete,
+        joueur9=_player_autocomplete,
+        joueur10=_player_autocomplete,
+    )
     async def creer_match(
         self,
         interaction: discord.Interaction,
@@ -200,6 +633,7 @@ class Matches(commands.Cog):
         match_players = {}        # id -> {name, rating, is_guest, stats}
         players_stats = {}        # id -> stats dict (tir, passes, ...)
 
+        enter_phase("resolve")
         # Résolution de chaque pseudo / mention / *** 7
         try:
             for token in slots:
@@ -217,12 +651,14 @@ class Matches(commands.Cog):
             await interaction.response.send_message(f"❌ {e}", ephemeral=True)
             return
 
-        # Équilibrage multi-stats pondéré
-        team_a_ids, team_b_ids, avgs_a, avgs_b = balance_teams(players_stats)
+        # Équilibrage multi-stats pondéré (+ synergies connues entre les joueurs)
+        synergy = (await self.data.load_pairs()).synergy_matrix(players_stats) if SYNERGY_WEIGHT else None
+        team_a_ids, team_b_ids, avgs_a, avgs_b = balance_teams(players_stats, synergy)
 
         # Enregistrement du match
         match = self.data.create_match(team_a_ids, team_b_ids, interaction.channel_id)
 
+        enter_phase("render")
         avg_rating_a = avgs_a["rating"]
         avg_rating_b = avgs_b["rating"]
 
@@ -281,6 +717,10 @@ class Matches(commands.Cog):
             text="Utilise /resultat_match pour le score, puis /vote_mvp et /ajouter_stats (pour les joueurs du Discord)."
         )
 
+        # On ne répond qu'une fois les modifications écrites sur disque
+        await self.data.durable()
+
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # ---------------- RESULTAT MATCH ----------------
@@ -307,55 +747,115 @@ class Matches(commands.Cog):
             await interaction.response.send_message("⚠️ Le résultat de ce match est déjà enregistré.", ephemeral=True)
             return
 
-        match = self.data.update_match(
-            match_id,
-            score_a=score_equipe_a,
-            score_b=score_equipe_b,
-            result_recorded=True
-        )
+        # Score + match joué / victoire / défaite / nul + points, noté au ledger du match
+        self.data.record_result(match_id, score_equipe_a, score_equipe_b)
+        msg_result = _result_text(score_equipe_a, score_equipe_b)
 
-        # Tous les joueurs connus (id > 0) prennent un match joué
-        for pid in match["team_a"] + match["team_b"]:
-            if pid > 0:
-                self.data.increment_player_stats(pid, matches=1)
-
-        # Victoire / défaite / nul + points
-        if score_equipe_a > score_equipe_b:
-            winners = match["team_a"]
-            losers = match["team_b"]
-            msg_result = "Victoire de **l'équipe A 🔴**"
-        elif score_equipe_b > score_equipe_a:
-            winners = match["team_b"]
-            losers = match["team_a"]
-            msg_result = "Victoire de **l'équipe B 🔵**"
-        else:
-            winners = []
-            losers = []
-            msg_result = "Match **nul**."
-
-        if winners:
-            for pid in winners:
-                if pid > 0:
-                    self.data.increment_player_stats(pid, wins=1, points=1)
-            for pid in losers:
-                if pid > 0:
-                    self.data.increment_player_stats(pid, losses=1)
-        else:
-            for pid in match["team_a"] + match["team_b"]:
-                if pid > 0:
-                    self.data.increment_player_stats(pid, draws=1)
+        # Clôture automatique du vote MVP (+ rappel aux retardataires)
+        close_txt = ""
+        if MVP_AUTO_CLOSE_HOURS > 0:
+            payload = {"match_id": match_id, "channel_id": interaction.channel_id}
+            self.bot.scheduler.schedule(
+                _job_key("mvp_close", match_id), "mvp_close", MVP_AUTO_CLOSE_HOURS * 3600, payload
+            )
+            if 0 < MVP_REMINDER_HOURS < MVP_AUTO_CLOSE_HOURS:
+                self.bot.scheduler.schedule(
+                    _job_key("mvp_reminder", match_id), "mvp_reminder",
+                    (MVP_AUTO_CLOSE_HOURS - MVP_REMINDER_HOURS) * 3600, payload
+                )
+            close_txt = f"\n⏳ Le vote MVP se clôture automatiquement dans **{MVP_AUTO_CLOSE_HOURS:g} h**."
 
+        enter_phase("render")
         embed = discord.Embed(
             title=f"📌 Résultat du match #{match_id}",
             description=(
                 f"{msg_result}\n\n"
                 f"🔴 Équipe A : **{score_equipe_a}**\n"
                 f"🔵 Équipe B : **{score_equipe_b}**\n\n"
-                "Les joueurs peuvent maintenant utiliser `/vote_mvp` et `/ajouter_stats` avec l'ID du match."
+                "Votez pour le MVP avec le menu ci-dessous (ou `/vote_mvp`), "
+                "et ajoutez vos stats avec `/ajouter_stats` et l'ID du match."
+                f"{close_txt}"
             ),
             color=discord.Color.green()
         )
 
+        # Menu de vote MVP (persistant : voir MvpVoteSelect)
+        view = discord.utils.MISSING
+        options = _mvp_options(match, self.data.get_players())
+        if options:
+            view = discord.ui.View(timeout=None)
+            view.add_item(MvpVoteSelect(match_id, options))
+
+        await self.data.durable()
+
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed, view=view)
+
+    # ---------------- CORRIGER RESULTAT ----------------
+
+    @app_commands.command(
+        name="corriger_resultat",
+        description="(Admin) Corrige le score d'un match déjà enregistré."
+    )
+    @app_commands.describe(
+        match_id="ID du match à corriger",
+        score_equipe_a="Bon score de l'équipe A",
+        score_equipe_b="Bon score de l'équipe B"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def corriger_resultat(
+        self,
+        interaction: discord.Interaction,
+        match_id: int,
+        score_equipe_a: int,
+        score_equipe_b: int
+    ):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ Tu n'as pas la permission de corriger un résultat.",
+                ephemeral=True
+            )
+            return
+
+        match = self.data.get_match(match_id)
+        if not match:
+            await interaction.response.send_message("❌ Match introuvable.", ephemeral=True)
+            return
+
+        if not match["result_recorded"]:
+            await interaction.response.send_message(
+                "⚠️ Aucun résultat enregistré pour ce match : utilise `/resultat_match`.",
+                ephemeral=True
+            )
+            return
+
+        if not any(e["kind"] == "result" for e in match.get("ledger", [])):
+            await interaction.response.send_message(
+                "❌ Ce match a été enregistré avant le suivi par match : son résultat ne peut pas être annulé automatiquement.",
+                ephemeral=True
+            )
+            return
+
+        old_a, old_b = match["score_a"], match["score_b"]
+
+        # Annule l'ancien résultat (V/D/N, points, match joué) puis applique le nouveau
+        self.data.correct_result(match_id, score_equipe_a, score_equipe_b)
+
+        enter_phase("render")
+        embed = discord.Embed(
+            title=f"✏️ Résultat corrigé — Match #{match_id}",
+            description=(
+                f"Ancien score : 🔴 {old_a} - {old_b} 🔵\n"
+                f"Nouveau score : 🔴 **{score_equipe_a}** - **{score_equipe_b}** 🔵\n\n"
+                f"{_result_text(score_equipe_a, score_equipe_b)}\n"
+                "_Les totaux des joueurs ont été mis à jour (les stats et le MVP ne changent pas)._"
+            ),
+            color=discord.Color.green()
+        )
+
+        await self.data.durable()
+
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # ---------------- MVP ----------------
@@ -384,27 +884,19 @@ class Matches(commands.Cog):
             )
             return
 
-        # Vérifier si le vote est encore ouvert
-        if not match.get("mvp_open", True):
-            await interaction.response.send_message(
-                f"⚠️ Le vote MVP est déjà clôturé pour le match #{match_id}.",
-                ephemeral=True
-            )
-            return
-
-        # Empêcher plusieurs votes pour le même match par la même personne
-        mvp_votes = match.get("mvp_votes", {}) or {}
-        voter_key = str(interaction.user.id)
-        if voter_key in mvp_votes:
-            await interaction.response.send_message(
-                f"⚠️ Tu as déjà voté pour le MVP du match #{match_id}.",
-                ephemeral=True
-            )
+        # Vote ouvert ? déjà voté (ou vote du menu en attente) ? sinon enregistré
+        if self.votes.has_pending(match_id, interaction.user.id):
+            status = MVP_VOTE_DUPLICATE
+        else:
+            status = self.data.add_mvp_vote(match_id, interaction.user.id, joueur.id)
+        error = _mvp_vote_error(status, match_id)
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
             return
 
-        # Enregistrer le vote
-        self.data.add_mvp_vote(match_id, interaction.user.id, joueur.id)
+        await self.data.durable()
 
+        enter_phase("send")
         await interaction.response.send_message(
             f"✅ Ton vote pour **{joueur.display_name}** a été pris en compte pour le match #{match_id}.",
             ephemeral=True
@@ -424,19 +916,21 @@ class Matches(commands.Cog):
         interaction: discord.Interaction,
         match_id: int,
     ):
-        match = self.data.get_match(match_id)
-        if not match:
+        if not self.data.get_match(match_id):
             await interaction.response.send_message("❌ Match introuvable.", ephemeral=True)
             return
 
-        was_open = match.get("mvp_open", True)
-        votes = match.get("mvp_votes", {}) or {}
+        # Clôture (si encore ouvert) : gagnants lus sur le compteur des votes,
+        # 1 point partagé + 1 MVP chacun, noté au ledger du match.
+        # Les votes du menu encore en attente comptent.
+        self.votes.flush_now()
+        match, winners, just_closed = self.data.finalize_mvp(match_id)
+        tally = self.data.mvp_tally(match)
+        self.bot.scheduler.cancel(_job_key("mvp_close", match_id), _job_key("mvp_reminder", match_id))
 
         # Aucun vote → rien à attribuer
-        if not votes:
-            if was_open:
-                # On ferme quand même le vote pour ce match
-                self.data.update_match(match_id, mvp_open=False, mvp_winners=[])
+        if not tally:
+            if just_closed:
                 text = (
                     f"🕒 Vote MVP clôturé pour le match #{match_id}, "
                     f"mais aucun vote n'a été enregistré.\n"
@@ -448,63 +942,48 @@ class Matches(commands.Cog):
                     f"et aucun vote n'a été enregistré.\n"
                     f"Aucun MVP n'a été attribué."
                 )
+            await self.data.durable()
             await interaction.response.send_message(text)
             return
 
-        # Tally des votes : target_id -> nb_votes (on cast en int)
-        tally: dict[int, int] = {}
-        for _voter_key, target in votes.items():
-            try:
-                pid = int(target)
-            except (TypeError, ValueError):
-                continue
-            tally[pid] = tally.get(pid, 0) + 1
+        embed = await self._mvp_result_embed(match_id, interaction.guild, tally, winners, just_closed)
 
-        if not tally:
-            # Sécurité : votes illisibles
-            await interaction.response.send_message(
-                f"❌ Impossible de lire les votes MVP pour le match #{match_id}.",
-                ephemeral=True
-            )
-            return
+        await self.data.durable()
 
-        max_votes = max(tally.values())
-        top_candidates = [pid for pid, c in tally.items() if c == max_votes]
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed)
 
-        winners = top_candidates  # ceux qui sont en tête (égalité possible)
+    async def _mvp_result_embed(
+        self,
+        match_id: int,
+        guild: discord.Guild | None,
+        tally: dict[int, int],
+        winners: list[int],
+        just_closed: bool
+    ) -> discord.Embed:
+        """Embed du résultat du vote MVP (fin_mvp et clôture automatique)."""
         players_data = self.data.get_players()
 
-        def name_for(pid: int) -> str:
+        # Noms affichés : profil joueur, sinon membre du serveur (récupéré à la demande)
+        names: dict[int, str] = {}
+        for pid in tally:
             pdata = players_data.get(str(pid))
             if pdata and "name" in pdata:
-                return pdata["name"]
-            member = interaction.guild.get_member(pid) if interaction.guild else None
-            if member:
-                return member.display_name
-            return f"<@{pid}>"
-
-        # 👉 Attribution des points / MVP UNIQUEMENT si le vote était encore ouvert
-        if was_open:
-            total_points = 1.0
-            share = total_points / len(winners)  # ex: 0.5 si 2, 0.33 si 3, etc.
-
-            for pid in winners:
-                # On ignore les invités (ids négatifs)
-                if pid > 0:
-                    self.data.increment_player_stats(pid, points=share, mvps=1)
-
-            # On ferme définitivement le vote
-            self.data.update_match(match_id, mvp_open=False, mvp_winners=winners)
-            just_closed = True
-        else:
-            just_closed = False
+                names[pid] = pdata["name"]
+                continue
+            member = None
+            if guild and pid > 0:
+                member = await self.bot.member_cache.get(guild, pid)
+            names[pid] = member.display_name if member else f"<@{pid}>"
+
+        def name_for(pid: int) -> str:
+            return names.get(pid, f"<@{pid}>")
 
-        # On relit le match au cas où
-        match = self.data.get_match(match_id) or match
+        enter_phase("render")
 
-        # Construction du détail des votes
+        # Construction du détail des votes (tally déjà trié par nb de votes)
         lines = []
-        for pid, count in sorted(tally.items(), key=lambda kv: kv[1], reverse=True):
+        for pid, count in tally.items():
             lines.append(f"• **{name_for(pid)}** — {count} vote(s)")
 
         # Texte selon le nb de gagnants
@@ -549,8 +1028,73 @@ class Matches(commands.Cog):
             color=discord.Color.gold()
         )
         embed.set_footer(text=footer_info)
+        return embed
 
-        await interaction.response.send_message(embed=embed)
+    # ---------------- CLÔTURE AUTO / RAPPELS (Scheduler) ----------------
+
+    async def _job_channel(self, channel_id: int):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except discord.HTTPException:
+                return None
+        return channel
+
+    async def _auto_close_mvp(self, payload: dict):
+        """Échéance "mvp_close" : même clôture que /fin_mvp, résultat posté dans le salon."""
+        match_id = payload["match_id"]
+        if not self.data.get_match(match_id):
+            return
+
+        self.votes.flush_now()
+        match, winners, just_closed = self.data.finalize_mvp(match_id)
+        self.bot.scheduler.cancel(_job_key("mvp_reminder", match_id))
+        if not just_closed:
+            return
+        await self.data.durable()
+
+        channel = await self._job_channel(payload["channel_id"])
+        if channel is None:
+            return
+
+        tally = self.data.mvp_tally(match)
+        if not tally:
+            await channel.send(
+                f"🕒 Vote MVP du match #{match_id} clôturé automatiquement : "
+                f"aucun vote enregistré, aucun MVP attribué."
+            )
+            return
+
+        embed = await self._mvp_result_embed(match_id, getattr(channel, "guild", None), tally, winners, True)
+        await channel.send(content=f"🕒 Clôture automatique du vote MVP — match #{match_id}", embed=embed)
+
+    async def _remind_mvp(self, payload: dict):
+        """Échéance "mvp_reminder" : mentionne les joueurs du match qui n'ont pas encore voté."""
+        match_id = payload["match_id"]
+        match = self.data.get_match(match_id)
+        if not match or not match.get("mvp_open", True):
+            return
+
+        voted = match.get("mvp_votes", {})
+        missing = [
+            pid for pid in match["team_a"] + match["team_b"]
+            if pid > 0 and str(pid) not in voted and not self.votes.has_pending(match_id, pid)
+        ]
+        if not missing:
+            return
+
+        channel = await self._job_channel(payload["channel_id"])
+        if channel is None:
+            return
+
+        close_job = self.data.get_job(_job_key("mvp_close", match_id))
+        left = f" (clôture dans ~{max(0.0, (close_job['due'] - time.time()) / 3600):.0f} h)" if close_job else ""
+        mentions = " ".join(f"<@{pid}>" for pid in missing)
+        await channel.send(
+            f"⏰ Vote MVP du match #{match_id}{left} : {mentions}, "
+            f"il vous reste peu de temps pour voter (menu sous le résultat ou `/vote_mvp`)."
+        )
 
     # ---------------- AJOUTER STATS ----------------
 
@@ -600,15 +1144,12 @@ class Matches(commands.Cog):
             )
             return
 
-        # Mise à jour des stats globales du joueur
-        self.data.increment_player_stats(joueur.id, goals=buts, assists=passes)
-
-        # Marquer les stats comme saisies pour ce match
-        stats_entered[pid_str] = True
-        self.data.update_match(match_id, stats_entered=stats_entered)
+        # Stats globales du joueur + stats marquées comme saisies pour ce match
+        self.data.record_player_stats(match_id, joueur.id, buts, passes)
 
         updated = self.data.get_player(joueur.id)
 
+        enter_phase("render")
         embed = discord.Embed(
             title=f"📈 Stats mises à jour — Match #{match_id}",
             description=f"Joueur : {joueur.mention}",
@@ -622,20 +1163,95 @@ class Matches(commands.Cog):
         embed.add_field(name="Total buts (tous matchs)", value=str(updated["goals"]), inline=True)
         embed.add_field(name="Total passes (tous matchs)", value=str(updated["assists"]), inline=True)
 
+        await self.data.durable()
+
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed)
+
+    # ---------------- STATS DU MATCH (SAISIE GROUPÉE) ----------------
+
+    @app_commands.command(
+        name="stats_match",
+        description="Saisit les buts / passes de tous les joueurs d'un match en une fois."
+    )
+    @app_commands.describe(match_id="ID du match concerné")
+    async def stats_match(self, interaction: discord.Interaction, match_id: int):
+        match = self.data.get_match(match_id)
+        if not match:
+            await interaction.response.send_message("❌ Match introuvable.", ephemeral=True)
+            return
+
+        # Joueurs enregistrés du match dont les stats ne sont pas encore saisies
+        players = self.data.get_players()
+        entered = match.get("stats_entered", {})
+        participants = [
+            (pid, players[str(pid)]["name"])
+            for pid in match["team_a"] + match["team_b"]
+            if pid > 0 and str(pid) in players and not entered.get(str(pid))
+        ]
+        if not participants:
+            await interaction.response.send_message(
+                f"ℹ️ Les stats de tous les joueurs enregistrés du match #{match_id} sont déjà saisies.",
+                ephemeral=True
+            )
+            return
+
+        draft = MatchStatsDraft(self, match_id, participants, interaction.user.id)
+
+        enter_phase("send")
+        await interaction.response.send_modal(MatchStatsModal(draft))
+
+    async def _commit_match_stats(self, interaction: discord.Interaction, draft: MatchStatsDraft):
+        """Dernière page validée : toutes les stats en une transaction, puis récap public."""
+        if not draft.entries:
+            await interaction.response.send_message("ℹ️ Aucune stat saisie : rien n'a été enregistré.", ephemeral=True)
+            return
+
+        applied = self.data.record_match_stats(draft.match_id, draft.entries)
+        if applied is None:
+            await interaction.response.send_message("❌ Match introuvable (supprimé entre-temps ?).", ephemeral=True)
+            return
+
+        names = {pid: name for page in draft.pages for pid, name in page}
+        lines = [
+            f"• **{names[pid]}** — ⚽ {goals} · 🅰️ {assists}"
+            for pid, (goals, assists) in applied.items()
+        ]
+        skipped = [names[pid] for pid in draft.entries if pid not in applied]
+        if skipped:
+            lines.append(f"\n⚠️ Déjà saisies entre-temps, ignorées : {', '.join(skipped)}")
+
+        embed = discord.Embed(
+            title=f"📈 Stats du match #{draft.match_id}",
+            description="\n".join(lines) or "Aucune nouvelle stat enregistrée.",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Saisies par {interaction.user.display_name}")
+
+        await self.data.durable()
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(
         name="supprimer_match",
-        description="Supprime définitivement un match à partir de son ID."
+        description="(Admin) Supprime définitivement un match à partir de son ID."
     )
     @app_commands.describe(
         match_id="ID du match à supprimer (affiché lors de /creer_match)."
     )
+    @app_commands.default_permissions(administrator=True)
     async def supprimer_match(
         self,
         interaction: discord.Interaction,
         match_id: int
     ):
+        # La suppression annule aussi les victoires / points / MVP du match
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ Tu n'as pas la permission de supprimer des matchs.",
+                ephemeral=True
+            )
+            return
+
         # On vérifie d'abord s'il existe
         match = self.data.get_match(match_id)
         if not match:
@@ -645,15 +1261,8 @@ class Matches(commands.Cog):
             )
             return
 
-        # Optionnel : tu peux protéger la commande pour que seuls les admins l'utilisent
-        # if not interaction.user.guild_permissions.administrator:
-        #     await interaction.response.send_message(
-        #         "❌ Tu n'as pas la permission de supprimer des matchs.",
-        #         ephemeral=True
-        #     )
-        #     return
-
         removed = self.data.delete_match(match_id)
+        self.bot.scheduler.cancel(_job_key("mvp_close", match_id), _job_key("mvp_reminder", match_id))
         if not removed:
             await interaction.response.send_message(
                 f"❌ Impossible de supprimer le match **#{match_id}** (erreur interne).",
@@ -670,18 +1279,108 @@ class Matches(commands.Cog):
         else:
             score_txt = "Aucun score n'avait encore été enregistré pour ce match."
 
+        if "ledger" in removed:
+            stats_txt = "_Les contributions de ce match (résultat, stats, MVP) ont été **retirées des totaux** des joueurs._"
+        else:
+            stats_txt = "_Match enregistré avant le suivi par match : les stats des joueurs **ne sont pas modifiées**._"
+
         embed = discord.Embed(
             title=f"🗑️ Match #{match_id} supprimé",
             description=(
                 "Le match a été retiré de l'historique.\n\n"
                 f"{score_txt}\n\n"
-                "_Les stats déjà ajoutées aux joueurs **ne sont pas modifiées**._"
+                f"{stats_txt}"
             ),
             color=discord.Color.red()
         )
 
+        await self.data.durable()
+
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed)
+
+
+    # ---------------- HISTORIQUE ----------------
+
+    @app_commands.command(name="historique", description="Affiche les matchs joués par un joueur.")
+    @app_commands.describe(joueur="Joueur dont tu veux voir l'historique")
+    async def historique(self, interaction: discord.Interaction, joueur: discord.Member):
+        if self.data.count_player_matches(joueur.id) == 0:
+            await interaction.response.send_message(
+                f"ℹ️ **{joueur.display_name}** n'a encore joué aucun match.",
+                ephemeral=True
+            )
+            return
+
+        enter_phase("render")
+        view = HistoryView(self.data, joueur, interaction.user.id)
+        embed = view.embed()
+
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed, view=view if view.pages > 1 else discord.utils.MISSING)
+        view.interaction = interaction
+
+    # ---------------- DUO / RIVALITÉ ----------------
+
+    @app_commands.command(name="duo", description="Bilan de deux joueurs quand ils jouent dans la même équipe.")
+    @app_commands.describe(joueur1="Premier joueur", joueur2="Second joueur")
+    async def duo(self, interaction: discord.Interaction, joueur1: discord.Member, joueur2: discord.Member):
+        if joueur1.id == joueur2.id:
+            await interaction.response.send_message("❌ Choisis deux joueurs différents.", ephemeral=True)
+            return
+
+        stats = (await self.data.load_pairs()).duo(joueur1.id, joueur2.id)
+        if stats["matches"] == 0:
+            await interaction.response.send_message(
+                f"ℹ️ **{joueur1.display_name}** et **{joueur2.display_name}** n'ont encore jamais joué ensemble.",
+                ephemeral=True
+            )
+            return
+
+        enter_phase("render")
+        embed = discord.Embed(
+            title=f"🤝 Duo {joueur1.display_name} & {joueur2.display_name}",
+            description=(
+                f"Matchs ensemble : **{stats['matches']}**\n"
+                f"✅ Victoires : **{stats['wins']}** · ➖ Nuls : **{stats['draws']}** · ❌ Défaites : **{stats['losses']}**\n"
+                f"Taux de victoire ensemble : **{stats['win_rate']:.0%}**"
+            ),
+            color=discord.Color.teal()
+        )
+
+        enter_phase("send")
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="rivalite", description="Bilan de deux joueurs l'un contre l'autre.")
+    @app_commands.describe(joueur1="Premier joueur", joueur2="Second joueur")
+    async def rivalite(self, interaction: discord.Interaction, joueur1: discord.Member, joueur2: discord.Member):
+        if joueur1.id == joueur2.id:
+            await interaction.response.send_message("❌ Choisis deux joueurs différents.", ephemeral=True)
+            return
+
+        stats = (await self.data.load_pairs()).rivalry(joueur1.id, joueur2.id)
+        if stats["matches"] == 0:
+            await interaction.response.send_message(
+                f"ℹ️ **{joueur1.display_name}** et **{joueur2.display_name}** ne se sont encore jamais affrontés.",
+                ephemeral=True
+            )
+            return
+
+        enter_phase("render")
+        embed = discord.Embed(
+            title=f"⚔️ {joueur1.display_name} vs {joueur2.display_name}",
+            description=(
+                f"Confrontations : **{stats['matches']}** (dont **{stats['draws']}** nul(s))\n"
+                f"🏅 {joueur1.display_name} : **{stats['wins_a']}** victoire(s) ({stats['win_rate_a']:.0%})\n"
+                f"🏅 {joueur2.display_name} : **{stats['wins_b']}** victoire(s)"
+            ),
+            color=discord.Color.dark_red()
+        )
+
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: commands.Bot):
+    bot.add_dynamic_items(MvpVoteSelect)
     await bot.add_cog(Matches(bot))
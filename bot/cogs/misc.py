@@ -33,9 +33,13 @@ class Misc(commands.Cog):
             name="Matchs",
             value=(
                 "• **/creer_match** — Créer un match 5v5 équilibré.\n"
+                "• **/rejoindre** / **/quitter** — Entrer / sortir du lobby du salon (match créé automatiquement quand il est complet).\n"
                 "• **/resultat_match** — Enregistrer le score.\n"
                 "• **/ajouter_stats** — Ajouter buts/passes d’un match.\n"
-                "• **/supprimer_match** — Supprimer un match via son ID.\n"
+                "• **/stats_match** — Saisir buts/passes de tout un match en une fois.\n"
+                "• **/historique** — Historique des matchs d’un joueur (score, buts, passes, MVP).\n"
+                "• **/duo** — Bilan de deux joueurs dans la même équipe.\n"
+                "• **/rivalite** — Bilan de deux joueurs l’un contre l’autre.\n"
             ),
             inline=False
         )
@@ -44,8 +48,8 @@ class Misc(commands.Cog):
         embed.add_field(
             name="MVP",
             value=(
-                "• **/vote_mvp** — Voter pour le MVP d’un match.\n"
-                "• **/fin_mvp** — Clôturer le MVP et afficher le résultat.\n"
+                "• **/vote_mvp** — Voter pour le MVP d’un match (ou via le menu posté sous le résultat).\n"
+                "• **/fin_mvp** — Clôturer le MVP et afficher le résultat (sinon clôture automatique après le délai prévu).\n"
             ),
             inline=False
         )
@@ -62,6 +66,21 @@ class Misc(commands.Cog):
             inline=False
         )
 
+        # --- Admin ---
+        embed.add_field(
+            name="Admin",
+            value=(
+                "• **/corriger_resultat** — Corriger le score d'un match (totaux des joueurs mis à jour).\n"
+                "• **/supprimer_match** — Supprimer un match via son ID (ses stats sont retirées des totaux).\n"
+                "• **/recalculer_stats** — Recalculer les totaux des joueurs depuis l'historique.\n"
+                "• **/sync_commandes** — Forcer la synchro des slash commands.\n"
+                "• **/stats_bot** — Latences des commandes et accès disque.\n"
+                "• **/lenteurs** — Commandes qui ont bloqué la boucle du bot.\n"
+                "• **/profiler** — Profiler les prochaines exécutions d'une commande.\n"
+            ),
+            inline=False
+        )
+
         embed.set_footer(text="Bot Five — Le bot ultime pour organiser vos matchs ⚽🔥")
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -1,14 +1,106 @@
+import os
+import time
 import discord
 from discord.ext import commands
 from discord import app_commands
 
+from collections import OrderedDict
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 
+from metrics import registry as metrics, SIZE_BUCKETS, enter_phase
+from player_store import PlayerStore
+
+# Taille max (en octets) visée pour la carte envoyée sur Discord
+CARD_MAX_BYTES = int(os.getenv("CARD_MAX_BYTES", "200000"))
+
+# Nombre de cartes encodées gardées en mémoire
+CARD_CACHE_SIZE = int(os.getenv("CARD_CACHE_SIZE", "128"))
+
+# Qualités WebP essayées, de la plus fidèle à la plus compacte.
+# La première est considérée "sans perte visible", on ne descend
+# plus bas que si le budget n'est pas tenu.
+CARD_WEBP_QUALITIES = (90, 80, 70, 60)
+
+# Champs du joueur qui changent le rendu de la carte
+CARD_FIELDS = (
+    "name", "rating", "tir", "passes", "physique", "influence", "gardien",
+    "card_color", "card_border", "card_tagline",
+)
+
+
+def points_rank(players, user_id: int) -> int | None:
+    """
+    Place du joueur au classement (points, victoires, buts, passes), en un
+    seul passage : même résultat qu'un tri stable décroissant, sans trier.
+    """
+    if isinstance(players, PlayerStore):
+        rows = zip(
+            players.column("points"), players.column("wins"), players.column("goals"),
+            players.column("assists"), players.column("id"),
+        )
+        keyed = [((pts, w, g, a), pid) for pts, w, g, a, pid in rows]
+    else:
+        keyed = [((p["points"], p["wins"], p["goals"], p["assists"]), p["id"]) for p in players.values()]
+
+    target = next((key for key, pid in keyed if pid == user_id), None)
+    if target is None:
+        return None
+    rank, seen_self = 1, False
+    for key, pid in keyed:
+        if pid == user_id:
+            seen_self = True
+        elif key > target or (key == target and not seen_self):
+            rank += 1
+    return rank
+
+
+def encode_card(img: Image.Image, max_bytes: int = CARD_MAX_BYTES) -> tuple[bytes, str]:
+    """
+    Encode la carte dans le format le plus léger qui tient dans `max_bytes`.
+
+    Premier passage : WebP haute qualité et PNG palettisé (256 couleurs),
+    on garde le plus petit des deux s'il tient dans le budget.
+    Sinon on baisse la qualité WebP palier par palier.
+    Retourne (octets, extension).
+    """
+    # La carte est opaque : on évite de payer un canal alpha inutile
+    has_alpha = img.mode == "RGBA" and img.getchannel("A").getextrema()[0] < 255
+    if not has_alpha:
+        img = img.convert("RGB")
+
+    def webp(quality: int) -> bytes:
+        buf = BytesIO()
+        img.save(buf, format="WEBP", quality=quality, method=4)
+        return buf.getvalue()
+
+    def palette_png() -> bytes:
+        method = Image.Quantize.FASTOCTREE if has_alpha else Image.Quantize.MEDIANCUT
+        buf = BytesIO()
+        img.quantize(colors=256, method=method).save(buf, format="PNG", optimize=True)
+        return buf.getvalue()
+
+    candidates = [(webp(CARD_WEBP_QUALITIES[0]), "webp"), (palette_png(), "png")]
+    fitting = [c for c in candidates if len(c[0]) <= max_bytes]
+    if fitting:
+        return min(fitting, key=lambda c: len(c[0]))
+
+    for quality in CARD_WEBP_QUALITIES[1:]:
+        data = webp(quality)
+        candidates.append((data, "webp"))
+        if len(data) <= max_bytes:
+            return data, "webp"
+
+    # Rien ne tient dans le budget : on envoie quand même le plus petit
+    return min(candidates, key=lambda c: len(c[0]))
+
+
 class Players(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.data = bot.data_manager
+        # (joueur, avatar, champs de la carte) -> (octets encodés, extension)
+        self._card_cache: OrderedDict[tuple, tuple[bytes, str]] = OrderedDict()
 
     # -------------------------------------------------
     # Embed pour confirmation mise à jour joueur
@@ -77,7 +169,13 @@ class Players(commands.Cog):
             gardien=gardien,
         )
 
+        enter_phase("render")
         embed = self._rating_embed(joueur, player)
+
+        # On ne répond qu'une fois les modifications écrites sur disque
+        await self.data.durable()
+
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # -------------------------------------------------
@@ -91,6 +189,7 @@ class Players(commands.Cog):
             await interaction.response.send_message("Aucun joueur enregistré pour le moment.", ephemeral=True)
             return
 
+        enter_phase("render")
         embed = discord.Embed(
             title="Liste des joueurs",
             color=discord.Color.blurple()
@@ -115,6 +214,7 @@ class Players(commands.Cog):
         if chunk:
             embed.add_field(name="\u200b", value=chunk, inline=False)
 
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(
@@ -158,6 +258,7 @@ class Players(commands.Cog):
             updates["card_tagline"] = texte.strip()
 
         self.data.update_player_stats(user.id, **updates)
+        await self.data.durable()
 
         desc = f"🎨 **Ta carte a été personnalisée !**\n\n• Fond : `{couleur}`"
         if bordure:
@@ -166,10 +267,33 @@ class Players(commands.Cog):
             desc += f"\n• Texte : `{texte or '(supprimé)'}`"
 
         embed = discord.Embed(title="Personnalisation mise à jour", description=desc, color=discord.Color.green())
+
+        enter_phase("send")
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    def _build_fut_card(self, member: discord.Member, player: dict, avatar_bytes: bytes) -> BytesIO:
-        """Génère une carte style FUT et renvoie un buffer PNG prêt à être envoyé."""
+    def _card_cache_key(self, member: discord.Member, player: dict) -> tuple:
+        fields = tuple(player.get(k) for k in CARD_FIELDS)
+        return (member.id, member.display_avatar.key, member.display_name, fields)
+
+    async def _get_fut_card(self, member: discord.Member, player: dict) -> tuple[BytesIO, str]:
+        """Renvoie la carte depuis le cache, ou la génère (avatar compris) si besoin."""
+        key = self._card_cache_key(member, player)
+        cached = self._card_cache.get(key)
+        if cached is not None:
+            self._card_cache.move_to_end(key)
+            metrics.incr("card_cache_total", result="hit")
+            data, ext = cached
+            return BytesIO(data), ext
+
+        metrics.incr("card_cache_total", result="miss")
+        avatar_bytes = await member.display_avatar.read()
+        return self._build_fut_card(member, player, avatar_bytes)
+
+    def _build_fut_card(self, member: discord.Member, player: dict, avatar_bytes: bytes) -> tuple[BytesIO, str]:
+        """
+        Génère une carte style FUT, l'encode au plus léger et la met en cache.
+        Renvoie (buffer prêt à être envoyé, extension du fichier).
+        """
         from PIL import Image, ImageDraw, ImageFont
 
         # ---------- Petites fonctions utilitaires ----------
@@ -366,10 +490,16 @@ class Players(commands.Cog):
         ft_w, ft_h = text_size(footer_text, stat_font)
         draw.text((width - ft_w - 15, height - ft_h - 10), footer_text, font=stat_font, fill=(230, 230, 230, 200))
 
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
+        start = time.perf_counter()
+        data, ext = encode_card(img)
+        metrics.observe("card_encode_seconds", time.perf_counter() - start, format=ext)
+        metrics.observe("card_encode_bytes", len(data), buckets=SIZE_BUCKETS, format=ext)
+
+        self._card_cache[self._card_cache_key(member, player)] = (data, ext)
+        while len(self._card_cache) > CARD_CACHE_SIZE:
+            self._card_cache.popitem(last=False)
+
+        return BytesIO(data), ext
 
     # -------------------------------------------------
     # /stats_joueur — Stats complètes bien séparées
@@ -383,12 +513,8 @@ class Players(commands.Cog):
 
         # Classement général (par points)
         players = self.data.get_players()
-        sorted_by_points = sorted(
-            players.values(),
-            key=lambda p: (p["points"], p["wins"], p["goals"], p["assists"]),
-            reverse=True
-        )
-        rank = next((i + 1 for i, p in enumerate(sorted_by_points) if p["id"] == joueur.id), None)
+        enter_phase("render")
+        rank = points_rank(players, joueur.id)
 
         # Embed texte
         embed = discord.Embed(
@@ -442,12 +568,12 @@ class Players(commands.Cog):
                 inline=False
             )
 
-        # Génération de la carte style FUT
-        avatar_bytes = await joueur.display_avatar.read()
-        card_buffer = self._build_fut_card(joueur, player, avatar_bytes)
-        file = discord.File(fp=card_buffer, filename=f"carte_{joueur.id}.png")
+        # Génération de la carte style FUT (ou récupération depuis le cache)
+        card_buffer, ext = await self._get_fut_card(joueur, player)
+        file = discord.File(fp=card_buffer, filename=f"carte_{joueur.id}.{ext}")
 
         # On envoie embed + image en même temps
+        enter_phase("send")
         await interaction.response.send_message(embed=embed, file=file)
 
 
@@ -2,14 +2,50 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from metrics import enter_phase
+from player_store import PlayerStore
+
+
+def general_sort_key(p: dict):
+    """Clé de tri du classement général (à utiliser avec reverse=True)."""
+    return (
+        p.get("points", 0),                     # 1 : points
+        p.get("goals", 0),                      # 2 : buts
+        p.get("assists", 0),                    # 3 : passes
+        p.get("wins", 0),                       # 4 : victoires
+        p.get("wins", 0) - p.get("losses", 0),  # 5 : diff V-D
+        p.get("mvps", 0),                       # 6 : nombre de MVP
+        p.get("name", "").lower()               # 7 : ordre alphabétique
+    )
+
+
+def rank_general(players) -> list:
+    """Classement général ; directement sur les colonnes si les joueurs sont en PlayerStore."""
+    if isinstance(players, PlayerStore):
+        wins, losses = players.column("wins"), players.column("losses")
+        diff = [w - l for w, l in zip(wins, losses)]
+        return players.ranked("points", "goals", "assists", "wins", diff, "mvps")
+    return sorted(players.values(), key=general_sort_key, reverse=True)
+
+
+def rank_by(players, *fields: str, by_name: bool = False) -> list:
+    """Tri décroissant sur `fields` (puis sur le nom si `by_name`)."""
+    if isinstance(players, PlayerStore):
+        return players.ranked(*fields, by_name=by_name)
+
+    def key(p):
+        values = tuple(p.get(f, 0) for f in fields)
+        return values + (p.get("name", "").lower(),) if by_name else values
+
+    return sorted(players.values(), key=key, reverse=True)
+
 
 class Rankings(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.data = bot.data_manager
 
-    def _star_if_top_mvp(self, player, players):
-        max_mvp = max((p["mvps"] for p in players.values()), default=0)
+    def _star_if_top_mvp(self, player, max_mvp: int):
         if player["mvps"] == max_mvp and max_mvp > 0:
             return "⭐"
         return " "
@@ -29,19 +65,9 @@ class Rankings(commands.Cog):
             await interaction.response.send_message("Aucun joueur enregistré.", ephemeral=True)
             return
 
-        sorted_players = sorted(
-            players.values(),
-            key=lambda p: (
-                p.get("points", 0),                     # 1 : points
-                p.get("goals", 0),                      # 2 : buts
-                p.get("assists", 0),                    # 3 : passes
-                p.get("wins", 0),                       # 4 : victoires
-                p.get("wins", 0) - p.get("losses", 0),  # 5 : diff V-D
-                p.get("mvps", 0),                       # 6 : nombre de MVP
-                p.get("name", "").lower()               # 7 : ordre alphabétique
-            ),
-            reverse=True
-        )
+        enter_phase("render")
+        sorted_players = rank_general(players)
+        max_mvp = max((p["mvps"] for p in sorted_players), default=0)
 
         embed = discord.Embed(
             title="🏆 Classement général",
@@ -62,7 +88,7 @@ class Rankings(commands.Cog):
         lines = [header_line]
 
         for i, p in enumerate(sorted_players, start=1):
-            star = self._star_if_top_mvp(p, players)  # '⭐' ou ' '
+            star = self._star_if_top_mvp(p, max_mvp)  # '⭐' ou ' '
             name_short = self._short_name(p.get("name", "?"), 7)
 
             line = (
@@ -89,6 +115,7 @@ class Rankings(commands.Cog):
         if chunk:
             embed.add_field(name="\u200b", value=f"```txt\n{chunk}```", inline=False)
 
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # ============ CLASSEMENT BUTEURS ============
@@ -100,7 +127,8 @@ class Rankings(commands.Cog):
             await interaction.response.send_message("Aucun joueur enregistré.", ephemeral=True)
             return
 
-        sorted_players = sorted(players.values(), key=lambda p: p.get("goals", 0), reverse=True)
+        enter_phase("render")
+        sorted_players = rank_by(players, "goals")
 
         embed = discord.Embed(
             title="⚽ Classement buteurs",
@@ -134,6 +162,7 @@ class Rankings(commands.Cog):
         if chunk:
             embed.add_field(name="\u200b", value=f"```txt\n{chunk}```", inline=False)
 
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # ============ CLASSEMENT PASSEURS ============
@@ -145,7 +174,8 @@ class Rankings(commands.Cog):
             await interaction.response.send_message("Aucun joueur enregistré.", ephemeral=True)
             return
 
-        sorted_players = sorted(players.values(), key=lambda p: p.get("assists", 0), reverse=True)
+        enter_phase("render")
+        sorted_players = rank_by(players, "assists")
 
         embed = discord.Embed(
             title="🎯 Classement passeurs",
@@ -179,6 +209,7 @@ class Rankings(commands.Cog):
         if chunk:
             embed.add_field(name="\u200b", value=f"```txt\n{chunk}```", inline=False)
 
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
     # ============ CLASSEMENT STATS (UNE SEULE TABLE) ============
@@ -193,17 +224,9 @@ class Rankings(commands.Cog):
             await interaction.response.send_message("Aucun joueur enregistré.", ephemeral=True)
             return
 
+        enter_phase("render")
         # Tri par note globale, puis tir, passes, nom
-        sorted_players = sorted(
-            players.values(),
-            key=lambda p: (
-                p.get("rating", 0),
-                p.get("tir", 0),
-                p.get("passes", 0),
-                p.get("name", "").lower()
-            ),
-            reverse=True
-        )
+        sorted_players = rank_by(players, "rating", "tir", "passes", by_name=True)
 
         embed = discord.Embed(
             title="📈 Classement des stats de profil",
@@ -271,6 +294,7 @@ class Rankings(commands.Cog):
                 inline=False
             )
 
+        enter_phase("send")
         await interaction.response.send_message(embed=embed)
 
 
@@ -1,29 +1,194 @@
-import json
+import asyncio
+import bisect
+import os
+import shutil
+import time
 from pathlib import Path
 from threading import Lock
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+
+from archive import MatchArchive, segment_name
+from aggregates import AGGREGATE_FIELDS, diff_totals, rebuild_totals
+from metrics import registry as metrics, current_command, phase
+from name_index import NameIndex
+from pairs import PairStats
+from player_store import PlayerStore
+from serializers import Serializer, get_serializer, serializer_for
+
+# Fenêtre de regroupement des écritures (secondes) : toutes les modifications
+# faites pendant cette fenêtre partent dans une seule écriture du fichier.
+COMMIT_WINDOW = float(os.getenv("DATA_COMMIT_WINDOW", "0.05"))
+# Écriture en échec : nouvel essai après un délai qui double, jusqu'à ce plafond (secondes)
+COMMIT_RETRY_MAX = float(os.getenv("DATA_COMMIT_RETRY_MAX", "30"))
+
+# Format du fichier de données : "json" (orjson si installé) ou "msgpack"
+DATA_FORMAT = os.getenv("DATA_FORMAT", "json")
+
+# Représentation des joueurs en mémoire : "dict" (un dict par joueur) ou
+# "colonnes" (PlayerStore : une colonne par stat, bien plus compact)
+PLAYER_STORE = os.getenv("DATA_PLAYER_STORE", "dict")
+
+# Sauvegardes horodatées de data.json : combien on en garde, et au plus une
+# nouvelle toutes les BACKUP_INTERVAL secondes
+BACKUP_COUNT = int(os.getenv("DATA_BACKUPS", "10"))
+BACKUP_INTERVAL = float(os.getenv("DATA_BACKUP_INTERVAL", "3600"))
+
+# Archivage des matchs clos (score + MVP) : âge minimum, et nombre maximum
+# déplacés par passage (l'archivage tourne dans la boucle du bot)
+ARCHIVE_AFTER_DAYS = float(os.getenv("DATA_ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH = int(os.getenv("DATA_ARCHIVE_BATCH", "500"))
+
+# Issues possibles de add_mvp_vote
+MVP_VOTE_ACCEPTED = "accepted"
+MVP_VOTE_DUPLICATE = "duplicate"
+MVP_VOTE_CLOSED = "closed"
+
+
+class CorruptDataError(ValueError):
+    """data.json illisible ou structure invalide."""
+
+
+def check_data(data) -> dict:
+    """Vérification rapide de la structure chargée ; lève CorruptDataError si invalide."""
+    if not isinstance(data, dict):
+        raise CorruptDataError("la racine n'est pas un objet")
+    for key in ("players", "matches", "jobs", "lobbies"):
+        if key in data and not isinstance(data[key], dict):
+            raise CorruptDataError(f"'{key}' n'est pas un objet")
+    for pid, player in data.get("players", {}).items():
+        if not isinstance(player, dict):
+            raise CorruptDataError(f"joueur {pid} invalide")
+    for mid, match in data.get("matches", {}).items():
+        if not isinstance(match, dict) or not isinstance(match.get("team_a"), list) or not isinstance(match.get("team_b"), list):
+            raise CorruptDataError(f"match {mid} invalide")
+    return data
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def normalize_ids(data: dict) -> dict:
+    """
+    Une seule représentation des IDs en mémoire : des int partout dans les
+    valeurs (id des joueurs et matchs, équipes, cibles des votes, gagnants).
+    Les clés des dicts restent des str (clés d'objet JSON).
+    """
+    for pid, player in data.get("players", {}).items():
+        player["id"] = _to_int(player.get("id") or pid)
+    for mid, match in data.get("matches", {}).items():
+        match["id"] = _to_int(match.get("id") or mid)
+        match["team_a"] = [_to_int(x) for x in match["team_a"]]
+        match["team_b"] = [_to_int(x) for x in match["team_b"]]
+        votes = match.get("mvp_votes")
+        if votes:
+            match["mvp_votes"] = {str(voter): _to_int(target) for voter, target in votes.items()}
+        if match.get("mvp_winners"):
+            match["mvp_winners"] = [_to_int(x) for x in match["mvp_winners"]]
+    return data
+
+
+def _fsync_dir(path: Path):
+    """Rend le renommage durable (POSIX) ; sans effet là où c'est impossible."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class DataManager:
-    def __init__(self, path: str = "data/data.json"):
-        self.path = Path(path)
+    """
+    Données du bot (joueurs, matchs) gardées en mémoire et persistées dans
+    `data.json` par "group commit" :
+
+    - les méthodes modifient l'état en mémoire immédiatement (et restent
+      synchrones : pas d'await entre la vérification et la modification) ;
+    - dans la boucle asyncio, l'écriture est différée de `commit_window`
+      secondes, pour regrouper toutes les modifications de la fenêtre en une
+      seule écriture atomique ;
+    - `await durable()` attend que tout ce qui a été modifié jusque-là soit
+      sur disque : les commandes l'appellent avant de répondre.
+
+    Hors boucle asyncio (scripts, outils), chaque modification est écrite
+    tout de suite.
+    Le fichier n'est relu qu'au démarrage : ne pas l'éditer à la main
+    pendant que le bot tourne.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/data.json",
+        commit_window: float = COMMIT_WINDOW,
+        backup_count: int = BACKUP_COUNT,
+        backup_interval: float = BACKUP_INTERVAL,
+        serializer: Serializer | str | None = None,
+        columnar: bool | None = None,
+    ):
+        if not isinstance(serializer, Serializer):
+            serializer = get_serializer(serializer or DATA_FORMAT)
+        self.serializer = serializer
+        self.columnar = PLAYER_STORE == "colonnes" if columnar is None else columnar
+        # L'extension suit le format (data.json / data.msgpack)
+        self.path = Path(path).with_suffix(serializer.suffix)
         self.lock = Lock()
+        self.commit_window = commit_window
+        self.backup_dir = self.path.parent / "backups"
+        self.backup_count = backup_count
+        self.backup_interval = backup_interval
+        self._last_backup = self._newest_backup_time()
+
+        self._data: dict = {}
+        self._pending: asyncio.Future | None = None    # lot en cours de remplissage
+        self._pending_count = 0
+        self._pending_timer: asyncio.TimerHandle | None = None
+        self._inflight: asyncio.Future | None = None   # lot en cours d'écriture
+        self._commit_lock: asyncio.Lock | None = None
+        self._commit_failures = 0                       # échecs d'écriture consécutifs
+        self._mutations = 0                             # modifications depuis le chargement
+
         self._ensure_file()
+        if self.columnar:
+            self._data["players"] = PlayerStore.from_dicts(self._data["players"])
+
+        # Index des pseudos en mémoire (autocomplete, résolution des noms)
+        self.name_index = NameIndex()
+        self.name_index.build(self._read()["players"])
+
+        # Index inversé joueur -> ids de ses matchs (triés)
+        # Matchs clos archivés hors de data.json (voir ARCHIVES)
+        self.archive = MatchArchive(self.path.parent / "archive")
+        self.match_index: dict[int, list[int]] = {}
+        self._build_match_index()
+        # Stats par paire de joueurs : calculées au premier usage (voir pairs)
+        self._pairs: PairStats | None = None
 
     def _ensure_file(self):
         if not self.path.parent.exists():
             self.path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Reste d'une écriture interrompue : le vrai fichier n'a pas été touché
+        self._tmp_path.unlink(missing_ok=True)
+
+        self._migrate()
+
         if not self.path.exists():
             # Fichier inexistant → on crée une structure propre
-            self._write({
+            self._data = {
                 "players": {},
                 "matches": {},
-                "last_match_id": 0
-            })
+                "last_match_id": 0,
+                "jobs": {}
+            }
+            self._write(self._data)
         else:
             # Fichier existant → on vérifie que la structure a bien toutes les clés
-            data = self._read()
+            data = self._data = self._load_or_restore()
             changed = False
 
             if "players" not in data or not isinstance(data["players"], dict):
@@ -38,18 +203,241 @@ class DataManager:
                 data["last_match_id"] = 0
                 changed = True
 
+            if "jobs" not in data:
+                data["jobs"] = {}
+                changed = True
+
             if changed:
                 self._write(data)
 
-    def _read(self):
+    def _migrate(self):
+        """
+        Convertit les données d'un autre format (ex: data.json → data.msgpack).
+        La source est ensuite renommée en `.migre` : un retour à l'ancien
+        format reconvertit les données à jour au lieu de relire un fichier périmé.
+        """
+        for suffix in (".json", ".msgpack"):
+            source = self.path.with_suffix(suffix)
+            if source == self.path or not source.exists():
+                continue
+            done = source.with_name(source.name + ".migre")
+
+            # Les deux existent (crash juste après une conversion, ou ancienne
+            # version qui gardait la source) : la plus récente fait foi
+            if self.path.exists() and self.path.stat().st_mtime >= source.stat().st_mtime:
+                source.replace(done)
+                print(f"[DataManager] {source.name} plus ancien que {self.path.name} : renommé en {done.name}")
+                continue
+
+            self._data = self._load(source)
+            self._write_file(self._serialize(), batch=0)
+            source.replace(done)
+            print(f"[DataManager] Données converties : {source.name} → {self.path.name} (ancien fichier renommé en {done.name})")
+            return
+
+    def _load_or_restore(self) -> dict:
+        """
+        Charge data.json ; s'il est corrompu, le met de côté et repart de la
+        sauvegarde valide la plus récente.
+        """
+        try:
+            return self._load(self.path)
+        except (OSError, ValueError) as e:
+            error = e
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        corrupt = self.path.with_name(f"{self.path.name}.corrompu-{stamp}")
+        self.path.replace(corrupt)
+        print(f"[DataManager] {self.path} illisible ({error}) : déplacé vers {corrupt.name}")
+
+        for backup in self.backups():
+            try:
+                data = self._load(backup)
+            except (OSError, ValueError) as e:
+                print(f"[DataManager] Sauvegarde {backup.name} illisible ({e}), on essaie la précédente")
+                continue
+            print(f"[DataManager] Restauration depuis {backup.name}")
+            metrics.incr("storage_restores_total")
+            self._data = data
+            self._write_file(self._serialize(), batch=0)
+            return data
+
+        raise CorruptDataError(
+            f"{self.path} est corrompu et aucune sauvegarde valide n'existe dans {self.backup_dir}"
+        ) from error
+
+    # Toutes les lectures / écritures passent par ici : on compte les accès
+    # par commande, et le temps passé part dans la phase "storage".
+
+    def _load(self, path: Path) -> dict:
+        start = time.perf_counter()
         with self.lock:
-            with self.path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            with path.open("rb") as f:
+                raw = f.read()
+        data = normalize_ids(check_data(serializer_for(path).loads(raw)))
+        metrics.incr("storage_read_bytes_total", len(raw))
+        metrics.observe("storage_read_seconds", time.perf_counter() - start)
+        return data
+
+    def _read(self):
+        metrics.incr("storage_reads_total", command=current_command())
+        return self._data
+
+    def _write(self, data=None):
+        """
+        Signale une modification de l'état en mémoire (`data` est ignoré :
+        c'est toujours l'état complet qui est écrit).
+        """
+        metrics.incr("storage_mutations_total", command=current_command())
+        self._mutations += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            self._write_file(self._serialize(), batch=1)
+            return
+
+        self._arm_commit(loop, self.commit_window)
+        self._pending_count += 1
+
+    def _arm_commit(self, loop: asyncio.AbstractEventLoop, delay: float):
+        """Ouvre un lot (écrit dans `delay` secondes) s'il n'y en a pas déjà un."""
+        if self._pending is None:
+            self._pending = loop.create_future()
+            self._pending_timer = loop.call_later(delay, self._start_commit)
 
-    def _write(self, data):
+    def _serialize(self) -> bytes:
+        data = self._data
+        if isinstance(data.get("players"), PlayerStore):
+            data = {**data, "players": data["players"].to_dicts()}
+        return self.serializer.dumps(data)
+
+    @property
+    def _tmp_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".tmp")
+
+    def _write_file(self, raw: bytes, batch: int):
+        """
+        Écriture atomique : fichier temporaire + fsync, sauvegarde éventuelle
+        de l'ancienne version, puis remplacement. Un crash à n'importe quel
+        moment laisse soit l'ancien fichier, soit le nouveau, jamais un
+        fichier tronqué.
+        """
+        start = time.perf_counter()
+        tmp = self._tmp_path
         with self.lock:
-            with self.path.open("w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            with tmp.open("wb") as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            self._rotate_backups()
+            tmp.replace(self.path)
+            _fsync_dir(self.path.parent)
+        metrics.incr("storage_writes_total")
+        metrics.incr("storage_write_bytes_total", len(raw))
+        metrics.observe("storage_write_seconds", time.perf_counter() - start)
+        metrics.observe("storage_commit_batch_size", batch, buckets=(1, 2, 5, 10, 20, 50, 100))
+
+    # ---------- SAUVEGARDES ----------
+
+    def backups(self) -> list[Path]:
+        """Sauvegardes existantes, de la plus récente à la plus ancienne."""
+        if not self.backup_dir.exists():
+            return []
+        return sorted(self.backup_dir.glob(f"{self.path.stem}-*{self.path.suffix}"), reverse=True)
+
+    def _newest_backup_time(self) -> float:
+        for backup in self.backups():
+            try:
+                stamp = backup.stem.removeprefix(f"{self.path.stem}-")
+                return datetime.strptime(stamp, "%Y%m%d-%H%M%S").replace(tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                continue
+        return 0.0
+
+    def _rotate_backups(self):
+        """
+        Garde la version actuelle de data.json comme sauvegarde (au plus une
+        par `backup_interval`), puis supprime les plus anciennes au-delà de
+        `backup_count`. Appelé sous `self.lock`, juste avant le remplacement.
+        """
+        if self.backup_count <= 0 or not self.path.exists():
+            return
+        now = time.time()
+        if now - self._last_backup < self.backup_interval:
+            return
+
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        backup = self.backup_dir / f"{self.path.stem}-{stamp}{self.path.suffix}"
+        try:
+            # Lien physique : pas de copie, le remplacement qui suit ne touche pas l'ancien inode
+            os.link(self.path, backup)
+        except FileExistsError:
+            return
+        except OSError:
+            shutil.copy2(self.path, backup)
+        self._last_backup = now
+        metrics.incr("storage_backups_total")
+
+        for old in self.backups()[self.backup_count:]:
+            old.unlink(missing_ok=True)
+
+    # ---------- GROUP COMMIT ----------
+
+    def _start_commit(self):
+        future, batch = self._pending, self._pending_count
+        self._pending, self._pending_count, self._pending_timer = None, 0, None
+        self._inflight = future
+        asyncio.ensure_future(self._commit(future, batch))
+
+    async def _commit(self, future: asyncio.Future, batch: int):
+        if self._commit_lock is None:
+            self._commit_lock = asyncio.Lock()
+        # Un lot à la fois : le suivant attend, puis écrit l'état le plus récent
+        async with self._commit_lock:
+            try:
+                # Sérialisation dans la boucle (l'état ne doit pas bouger pendant
+                # le dump), écriture + fsync dans un thread
+                raw = self._serialize()
+                await asyncio.to_thread(self._write_file, raw, batch)
+            except Exception as e:
+                # L'état reste en mémoire : on rouvre un lot pour le réécrire
+                # (délai doublé à chaque échec), que flush() écrira aussi
+                self._commit_failures += 1
+                delay = min(COMMIT_RETRY_MAX, self.commit_window * 2 ** self._commit_failures)
+                print(f"[DataManager] Écriture de {self.path} impossible : {e!r} (nouvel essai dans {delay:.2f} s)")
+                metrics.incr("storage_write_errors_total")
+                self._arm_commit(asyncio.get_running_loop(), delay)
+                if not future.done():
+                    future.set_exception(e)
+                    # Déjà journalisée : pas d'avertissement si personne n'attendait ce lot
+                    future.exception()
+            else:
+                self._commit_failures = 0
+                if not future.done():
+                    future.set_result(None)
+            finally:
+                if self._inflight is future:
+                    self._inflight = None
+
+    async def durable(self):
+        """Attend que toutes les modifications faites jusqu'ici soient écrites sur disque."""
+        # Le lot en attente est écrit après celui en cours : l'attendre suffit
+        future = self._pending or self._inflight
+        if future is None:
+            return
+        with phase("storage"):
+            await asyncio.shield(future)
+
+    async def flush(self):
+        """Écrit tout de suite le lot en attente (arrêt du bot) et attend la fin."""
+        if self._pending is not None:
+            self._pending_timer.cancel()
+            self._start_commit()
+        await self.durable()
 
     # ---------- PLAYERS ----------
 
@@ -187,6 +575,7 @@ class DataManager:
                     player[key] = default_value
 
         self._write(data)
+        self.name_index.add(int(user_id), name)
         return data["players"][pid]
 
     def update_player_stats(self, user_id: int, **kwargs):
@@ -213,6 +602,85 @@ class DataManager:
         self._write(data)
         return player
 
+    # ---------- INDEX JOUEUR -> MATCHS ----------
+
+    def _build_match_index(self):
+        index: dict[int, list[int]] = {}
+        hot = self._read()["matches"]
+        for match in hot.values():
+            for pid in match["team_a"] + match["team_b"]:
+                if pid > 0:
+                    index.setdefault(pid, []).append(match["id"])
+        # Matchs archivés : joueurs lus dans l'index de l'archive, sans décompresser
+        for mid, pids in self.archive.player_index():
+            if str(mid) not in hot:
+                for pid in pids:
+                    index.setdefault(pid, []).append(mid)
+        for ids in index.values():
+            ids.sort()
+        self.match_index = index
+
+    def _index_match(self, match: dict):
+        for pid in match["team_a"] + match["team_b"]:
+            if pid > 0:
+                bisect.insort(self.match_index.setdefault(pid, []), match["id"])
+
+    def _unindex_match(self, match: dict):
+        for pid in match["team_a"] + match["team_b"]:
+            ids = self.match_index.get(pid)
+            if not ids:
+                continue
+            i = bisect.bisect_left(ids, match["id"])
+            if i < len(ids) and ids[i] == match["id"]:
+                del ids[i]
+            if not ids:
+                del self.match_index[pid]
+
+    def count_player_matches(self, user_id: int) -> int:
+        return len(self.match_index.get(user_id, ()))
+
+    def player_matches(self, user_id: int, offset: int = 0, limit: int = 10) -> list[dict]:
+        """Matchs du joueur, du plus récent au plus ancien : O(limit) via l'index."""
+        ids = self.match_index.get(user_id, [])
+        end = len(ids) - offset
+        if end <= 0:
+            return []
+        page = ids[max(0, end - limit):end]
+        matches = (self.get_match(mid) for mid in reversed(page))
+        return [match for match in matches if match is not None]
+
+    # ---------- STATS PAR PAIRE ----------
+
+    @property
+    def pairs(self) -> PairStats:
+        """
+        Synergies / face-à-face, construits au premier accès puis tenus à jour.
+        Depuis une commande, passer d'abord par `await load_pairs()`.
+        """
+        if self._pairs is None:
+            self.rebuild_pairs()
+        return self._pairs
+
+    async def load_pairs(self) -> PairStats:
+        """Comme `pairs`, mais le premier calcul (archive comprise) se fait dans un thread."""
+        for _attempt in range(3):
+            if self._pairs is not None:
+                return self._pairs
+            version = self._mutations
+            pairs = await self._in_thread(PairStats.from_matches)
+            # Un résultat enregistré pendant le calcul n'y serait pas : on recommence
+            if self._pairs is None and self._mutations == version:
+                self._pairs = pairs
+        return self.pairs
+
+    def rebuild_pairs(self) -> PairStats:
+        self._pairs = PairStats.from_matches(self.iter_matches())
+        return self._pairs
+
+    def _apply_pairs(self, match: dict, sign: int = 1):
+        if self._pairs is not None and match.get("result_recorded"):
+            self._pairs.apply(match["team_a"], match["team_b"], match["score_a"], match["score_b"], sign)
+
     # ---------- MATCHES ----------
 
     def create_match(self, team_a_ids, team_b_ids, channel_id: int):
@@ -240,91 +708,469 @@ class DataManager:
             "score_b": None,
             "result_recorded": False,
             "mvp_open": True,
-            "mvp_votes": {},      # voter_id -> target_player_id
-            "stats_entered": {}   # player_id -> True (stats déjà ajoutées pour ce match)
+            "mvp_votes": {},      # voter_id -> target_player_id (clés = votants)
+            "mvp_tally": {},      # target_player_id -> nb de votes, tenu à jour à chaque vote
+            "stats_entered": {},  # player_id -> True (stats déjà ajoutées pour ce match)
+            "ledger": []          # contributions aux totaux des joueurs (voir LEDGER PAR MATCH)
         }
 
+        self._index_match(data["matches"][str(match_id)])
         self._write(data)
         return data["matches"][str(match_id)]
 
     def delete_match(self, match_id: int | str):
-        """Supprime un match du fichier data.json. Retourne le match supprimé ou None."""
+        """
+        Supprime un match et annule ses contributions aux totaux des joueurs
+        (ledger du match). Retourne le match supprimé ou None.
+        """
         data = self._read()
         mid = str(match_id)
 
-        if "matches" not in data or mid not in data["matches"]:
+        if "matches" not in data or self._hot_match(mid) is None:
             return None
 
         removed = data["matches"].pop(mid)
+        # Encore indexé (ressorti de l'archive, ou en double après un crash) :
+        # l'archive ne doit pas le ressortir
+        if mid in self.archive:
+            self.archive.remove(mid)
+        self._unindex_match(removed)
+        self._apply_pairs(removed, sign=-1)
+        self._revert_entries(data, removed.get("ledger", []))
         self._write(data)
         return removed
 
     def get_match(self, match_id: int | str):
+        """Match en cours ou archivé (lecture seule : passer par update_match & co pour modifier)."""
         data = self._read()
-        return data["matches"].get(str(match_id))
+        match = data["matches"].get(str(match_id))
+        if match is None:
+            match = self.archive.get(match_id)
+        return match
 
     def update_match(self, match_id: int | str, **kwargs):
         data = self._read()
-        mid = str(match_id)
-        if mid not in data["matches"]:
+        match = self._hot_match(match_id)
+        if match is None:
             return None
-        match = data["matches"][mid]
         for key, value in kwargs.items():
             match[key] = value
         self._write(data)
         return match
 
-    def add_mvp_vote(self, match_id: int | str, voter_id: int, target_player_id: int):
+    # ---------- ARCHIVES ----------
+    # Les matchs clos depuis ARCHIVE_AFTER_DAYS quittent data["matches"] pour
+    # archive/ (segments mensuels gzip, voir archive.py). get_match les relit
+    # de façon transparente ; une modification les ramène dans data.json.
+    # Un match présent des deux côtés : data.json a toujours la priorité.
+
+    def _hot_match(self, match_id: int | str):
+        """
+        Match modifiable : dans data["matches"], ressorti de l'archive si
+        besoin. Son entrée d'index reste tant que data.json n'est pas écrit
+        avec lui (retirée au prochain archive_matches) : un crash entre les
+        deux ne le perd pas.
+        """
         data = self._read()
         mid = str(match_id)
-        if mid not in data["matches"]:
+        match = data["matches"].get(mid)
+        if match is None:
+            match = self.archive.get(mid)
+            if match is None:
+                return None
+            data["matches"][mid] = match
+            metrics.incr("matches_unarchived_total")
+        return match
+
+    def iter_matches(self, hot: dict | None = None, entries=None):
+        """
+        Tous les matchs, en cours puis archivés (un segment d'archive à la
+        fois). `hot` / `entries` : copies prises par _in_thread.
+        """
+        if hot is None:
+            hot = self._read()["matches"]
+        yield from hot.values()
+        for match in self.archive.iter_matches(entries):
+            if str(match["id"]) not in hot:
+                yield match
+
+    async def _in_thread(self, fn, *args):
+        """
+        fn(tous les matchs, *args) dans un thread, pour les parcours complets
+        (archive décompressée) lancés depuis la boucle. Le thread travaille
+        sur une copie des matchs en cours : sérialisés ici, relus là-bas.
+        """
+        raw = self.serializer.dumps(self._read()["matches"])
+        entries = list(self.archive.index.items())
+
+        def run():
+            return fn(self.iter_matches(self.serializer.loads(raw), entries), *args)
+
+        return await asyncio.to_thread(run)
+
+    async def archive_matches(self, min_age_days: float = ARCHIVE_AFTER_DAYS, limit: int | None = ARCHIVE_BATCH) -> int:
+        """
+        Déplace vers l'archive les matchs clos (score enregistré, vote MVP
+        fermé) créés il y a plus de `min_age_days` jours, au plus `limit`.
+        Segments puis index sont écrits (fsync, dans un thread) avant de
+        retirer les matchs de data.json : après un crash entre les deux, le
+        match est en double, jamais perdu.
+        Renvoie le nombre de matchs archivés.
+        """
+        data = self._read()
+
+        # Matchs ressortis de l'archive (ou en double après un crash) : leur
+        # entrée d'index ne part qu'une fois data.json durable avec eux
+        stale = [int(mid) for mid in data["matches"] if int(mid) in self.archive]
+        if stale:
+            await self.durable()
+            self.archive.discard([mid for mid in stale if str(mid) in data["matches"]])
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=min_age_days)
+        candidates = []
+        for match in data["matches"].values():
+            if not match.get("result_recorded") or match.get("mvp_open", True):
+                continue
+            try:
+                created = datetime.fromisoformat(match["created_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if created.tzinfo is None:
+                created = created.replace(tzinfo=timezone.utc)
+            if created > cutoff:
+                continue
+            candidates.append(match)
+            if limit and len(candidates) >= limit:
+                break
+
+        if not candidates:
+            if stale:
+                await asyncio.to_thread(self.archive.write_index, *self.archive.index_snapshot())
+            return 0
+
+        # Encodage dans la boucle (les matchs ne doivent pas bouger pendant le
+        # dump), compression + fsync dans un thread
+        encoded = {match["id"]: self.archive.encode(match) for match in candidates}
+        lines: dict[str, list[tuple[int, bytes]]] = {}
+        for match in candidates:
+            lines.setdefault(segment_name(match), []).append((match["id"], encoded[match["id"]]))
+        positions = await asyncio.to_thread(self.archive.write_segments, lines)
+
+        # Supprimé pendant l'écriture : surtout ne pas l'indexer
+        self.archive.add([m for m in candidates if data["matches"].get(str(m["id"])) is m], positions)
+        await asyncio.to_thread(self.archive.write_index, *self.archive.index_snapshot())
+
+        # Modifié entre-temps : il reste dans data.json, qui a priorité sur l'archive
+        moved = 0
+        for match in candidates:
+            mid = str(match["id"])
+            if data["matches"].get(mid) is match and self.archive.encode(match) == encoded[match["id"]]:
+                del data["matches"][mid]
+                moved += 1
+        if moved:
+            self._write(data)
+            metrics.incr("matches_archived_total", moved)
+        return moved
+
+    # ---------- LOBBYS ----------
+    # data["lobbies"] : salon -> {"players", "team_a", "team_b", "message_id"}
+
+    def get_lobby(self, channel_id: int):
+        return self._read().get("lobbies", {}).get(str(channel_id))
+
+    def save_lobby(self, channel_id: int, lobby: dict):
+        data = self._read()
+        data.setdefault("lobbies", {})[str(channel_id)] = lobby
+        self._write(data)
+        return lobby
+
+    def delete_lobby(self, channel_id: int):
+        data = self._read()
+        removed = data.get("lobbies", {}).pop(str(channel_id), None)
+        if removed is not None:
+            self._write(data)
+        return removed
+
+    # ---------- TÂCHES PLANIFIÉES ----------
+    # data["jobs"] : clé -> {"kind", "due" (timestamp), "payload"}, voir Scheduler
+
+    def get_jobs(self) -> dict:
+        return self._read().setdefault("jobs", {})
+
+    def get_job(self, key: str):
+        return self._read().get("jobs", {}).get(key)
+
+    def add_job(self, key: str, kind: str, due: float, payload: dict):
+        data = self._read()
+        data.setdefault("jobs", {})[key] = {"kind": kind, "due": due, "payload": payload}
+        self._write(data)
+
+    def remove_job(self, key: str) -> bool:
+        data = self._read()
+        if data.get("jobs", {}).pop(key, None) is None:
+            return False
+        self._write(data)
+        return True
+
+    # ---------- LEDGER PAR MATCH ----------
+    # Chaque contribution d'un match aux totaux des joueurs (résultat, stats,
+    # MVP) est appliquée ET notée dans match["ledger"] :
+    #   {"kind": "result" | "stats" | "mvp", "deltas": {pid: {champ: delta}}}
+    # Supprimer ou corriger un match ré-applique ces deltas en négatif,
+    # sans rien recalculer. Les matchs d'avant le ledger n'en ont pas.
+
+    def _apply_deltas(self, data, deltas: dict, sign: int = 1) -> dict:
+        """Applique {pid: {champ: delta}} aux joueurs ; renvoie les deltas réellement appliqués."""
+        applied = {}
+        for pid, fields in deltas.items():
+            player = data["players"].get(str(pid))
+            if player is None:
+                # Invité ou joueur inconnu : rien à comptabiliser
+                continue
+            done = {}
+            for key, delta in fields.items():
+                if key not in player or not isinstance(delta, (int, float)) or not delta:
+                    continue
+                value = player[key] + sign * delta
+                if isinstance(value, float):
+                    # Parts de MVP (1/3…) : on évite d'accumuler des résidus d'arrondi
+                    value = round(value, 6)
+                    if value.is_integer():
+                        value = int(value)
+                player[key] = value
+                done[key] = delta
+            if done:
+                applied[str(pid)] = done
+        return applied
+
+    def _revert_entries(self, data, entries: list[dict]) -> dict:
+        """Annule une liste d'entrées de ledger ; renvoie le total annulé par joueur."""
+        reverted: dict[str, dict] = {}
+        for entry in entries:
+            self._apply_deltas(data, entry["deltas"], sign=-1)
+            for pid, fields in entry["deltas"].items():
+                total = reverted.setdefault(pid, {})
+                for key, delta in fields.items():
+                    total[key] = total.get(key, 0) + delta
+        return reverted
+
+    def apply_match_deltas(self, match_id: int | str, kind: str, deltas: dict):
+        """Applique des contributions du match aux joueurs et les note dans son ledger."""
+        data = self._read()
+        match = self._hot_match(match_id)
+        if match is None:
             return None
-        data["matches"][mid]["mvp_votes"][str(voter_id)] = str(target_player_id)
+        entry = {"kind": kind, "deltas": self._apply_deltas(data, deltas)}
+        match.setdefault("ledger", []).append(entry)
         self._write(data)
-        return data["matches"][mid]
+        return entry
 
-    def finalize_mvp(self, match_id: int):
-        """Clôture le vote MVP, attribue les points et renvoie (match, winners_ids)."""
+    def revert_match(self, match_id: int | str, kinds: set[str] | None = None):
+        """
+        Annule les contributions du match (toutes, ou seulement celles de
+        `kinds`) et les retire de son ledger. Renvoie le total annulé par joueur.
+        """
         data = self._read()
-        match = data["matches"].get(str(match_id))
-        if not match:
-            raise ValueError(f"Match {match_id} introuvable.")
+        match = self._hot_match(match_id)
+        if match is None:
+            return None
+        ledger = match.get("ledger", [])
+        reverted = self._revert_entries(data, [e for e in ledger if kinds is None or e["kind"] in kinds])
+        match["ledger"] = [e for e in ledger if kinds is not None and e["kind"] not in kinds]
+        self._write(data)
+        return reverted
 
-        # Si déjà clôturé, on ne ré-attribue pas les points
+    def record_result(self, match_id: int | str, score_a: int, score_b: int):
+        """Enregistre le score et ses contributions (match joué, V/D/N, points) en une transaction."""
+        match = self.update_match(match_id, score_a=score_a, score_b=score_b, result_recorded=True)
+        if match is None:
+            return None
+
+        known_a = [pid for pid in match["team_a"] if pid > 0]
+        known_b = [pid for pid in match["team_b"] if pid > 0]
+        deltas = {pid: {"matches": 1} for pid in known_a + known_b}
+        if score_a == score_b:
+            for pid in known_a + known_b:
+                deltas[pid]["draws"] = 1
+        else:
+            winners, losers = (known_a, known_b) if score_a > score_b else (known_b, known_a)
+            for pid in winners:
+                deltas[pid].update(wins=1, points=1)
+            for pid in losers:
+                deltas[pid]["losses"] = 1
+
+        self.apply_match_deltas(match_id, "result", deltas)
+        self._apply_pairs(match)
+        return match
+
+    def correct_result(self, match_id: int | str, score_a: int, score_b: int):
+        """Remplace le score d'un match : annule l'ancien résultat puis applique le nouveau."""
+        match = self.get_match(match_id)
+        if match is None or self.revert_match(match_id, kinds={"result"}) is None:
+            return None
+        self._apply_pairs(match, sign=-1)
+        return self.record_result(match_id, score_a, score_b)
+
+    def record_player_stats(self, match_id: int | str, user_id: int, goals: int, assists: int):
+        """Buts / passes d'un joueur sur un match : totaux + stats_entered + ledger."""
+        match = self._hot_match(match_id)
+        if match is None:
+            return None
+        match.setdefault("stats_entered", {})[str(user_id)] = True
+        return self.apply_match_deltas(match_id, "stats", {user_id: {"goals": goals, "assists": assists}})
+
+    def record_match_stats(self, match_id: int | str, stats: dict[int, tuple[int, int]]):
+        """
+        Buts / passes de plusieurs joueurs d'un match en une seule transaction
+        (totaux, stats_entered, une entrée de ledger). Les joueurs dont les
+        stats sont déjà saisies sont ignorés. Renvoie {pid: (buts, passes)}
+        réellement enregistrés, ou None si le match n'existe pas.
+        """
+        match = self._hot_match(match_id)
+        if match is None:
+            return None
+        entered = match.setdefault("stats_entered", {})
+        applied = {pid: values for pid, values in stats.items() if not entered.get(str(pid))}
+        if not applied:
+            return applied
+        for pid in applied:
+            entered[str(pid)] = True
+        self.apply_match_deltas(
+            match_id, "stats", {pid: {"goals": goals, "assists": assists} for pid, (goals, assists) in applied.items()}
+        )
+        return applied
+
+    def close_mvp_vote(self, match_id: int | str, winners: list[int]):
+        """Clôture le vote : 1 point partagé entre les gagnants (+1 MVP chacun), noté au ledger."""
+        match = self.update_match(match_id, mvp_open=False, mvp_winners=winners)
+        if match is None:
+            return None
+        if winners:
+            share = 1.0 / len(winners)
+            # Les invités (ids négatifs) n'ont pas de fiche : _apply_deltas les ignore
+            self.apply_match_deltas(match_id, "mvp", {pid: {"points": share, "mvps": 1} for pid in winners})
+        return match
+
+    def rebuild_aggregates(self, apply: bool = False) -> dict:
+        """
+        Recalcule les totaux des joueurs depuis l'historique des matchs (un seul
+        passage) et renvoie le rapport de dérive. Avec `apply`, remplace les
+        totaux qui ont dérivé, en une transaction.
+        Si d'anciens matchs sans ledger ont des stats saisies, buts / passes
+        ne sont pas reconstructibles : on les laisse tels quels.
+        """
+        totals, info = rebuild_totals(self.iter_matches(), self._read()["players"].keys())
+        return self._drift_report(totals, info, apply)
+
+    async def rebuild_aggregates_async(self, apply: bool = False) -> dict:
+        """
+        rebuild_aggregates depuis la boucle : recalcul (archive comprise) dans
+        un thread. Si les données changent pendant ce temps, on recommence ;
+        au troisième essai, recalcul dans la boucle.
+        """
+        for _attempt in range(3):
+            version = self._mutations
+            totals, info = await self._in_thread(rebuild_totals, list(self._read()["players"].keys()))
+            if self._mutations == version:
+                return self._drift_report(totals, info, apply)
+        return self.rebuild_aggregates(apply)
+
+    def _drift_report(self, totals: dict[str, dict], info: dict, apply: bool) -> dict:
+        data = self._read()
+        skipped = ("goals", "assists") if info["legacy_stats"] else ()
+        drift = diff_totals(data["players"], totals, [f for f in AGGREGATE_FIELDS if f not in skipped])
+
+        applied = apply and bool(drift)
+        if applied:
+            for d in drift:
+                data["players"][d["pid"]][d["field"]] = d["rebuilt"]
+            self._write(data)
+            metrics.incr("aggregate_rebuilds_total")
+
+        return {
+            **info,
+            "players": len(data["players"]),
+            "drift": drift,
+            "skipped_fields": list(skipped),
+            "applied": applied,
+        }
+
+    @staticmethod
+    def mvp_tally(match: dict) -> dict[int, int]:
+        """
+        Décompte du vote MVP : {joueur: nb de votes}, du plus voté au moins voté.
+        O(candidats) grâce à match["mvp_tally"] ; les matchs d'avant ce compteur
+        sont recomptés depuis mvp_votes.
+        """
+        counts = match.get("mvp_tally")
+        if counts is None:
+            counts = {}
+            for target in (match.get("mvp_votes") or {}).values():
+                counts[str(target)] = counts.get(str(target), 0) + 1
+        return {int(pid): n for pid, n in sorted(counts.items(), key=lambda kv: kv[1], reverse=True)}
+
+    def _cast_mvp_vote(self, match: dict, voter_id: int, target_player_id: int) -> str:
+        """Vote sur l'état en mémoire, sans écriture (voir add_mvp_vote)."""
         if not match.get("mvp_open", True):
-            winners = match.get("mvp_winners", [])
-            return match, winners
+            return MVP_VOTE_CLOSED
 
-        votes = match.get("mvp_votes", {}) or {}
-        winners: list[int] = []
+        votes = match.setdefault("mvp_votes", {})
+        voter = str(voter_id)
+        if voter in votes:
+            return MVP_VOTE_DUPLICATE
 
-        if votes:
-            # Tally des votes : on force les IDs en int
-            tally: dict[int, int] = {}
-            for _voter_str, target_str in votes.items():
-                try:
-                    pid = int(target_str)
-                except (TypeError, ValueError):
-                    continue
-                tally[pid] = tally.get(pid, 0) + 1
+        if "mvp_tally" not in match:
+            # Ancien match : compteur construit une fois depuis les votes existants
+            match["mvp_tally"] = {str(pid): n for pid, n in self.mvp_tally(match).items()}
+        votes[voter] = int(target_player_id)
+        target = str(target_player_id)
+        match["mvp_tally"][target] = match["mvp_tally"].get(target, 0) + 1
+        return MVP_VOTE_ACCEPTED
+
+    def add_mvp_vote(self, match_id: int | str, voter_id: int, target_player_id: int) -> str | None:
+        """
+        Enregistre un vote en une seule opération : vérifie que le vote est
+        ouvert et que le votant n'a pas déjà voté, puis met à jour le compteur.
+        Renvoie MVP_VOTE_ACCEPTED / MVP_VOTE_DUPLICATE / MVP_VOTE_CLOSED
+        (None si le match n'existe pas).
+        """
+        data = self._read()
+        # Un match archivé a toujours son vote clos : get_match suffit
+        match = self.get_match(match_id)
+        if match is None:
+            return None
+        status = self._cast_mvp_vote(match, voter_id, target_player_id)
+        if status == MVP_VOTE_ACCEPTED:
+            self._write(data)
+        return status
 
-            if tally:
-                max_votes = max(tally.values())
-                winners = [pid for pid, c in tally.items() if c == max_votes]
+    def add_mvp_votes(self, votes: list[tuple[int, int, int]]) -> list[str | None]:
+        """Plusieurs votes (match_id, votant, cible) en une seule modification ; un statut par vote."""
+        data = self._read()
+        statuses = []
+        for match_id, voter_id, target_player_id in votes:
+            match = self.get_match(match_id)
+            statuses.append(None if match is None else self._cast_mvp_vote(match, voter_id, target_player_id))
+        if MVP_VOTE_ACCEPTED in statuses:
+            self._write(data)
+        return statuses
 
-                # Partage de 1 point entre tous les gagnants (égalité possible)
-                total_points = 1.0
-                share = total_points / len(winners)
+    def finalize_mvp(self, match_id: int | str):
+        """
+        Clôture le vote MVP (1 point partagé entre les premiers ex æquo, +1 MVP
+        chacun) en O(candidats). Déjà clôturé : rien n'est ré-attribué.
+        Renvoie (match, winners_ids, just_closed).
+        """
+        match = self.get_match(match_id)
+        if not match:
+            raise ValueError(f"Match {match_id} introuvable.")
 
-                for pid in winners:
-                    # On ignore les invités (ids négatifs)
-                    if pid > 0:
-                        self.increment_player_stats(pid, points=share, mvps=1)
+        if not match.get("mvp_open", True):
+            return match, match.get("mvp_winners", []), False
 
-        # On marque le vote comme clôturé et on stocke les gagnants
-        match["mvp_open"] = False
-        match["mvp_winners"] = winners
+        tally = self.mvp_tally(match)
+        best = max(tally.values(), default=0)
+        winners = [pid for pid, count in tally.items() if count == best] if best else []
 
-        data["matches"][str(match_id)] = match
-        self._write(data)
-        return match, winners
+        self.close_mvp_vote(match_id, winners)
+        return match, winners, True
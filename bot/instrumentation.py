@@ -0,0 +1,65 @@
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from metrics import registry as metrics, CommandTrace, current_trace
+
+
+def start_trace(interaction: discord.Interaction) -> CommandTrace | None:
+    command = interaction.command
+    if command is None or interaction.type is not discord.InteractionType.application_command:
+        return None
+
+    binding = getattr(command, "binding", None)
+    cog = binding.qualified_name if isinstance(binding, commands.Cog) else "-"
+    trace = CommandTrace(command.qualified_name, cog)
+    interaction.extras["trace"] = trace
+    current_trace.set(trace)
+    return trace
+
+
+def finish_trace(interaction: discord.Interaction, failed: bool = False):
+    """Enregistre la latence totale, le détail par phase et le statut de la commande."""
+    trace = interaction.extras.pop("trace", None)
+    if trace is None:
+        return
+
+    profiler = getattr(interaction.client, "profiler", None)
+    if profiler is not None:
+        profiler.end(interaction.id)
+
+    trace.switch("other")
+    total = time.perf_counter() - trace.started
+    name = trace.command
+    metrics.observe("command_latency_seconds", total, command=name)
+    for phase_name, seconds in trace.phases.items():
+        metrics.observe("command_phase_seconds", seconds, command=name, phase=phase_name)
+
+    metrics.incr("commands_total", command=name, status="error" if failed else "ok")
+    if failed:
+        metrics.incr("command_errors_total", command=name)
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    """
+    CommandTree qui ouvre une trace par slash command.
+
+    La trace est ouverte dans `interaction_check` (même tâche que le callback,
+    donc visible via `current_trace`), puis fermée par l'évènement
+    `app_command_completion` (voir FiveBot) ou par `on_error`.
+    Si la commande est armée dans le profiler du bot, elle est profilée
+    sur la même fenêtre.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        trace = start_trace(interaction)
+        profiler = getattr(self.client, "profiler", None)
+        if trace is not None and profiler is not None:
+            profiler.begin(interaction.id, trace.command)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        finish_trace(interaction, failed=True)
+        await super().on_error(interaction, error)
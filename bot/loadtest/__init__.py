@@ -0,0 +1,7 @@
+"""
+Harnais hors-ligne : génère un data.json synthétique et rejoue un mélange
+réaliste de slash commands sur les cogs, avec de fausses interactions
+Discord (aucun accès réseau).
+
+    cd bot && python -m loadtest --joueurs 5000 --matchs 50000 --concurrence 8
+"""
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .datagen import write_data
+from .replay import DEFAULT_MIX, Harness, format_report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Rejoue un mélange de slash commands sur un data.json synthétique (hors-ligne).",
+    )
+    parser.add_argument("--joueurs", type=int, default=5000, help="Nombre de joueurs générés")
+    parser.add_argument("--matchs", type=int, default=50000, help="Nombre de matchs générés")
+    parser.add_argument("--requetes", type=int, default=500, help="Nombre de commandes rejouées")
+    parser.add_argument("--concurrence", type=int, default=8, help="Commandes en vol en même temps")
+    parser.add_argument("--graine", type=int, default=0, help="Graine aléatoire (données et mélange)")
+    parser.add_argument("--latence-envoi", type=float, default=0.0, help="Latence simulée d'un envoi Discord (s)")
+    parser.add_argument("--donnees", type=Path, help="data.json existant à rejouer (copié, jamais modifié)")
+    parser.add_argument(
+        "--commandes",
+        help="Mélange personnalisé, ex: 'stats_joueur=5,vote_mvp=3' (défaut : mélange réaliste)",
+    )
+    parser.add_argument("--json", type=Path, help="Écrit le rapport JSON à ce chemin")
+    args = parser.parse_args()
+
+    mix = DEFAULT_MIX
+    if args.commandes:
+        mix = {}
+        for item in args.commandes.split(","):
+            name, _, weight = item.partition("=")
+            mix[name.strip()] = int(weight or 1)
+
+    workdir = Path(tempfile.mkdtemp(prefix="fivebot-loadtest-"))
+    try:
+        data_path = workdir / "data.json"
+        if args.donnees:
+            shutil.copy(args.donnees, data_path)
+        else:
+            start = time.perf_counter()
+            write_data(data_path, args.joueurs, args.matchs, seed=args.graine)
+            print(f"Données générées en {time.perf_counter() - start:.1f}s : {data_path.stat().st_size / 1_048_576:.1f} Mo")
+
+        harness = Harness(data_path, seed=args.graine, send_latency=args.latence_envoi)
+        elapsed = asyncio.run(harness.run(args.requetes, args.concurrence, mix))
+
+        report = harness.report(elapsed)
+        print(format_report(report))
+        if args.json:
+            args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SYLLABLES = (
+    "ka", "lo", "mi", "ra", "to", "zu", "ne", "vi", "sa", "do",
+    "ré", "ël", "an", "or", "is", "ju", "be", "ty", "qu", "po",
+)
+
+
+def _player(pid: int, name: str, rng: random.Random) -> dict:
+    stats = {k: rng.randint(2, 10) for k in ("tir", "passes", "physique", "influence", "gardien")}
+    return {
+        "id": pid,
+        "name": name,
+        "rating": round(sum(stats.values()) / 5, 1),
+        **stats,
+        "points": 0,
+        "wins": 0,
+        "losses": 0,
+        "draws": 0,
+        "matches": 0,
+        "goals": 0,
+        "assists": 0,
+        "mvps": 0,
+        "card_color": "#1E1E46",
+        "card_tagline": "",
+        "card_border": "#D4AF37",
+    }
+
+
+def _record(players: dict, match: dict, kind: str, deltas: dict):
+    applied = {}
+    for pid, fields in deltas.items():
+        fields = {k: v for k, v in fields.items() if v}
+        for key, delta in fields.items():
+            players[str(pid)][key] += delta
+        if fields:
+            applied[str(pid)] = fields
+    match["ledger"].append({"kind": kind, "deltas": applied})
+
+
+def generate_data(
+    n_players: int,
+    n_matches: int,
+    seed: int = 0,
+    open_results: int = 20,
+    open_votes: int = 50,
+    guest_rate: float = 0.05,
+) -> dict:
+    """
+    Génère un data.json réaliste et cohérent :
+      - `n_players` joueurs aux noms uniques ;
+      - `n_matches` matchs 5v5 (quelques invités), les `open_results` derniers
+        sans score, les `open_votes` précédents avec le vote MVP encore ouvert ;
+      - totaux des joueurs (victoires, buts, MVP…) recalculés depuis les matchs,
+        chaque contribution étant notée dans le ledger du match.
+    """
+    rng = random.Random(seed)
+
+    players: dict[str, dict] = {}
+    for i in range(n_players):
+        pid = 300_000_000_000_000_000 + i * 7919
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize() + str(i)
+        players[str(pid)] = _player(pid, name, rng)
+    ids = [p["id"] for p in players.values()]
+
+    start = datetime.now(timezone.utc) - timedelta(days=2 * 365)
+    step = timedelta(days=2 * 365) / max(1, n_matches)
+
+    matches: dict[str, dict] = {}
+    for mid in range(1, n_matches + 1):
+        roster = rng.sample(ids, 10)
+        guest = -1
+        for i in range(10):
+            if rng.random() < guest_rate:
+                roster[i] = guest
+                guest -= 1
+        team_a, team_b = roster[:5], roster[5:]
+
+        match = {
+            "id": mid,
+            "channel_id": 1,
+            "created_at": (start + step * mid).isoformat(),
+            "team_a": team_a,
+            "team_b": team_b,
+            "score_a": None,
+            "score_b": None,
+            "result_recorded": False,
+            "mvp_open": True,
+            "mvp_votes": {},
+            "mvp_tally": {},
+            "stats_entered": {},
+            "ledger": [],
+        }
+        matches[str(mid)] = match
+
+        if mid > n_matches - open_results:
+            continue
+
+        score_a, score_b = rng.randint(0, 15), rng.randint(0, 15)
+        match.update(score_a=score_a, score_b=score_b, result_recorded=True)
+
+        # Mêmes contributions (et même ledger) que DataManager.record_result & co
+        known = [pid for pid in roster if pid > 0]
+        result = {}
+        for pid in known:
+            if score_a == score_b:
+                result[pid] = {"matches": 1, "draws": 1}
+            elif (score_a > score_b) == (pid in team_a):
+                result[pid] = {"matches": 1, "wins": 1, "points": 1}
+            else:
+                result[pid] = {"matches": 1, "losses": 1}
+        _record(players, match, "result", result)
+
+        for pid in known:
+            if rng.random() < 0.6:
+                goals, assists = rng.randint(0, 4), rng.randint(0, 3)
+                match["stats_entered"][str(pid)] = True
+                _record(players, match, "stats", {pid: {"goals": goals, "assists": assists}})
+
+        tally = match["mvp_tally"]
+        for voter in rng.sample(known, k=min(len(known), rng.randint(3, 8))):
+            target = rng.choice(known)
+            match["mvp_votes"][str(voter)] = target
+            tally[str(target)] = tally.get(str(target), 0) + 1
+
+        if mid > n_matches - open_results - open_votes:
+            continue
+
+        winners = []
+        if tally:
+            best = max(tally.values())
+            winners = [int(pid) for pid, c in tally.items() if c == best]
+            _record(players, match, "mvp", {pid: {"points": 1.0 / len(winners), "mvps": 1} for pid in winners})
+        match.update(mvp_open=False, mvp_winners=winners)
+
+    return {"players": players, "matches": matches, "last_match_id": n_matches}
+
+
+def write_data(path: str | Path, n_players: int, n_matches: int, seed: int = 0, **kwargs) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(generate_data(n_players, n_matches, seed, **kwargs), f)
+    return path
@@ -0,0 +1,131 @@
+import itertools
+import types
+from io import BytesIO
+
+import discord
+
+from member_cache import MemberCache
+from mvp_votes import MvpVoteBuffer
+from scheduler import Scheduler
+
+_interaction_ids = itertools.count(1)
+
+
+def _avatar_png() -> bytes:
+    from PIL import Image
+    buf = BytesIO()
+    Image.new("RGB", (128, 128), (90, 120, 200)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class FakeAsset:
+    _png: bytes | None = None
+
+    def __init__(self, user_id: int):
+        self.key = f"avatar-{user_id}"
+        self.url = f"https://cdn.example.invalid/avatars/{user_id}.png"
+
+    async def read(self) -> bytes:
+        if FakeAsset._png is None:
+            FakeAsset._png = _avatar_png()
+        return FakeAsset._png
+
+
+class FakeMember:
+    def __init__(self, user_id: int, name: str, administrator: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAsset(user_id)
+        self.guild_permissions = types.SimpleNamespace(administrator=administrator)
+        self.bot = False
+
+    def __str__(self):
+        return self.display_name
+
+
+class FakeResponse:
+    """Remplace InteractionResponse : garde les messages envoyés, latence réseau simulée."""
+
+    def __init__(self, send_latency: float = 0.0):
+        self.sent: list[dict] = []
+        self.send_latency = send_latency
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _network(self):
+        if self.send_latency:
+            import asyncio
+            await asyncio.sleep(self.send_latency)
+
+    async def send_message(self, content=None, **kwargs):
+        await self._network()
+        self._done = True
+        self.sent.append({"content": content, **kwargs})
+
+    async def send_modal(self, modal):
+        await self._network()
+        self._done = True
+        self.sent.append({"modal": modal})
+
+    async def defer(self, **kwargs):
+        await self._network()
+        self._done = True
+
+    async def edit_message(self, **kwargs):
+        await self._network()
+        self._done = True
+        self.sent.append(kwargs)
+
+
+class FakeFollowup:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    async def send(self, content=None, **kwargs):
+        await self.response._network()
+        self.response.sent.append({"content": content, **kwargs})
+
+
+class FakeInteraction:
+    def __init__(self, client, user: FakeMember, command=None, channel_id: int = 1, send_latency: float = 0.0):
+        self.id = next(_interaction_ids)
+        self.client = client
+        self.user = user
+        self.guild = None
+        self.guild_id = None
+        self.channel_id = channel_id
+        self.channel = None
+        self.command = command
+        self.type = discord.InteractionType.application_command
+        self.extras: dict = {}
+        self.response = FakeResponse(send_latency)
+        self.followup = FakeFollowup(self.response)
+
+    @property
+    def last_embed(self) -> discord.Embed | None:
+        for message in reversed(self.response.sent):
+            if message.get("embed") is not None:
+                return message["embed"]
+        return None
+
+
+class FakeBot:
+    """Juste ce que les cogs lisent sur `self.bot`."""
+
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self.member_cache = MemberCache()
+        self.mvp_votes = MvpVoteBuffer(data_manager)
+        self.scheduler = Scheduler(data_manager)   # jamais démarré : les tâches sont seulement stockées
+        self.latency = 0.0
+        self.user = FakeMember(1, "FiveBot")
+
+    def is_ready(self) -> bool:
+        return True
+
+    def is_closed(self) -> bool:
+        return False
@@ -0,0 +1,276 @@
+import asyncio
+import random
+import re
+import time
+import traceback
+from collections import Counter, defaultdict
+
+from cogs.matches import Matches
+from cogs.players import Players
+from cogs.rankings import Rankings
+from data_manager import DataManager
+from instrumentation import start_trace, finish_trace
+from metrics import registry as metrics
+
+from .fakes import FakeBot, FakeInteraction, FakeMember
+
+# Mélange de commandes observé après un match (poids relatifs)
+DEFAULT_MIX = {
+    "stats_joueur": 20,
+    "vote_mvp": 20,
+    "ajouter_stats": 12,
+    "classement": 12,
+    "creer_match": 8,
+    "resultat_match": 6,
+    "classement_buts": 4,
+    "classement_passes": 4,
+    "classement_stats": 4,
+    "liste_joueurs": 4,
+    "historique": 4,
+    "fin_mvp": 3,
+    "set_joueur": 3,
+}
+
+_MATCH_TITLE_RE = re.compile(r"Match #(\d+)")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentile "nearest rank" sur une liste déjà triée."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+class Harness:
+    """
+    Rejoue des slash commands sur les vrais cogs, branchés sur un DataManager
+    pointant vers `data_path`. Chaque commande passe par start_trace /
+    finish_trace : les métriques (phases, accès disque) sont donc remplies
+    comme en production.
+    """
+
+    def __init__(self, data_path, seed: int = 0, send_latency: float = 0.0):
+        self.data = DataManager(str(data_path))
+        self.bot = FakeBot(self.data)
+        self.send_latency = send_latency
+        self.rng = random.Random(seed)
+
+        self.cogs = {
+            "players": Players(self.bot),
+            "matches": Matches(self.bot),
+            "rankings": Rankings(self.bot),
+        }
+
+        # État de départ lu une fois, puis suivi au fil des commandes rejouées
+        data = self.data._read()
+        self.members = {int(pid): FakeMember(int(pid), p["name"]) for pid, p in data["players"].items()}
+        self.member_ids = list(self.members)
+        self.admin = FakeMember(2, "Admin", administrator=True)
+
+        self.rosters: dict[int, list[int]] = {}
+        self.awaiting_result: list[int] = []
+        self.open_votes: dict[int, set[int]] = {}   # match -> votants restants
+        self.stats_missing: dict[int, set[int]] = {}  # match -> joueurs sans stats
+        for mid, match in data["matches"].items():
+            mid = int(mid)
+            known = [pid for pid in match["team_a"] + match["team_b"] if pid > 0]
+            if not match.get("result_recorded"):
+                self.rosters[mid] = known
+                self.awaiting_result.append(mid)
+            elif match.get("mvp_open", True):
+                self.rosters[mid] = known
+                self.open_votes[mid] = set(known) - {int(v) for v in match.get("mvp_votes", {})}
+                self.stats_missing[mid] = set(known) - {int(p) for p in match.get("stats_entered", {})}
+
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+        self.new_player_id = max(self.member_ids, default=10**17) + 1
+
+    # ---------- EXÉCUTION ----------
+
+    async def invoke(self, cog: str, command_name: str, user: FakeMember, *args) -> FakeInteraction:
+        command = getattr(self.cogs[cog], command_name)
+        interaction = FakeInteraction(self.bot, user, command=command, send_latency=self.send_latency)
+        start_trace(interaction)
+        failed = False
+        try:
+            await command.callback(self.cogs[cog], interaction, *args)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            finish_trace(interaction, failed=failed)
+        return interaction
+
+    async def run_one(self, name: str):
+        scenario = getattr(self, f"_cmd_{name}")
+        start = time.perf_counter()
+        try:
+            await scenario()
+        except Exception:
+            self.errors[name] += 1
+            if self.errors[name] == 1:
+                traceback.print_exc()
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+
+    async def run(self, requests: int, concurrency: int, mix: dict[str, int] | None = None) -> float:
+        """Rejoue `requests` commandes tirées selon `mix`. Renvoie la durée totale."""
+        mix = mix or DEFAULT_MIX
+        names, weights = zip(*mix.items())
+        plan = self.rng.choices(names, weights=weights, k=requests)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def worker(name: str):
+            async with semaphore:
+                await self.run_one(name)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(name) for name in plan))
+        await self.data.flush()
+        return time.perf_counter() - start
+
+    # ---------- SCÉNARIOS ----------
+
+    def _member(self) -> FakeMember:
+        return self.members[self.rng.choice(self.member_ids)]
+
+    async def _cmd_stats_joueur(self):
+        await self.invoke("players", "stats_joueur", self._member(), self._member())
+
+    async def _cmd_historique(self):
+        await self.invoke("matches", "historique", self._member(), self._member())
+
+    async def _cmd_liste_joueurs(self):
+        await self.invoke("players", "liste_joueurs", self._member())
+
+    async def _cmd_set_joueur(self):
+        if self.rng.random() < 0.3:
+            member = FakeMember(self.new_player_id, f"Nouveau{self.new_player_id}")
+            self.new_player_id += 1
+            self.members[member.id] = member
+            self.member_ids.append(member.id)
+        else:
+            member = self._member()
+        stats = [self.rng.randint(0, 10) for _ in range(5)]
+        await self.invoke("players", "set_joueur", self.admin, member, *stats)
+
+    async def _cmd_classement(self):
+        await self.invoke("rankings", "classement", self._member())
+
+    async def _cmd_classement_buts(self):
+        await self.invoke("rankings", "classement_buts", self._member())
+
+    async def _cmd_classement_passes(self):
+        await self.invoke("rankings", "classement_passes", self._member())
+
+    async def _cmd_classement_stats(self):
+        await self.invoke("rankings", "classement_stats", self._member())
+
+    async def _cmd_creer_match(self):
+        roster = self.rng.sample(self.member_ids, 10)
+        slots = []
+        for pid in roster:
+            roll = self.rng.random()
+            if roll < 0.05:
+                slots.append(f"*** {self.rng.randint(3, 9)}")
+            elif roll < 0.25:
+                slots.append(f"<@{pid}>")
+            else:
+                slots.append(self.members[pid].display_name)
+
+        interaction = await self.invoke("matches", "creer_match", self._member(), *slots)
+        embed = interaction.last_embed
+        found = _MATCH_TITLE_RE.search(embed.title) if embed is not None else None
+        if found:
+            mid = int(found.group(1))
+            self.rosters[mid] = [pid for pid, slot in zip(roster, slots) if not slot.startswith("*")]
+            self.awaiting_result.append(mid)
+
+    async def _cmd_resultat_match(self):
+        if not self.awaiting_result:
+            return await self._cmd_creer_match()
+        mid = self.awaiting_result.pop(self.rng.randrange(len(self.awaiting_result)))
+        await self.invoke(
+            "matches", "resultat_match", self._member(), mid, self.rng.randint(0, 12), self.rng.randint(0, 12)
+        )
+        self.open_votes[mid] = set(self.rosters[mid])
+        self.stats_missing[mid] = set(self.rosters[mid])
+
+    async def _cmd_vote_mvp(self):
+        candidates = [mid for mid, voters in self.open_votes.items() if voters]
+        if not candidates:
+            return await self._cmd_resultat_match()
+        mid = self.rng.choice(candidates)
+        voter = self.rng.choice(sorted(self.open_votes[mid]))
+        self.open_votes[mid].discard(voter)
+        target = self.rng.choice(self.rosters[mid])
+        await self.invoke("matches", "vote_mvp", self.members[voter], mid, self.members[target])
+
+    async def _cmd_ajouter_stats(self):
+        candidates = [mid for mid, missing in self.stats_missing.items() if missing]
+        if not candidates:
+            return await self._cmd_resultat_match()
+        mid = self.rng.choice(candidates)
+        pid = self.rng.choice(sorted(self.stats_missing[mid]))
+        self.stats_missing[mid].discard(pid)
+        await self.invoke(
+            "matches", "ajouter_stats", self.members[pid], mid, self.members[pid],
+            self.rng.randint(0, 4), self.rng.randint(0, 3)
+        )
+
+    async def _cmd_fin_mvp(self):
+        if not self.open_votes:
+            return await self._cmd_resultat_match()
+        mid = self.rng.choice(list(self.open_votes))
+        del self.open_votes[mid]
+        await self.invoke("matches", "fin_mvp", self._member(), mid)
+
+    # ---------- RAPPORT ----------
+
+    def report(self, elapsed: float) -> dict:
+        reads = {l["command"]: v for l, v in metrics.collect("storage_reads_total")}
+        writes = {l["command"]: v for l, v in metrics.collect("storage_mutations_total")}
+        flushes = sum(v for _l, v in metrics.collect("storage_writes_total"))
+
+        commands = {}
+        for name, values in sorted(self.samples.items()):
+            ordered = sorted(values)
+            commands[name] = {
+                "count": len(ordered),
+                "errors": self.errors[name],
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+                "reads": int(reads.get(name, 0)),
+                "writes": int(writes.get(name, 0)),
+            }
+        total = sum(len(v) for v in self.samples.values())
+        return {
+            "elapsed": elapsed,
+            "requests": total,
+            "throughput": total / elapsed if elapsed else 0.0,
+            "disk_writes": int(flushes),
+            "commands": commands,
+        }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{'commande':<18} {'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'lect.':>6} {'écr.':>6}",
+    ]
+    for name, c in report["commands"].items():
+        lines.append(
+            f"{name:<18} {c['count']:>6} {c['errors']:>4} "
+            f"{c['p50'] * 1000:>8.1f} {c['p95'] * 1000:>8.1f} {c['p99'] * 1000:>8.1f} {c['max'] * 1000:>8.1f} "
+            f"{c['reads']:>6} {c['writes']:>6}"
+        )
+    lines.append("")
+    lines.append(
+        f"{report['requests']} commandes en {report['elapsed']:.2f}s "
+        f"({report['throughput']:.1f} cmd/s), {report['disk_writes']} écritures disque"
+    )
+    return "\n".join(lines)
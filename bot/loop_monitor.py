@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+
+from metrics import registry as metrics
+
+
+class _AsyncioSlowCallbackHandler(logging.Handler):
+    """Récupère les warnings "Executing <Handle> took X seconds" d'asyncio (mode debug)."""
+
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        # Le logger "asyncio" peut recevoir n'importe quel objet comme message
+        if not isinstance(record.msg, str) or not record.msg.startswith("Executing"):
+            return
+        if not isinstance(record.args, tuple) or len(record.args) != 2:
+            return
+        handle, duration = record.args
+        self.monitor.record_asyncio_slow_callback(repr(handle), float(duration))
+
+
+class LoopMonitor:
+    """
+    Surveillance de la boucle asyncio :
+
+    - une tâche "battement de cœur" mesure en continu le retard de la boucle ;
+    - un thread watchdog repère quand la boucle ne bat plus depuis plus de
+      `threshold` secondes, capture la pile du thread de la boucle et
+      l'attribue à la commande / au cog en cours d'exécution ;
+    - en mode debug asyncio, les callbacks lents signalés par asyncio
+      (`slow_callback_duration`) sont ajoutés au même rapport.
+
+    Le rapport garde les `report_size` derniers fautifs.
+    """
+
+    def __init__(self, threshold: float = 0.1, report_size: int = 50, asyncio_debug: bool = False):
+        self.threshold = threshold
+        self.interval = min(0.05, threshold / 4)
+        self.asyncio_debug = asyncio_debug
+
+        self.report: deque[dict] = deque(maxlen=report_size)
+        self._report_lock = threading.Lock()
+
+        # code des callbacks de commandes -> (cog, commande)
+        self._callbacks: dict[object, tuple[str, str]] = {}
+
+        self._heartbeat = time.perf_counter()
+        self._sample: tuple[float, str, str, list[str]] | None = None
+        self._loop_thread_id: int | None = None
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._log_handler: logging.Handler | None = None
+
+    # ---------- ATTRIBUTION ----------
+
+    def register_commands(self, tree):
+        """Associe le code de chaque callback de slash command à son cog / nom."""
+        for command in tree.walk_commands():
+            callback = getattr(command, "callback", None)
+            if callback is None:
+                continue
+            binding = getattr(command, "binding", None)
+            cog = type(binding).__name__ if binding is not None else "-"
+            self._callbacks[callback.__code__] = (cog, command.qualified_name)
+
+    def _attribute(self, frame) -> tuple[str, str]:
+        while frame is not None:
+            owner = self._callbacks.get(frame.f_code)
+            if owner is not None:
+                return owner
+            frame = frame.f_back
+        return "-", "-"
+
+    # ---------- DÉMARRAGE / ARRÊT ----------
+
+    def start(self):
+        """À appeler depuis la boucle asyncio (ex: setup_hook)."""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+
+        loop.slow_callback_duration = self.threshold
+        if self.asyncio_debug:
+            loop.set_debug(True)
+            self._log_handler = _AsyncioSlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._log_handler)
+
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._log_handler is not None:
+            logging.getLogger("asyncio").removeHandler(self._log_handler)
+
+    # ---------- BOUCLE / WATCHDOG ----------
+
+    async def _beat(self):
+        while True:
+            before = self._heartbeat
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+
+            lag = max(0.0, now - before - self.interval)
+            metrics.set_gauge("event_loop_lag_seconds", lag)
+            metrics.observe("event_loop_lag_hist_seconds", lag)
+
+            if lag > self.threshold:
+                sample = self._sample
+                if sample is not None and sample[0] == before:
+                    _beat, cog, command, stack = sample
+                else:
+                    # Blocage trop court pour que le watchdog l'ait vu
+                    cog, command, stack = "-", "-", []
+                self._record(source="watchdog", duration=lag, cog=cog, command=command, stack=stack)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            beat = self._heartbeat
+            blocked = time.perf_counter() - beat - self.interval
+            if blocked <= self.threshold or (self._sample is not None and self._sample[0] == beat):
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            cog, command = self._attribute(frame)
+            stack = [
+                f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}"
+                for fs in traceback.extract_stack(frame)[-10:]
+            ]
+            self._sample = (beat, cog, command, stack)
+
+    # ---------- RAPPORT ----------
+
+    def _record(self, source: str, duration: float, cog: str, command: str, stack: list[str], callback: str = ""):
+        now = time.perf_counter()
+        with self._report_lock:
+            last = self.report[-1] if self.report else None
+            # asyncio et le watchdog signalent le même blocage à quelques ms d'écart :
+            # on fusionne les deux en une seule entrée
+            if (
+                last is not None
+                and last["source"] != source
+                and "+" not in last["source"]
+                and now - last["_t"] < self.threshold
+            ):
+                last["source"] = "watchdog+asyncio"
+                last["callback"] = last["callback"] or callback
+                if last["command"] == "-":
+                    last["cog"], last["command"], last["stack"] = cog, command, stack
+                return
+
+            self.report.append({
+                "at": datetime.now(timezone.utc).isoformat(),
+                "source": source,
+                "duration": round(duration, 4),
+                "cog": cog,
+                "command": command,
+                "callback": callback,
+                "stack": stack,
+                "_t": now,
+            })
+        metrics.incr("loop_stalls_total", command=command)
+        metrics.observe("loop_stall_seconds", duration, command=command)
+
+    def record_asyncio_slow_callback(self, handle: str, duration: float):
+        self._record(source="asyncio", duration=duration, cog="-", command="-", stack=[], callback=handle[:200])
+
+    def snapshot(self) -> list[dict]:
+        with self._report_lock:
+            return [{k: v for k, v in e.items() if k != "_t"} for e in self.report]
+
+    def offenders(self) -> list[dict]:
+        """Agrégat par (cog, commande) : nb de blocages, durée max et cumulée."""
+        grouped: dict[tuple[str, str], dict] = {}
+        for entry in self.snapshot():
+            key = (entry["cog"], entry["command"])
+            agg = grouped.setdefault(key, {
+                "cog": entry["cog"], "command": entry["command"],
+                "count": 0, "max": 0.0, "total": 0.0, "stack": [],
+            })
+            agg["count"] += 1
+            agg["total"] += entry["duration"]
+            if entry["duration"] >= agg["max"]:
+                agg["max"] = entry["duration"]
+                agg["stack"] = entry["stack"] or agg["stack"]
+        return sorted(grouped.values(), key=lambda a: a["total"], reverse=True)
@@ -0,0 +1,65 @@
+import time
+
+import discord
+
+from metrics import registry as metrics
+
+
+class MemberCache:
+    """
+    Cache TTL des membres du serveur, de taille bornée.
+
+    On ne télécharge plus toute la liste des membres au démarrage :
+    un membre est récupéré à la demande (`fetch_member`) puis gardé
+    `ttl` secondes ; au-delà de `max_size` entrées, les plus anciennes
+    sont oubliées.
+    """
+
+    def __init__(self, ttl: float = 600, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        # (guild_id, user_id) -> (expiration, membre ou None si absent du serveur),
+        # dans l'ordre d'insertion
+        self._entries: dict[tuple[int, int], tuple[float, discord.Member | None]] = {}
+
+    def _purge(self, now: float):
+        expired = [key for key, (expires, _m) in self._entries.items() if expires <= now]
+        for key in expired:
+            del self._entries[key]
+
+    async def get(self, guild: discord.Guild, user_id: int) -> discord.Member | None:
+        # Si le membre est déjà dans le cache discord.py (politique "full"), on le prend
+        member = guild.get_member(user_id)
+        if member is not None:
+            metrics.incr("member_cache_total", result="hit")
+            return member
+
+        key = (guild.id, user_id)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            metrics.incr("member_cache_total", result="hit")
+            return entry[1]
+
+        metrics.incr("member_cache_total", result="miss")
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            member = None
+        except discord.HTTPException:
+            # Erreur passagère : on ne met rien en cache
+            return None
+
+        self._purge(now)
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, member)
+        while len(self._entries) > self.max_size:
+            del self._entries[next(iter(self._entries))]
+        return member
+
+    def invalidate(self, user_id: int):
+        for key in [k for k in self._entries if k[1] == user_id]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
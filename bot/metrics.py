@@ -0,0 +1,203 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+# Buckets par défaut (en secondes) pour les histogrammes de durée
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets (en octets) pour les tailles de fichiers / payloads
+SIZE_BUCKETS = (10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def format_key(name: str, labels: tuple) -> str:
+    """`name{a="1",b="2"}` — même notation que Prometheus."""
+    if not labels:
+        return name
+    inner = ",".join(f'{k}="{v}"' for k, v in labels)
+    return f"{name}{{{inner}}}"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Estimation grossière : borne haute du bucket qui contient le quantile."""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, c in zip(self.buckets, self.counts):
+            seen += c
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        # Comptes cumulés, comme les buckets `le` de Prometheus
+        cumulative = []
+        total = 0
+        for c in self.counts:
+            total += c
+            cumulative.append(total)
+        return {
+            "buckets": dict(zip((str(b) for b in self.buckets), cumulative)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class Metrics:
+    """Registre en mémoire : compteurs, jauges et histogrammes étiquetés."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.counters: dict[tuple[str, tuple], float] = {}
+        self.gauges: dict[tuple[str, tuple], float] = {}
+        self.histograms: dict[tuple[str, tuple], Histogram] = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, _labels_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self.lock:
+            self.gauges[(name, _labels_key(labels))] = value
+
+    def observe(self, name: str, value: float, buckets=DEFAULT_BUCKETS, **labels):
+        key = (name, _labels_key(labels))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def collect(self, name: str) -> list[tuple[dict, object]]:
+        """Toutes les séries d'une métrique : [(labels, valeur ou Histogram), ...]."""
+        with self.lock:
+            out = []
+            for store in (self.counters, self.gauges, self.histograms):
+                for (n, labels), value in store.items():
+                    if n == name:
+                        out.append((dict(labels), value))
+            return out
+
+    def render_prometheus(self) -> str:
+        """Export texte au format d'exposition Prometheus (version 0.0.4)."""
+        lines = []
+        with self.lock:
+            for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+                typed = set()
+                for (name, labels), value in sorted(store.items()):
+                    if name not in typed:
+                        lines.append(f"# TYPE {name} {kind}")
+                        typed.add(name)
+                    lines.append(f"{format_key(name, labels)} {value}")
+
+            typed = set()
+            for (name, labels), hist in sorted(self.histograms.items(), key=lambda kv: kv[0]):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, c in zip(hist.buckets, hist.counts):
+                    cumulative += c
+                    lines.append(f"{format_key(name + '_bucket', labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{format_key(name + '_bucket', labels + (('le', '+Inf'),))} {hist.count}")
+                lines.append(f"{format_key(name + '_sum', labels)} {hist.sum}")
+                lines.append(f"{format_key(name + '_count', labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {
+                "counters": {format_key(n, l): v for (n, l), v in self.counters.items()},
+                "gauges": {format_key(n, l): v for (n, l), v in self.gauges.items()},
+                "histograms": {format_key(n, l): h.to_dict() for (n, l), h in self.histograms.items()},
+            }
+
+
+# Registre global partagé par le bot, les cogs et le DataManager
+registry = Metrics()
+
+
+# ---------- TRACE PAR COMMANDE ----------
+
+class CommandTrace:
+    """
+    Chronomètre par phase (resolve, storage, render, send, other) d'une commande.
+
+    Le temps écoulé est attribué à la phase courante jusqu'au prochain
+    changement de phase ; avant tout marqueur, il part dans "other".
+    """
+
+    __slots__ = ("command", "cog", "started", "phases", "current", "mark")
+
+    def __init__(self, command: str, cog: str):
+        self.command = command
+        self.cog = cog
+        self.started = self.mark = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.current = "other"
+
+    def switch(self, phase_name: str) -> str:
+        """Passe à `phase_name` et renvoie la phase précédente."""
+        now = time.perf_counter()
+        self.phases[self.current] = self.phases.get(self.current, 0.0) + (now - self.mark)
+        previous, self.current, self.mark = self.current, phase_name, now
+        return previous
+
+
+# Trace de la commande exécutée par la tâche asyncio courante
+current_trace: ContextVar[CommandTrace | None] = ContextVar("current_trace", default=None)
+
+
+def current_command() -> str:
+    trace = current_trace.get()
+    return trace.command if trace is not None else "-"
+
+
+def enter_phase(name: str):
+    """À partir d'ici, le temps de la commande courante compte pour `name`."""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.switch(name)
+
+
+@contextmanager
+def phase(name: str):
+    """Attribue le bloc à `name`, puis revient à la phase d'avant."""
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    previous = trace.switch(name)
+    try:
+        yield
+    finally:
+        trace.switch(previous)
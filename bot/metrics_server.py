@@ -0,0 +1,72 @@
+import math
+
+from aiohttp import web
+
+from metrics import registry as metrics
+
+# Caches suivis par un compteur `<cache>_cache_total{result="hit|miss"}`
+CACHES = ("card", "member")
+
+
+class MetricsServer:
+    """
+    Petit serveur HTTP local (aiohttp, déjà embarqué par discord.py) :
+      - /metrics : métriques au format texte Prometheus
+      - /healthz : 200 si le bot est connecté, 503 sinon
+    """
+
+    def __init__(self, bot, host: str = "127.0.0.1", port: int = 9108):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        app.router.add_get("/healthz", self.handle_healthz)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"Métriques exposées sur http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _refresh_gauges(self):
+        """Jauges calculées au moment du scrape."""
+        latency = self.bot.latency
+        if math.isfinite(latency):
+            metrics.set_gauge("gateway_latency_seconds", latency)
+
+        try:
+            metrics.set_gauge("data_file_bytes", self.bot.data_manager.path.stat().st_size)
+        except OSError:
+            pass
+
+        for cache in CACHES:
+            results = {labels["result"]: v for labels, v in metrics.collect(f"{cache}_cache_total")}
+            lookups = results.get("hit", 0) + results.get("miss", 0)
+            if lookups:
+                metrics.set_gauge("cache_hit_ratio", results.get("hit", 0) / lookups, cache=cache)
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        self._refresh_gauges()
+        return web.Response(
+            body=metrics.render_prometheus().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def handle_healthz(self, request: web.Request) -> web.Response:
+        healthy = self.bot.is_ready() and not self.bot.is_closed() and math.isfinite(self.bot.latency)
+        return web.json_response(
+            {
+                "status": "ok" if healthy else "unavailable",
+                "ready": self.bot.is_ready(),
+                "latency": self.bot.latency if math.isfinite(self.bot.latency) else None,
+            },
+            status=200 if healthy else 503,
+        )
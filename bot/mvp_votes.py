@@ -0,0 +1,87 @@
+import asyncio
+import os
+
+from data_manager import MVP_VOTE_ACCEPTED, MVP_VOTE_CLOSED, MVP_VOTE_DUPLICATE
+from metrics import registry as metrics
+
+# Les votes du menu MVP sont regroupés : au plus MVP_VOTE_FLUSH_DELAY secondes
+# d'attente, ou dès que MVP_VOTE_FLUSH_SIZE votes sont en attente
+MVP_VOTE_FLUSH_DELAY = float(os.getenv("MVP_VOTE_FLUSH_DELAY", "2.0"))
+MVP_VOTE_FLUSH_SIZE = int(os.getenv("MVP_VOTE_FLUSH_SIZE", "20"))
+
+
+class MvpVoteBuffer:
+    """
+    Tampon des votes MVP faits depuis le menu posté sous le résultat.
+
+    Chaque vote est validé tout de suite sur l'état en mémoire (vote ouvert,
+    pas de double vote, y compris parmi les votes en attente) puis gardé ici ;
+    les votes en attente partent ensuite en un seul `add_mvp_votes`.
+    À vider (`flush_now`) avant toute clôture de vote.
+    """
+
+    def __init__(self, data_manager, delay: float = MVP_VOTE_FLUSH_DELAY, max_size: int = MVP_VOTE_FLUSH_SIZE):
+        self.data = data_manager
+        self.delay = delay
+        self.max_size = max_size
+        # (match_id, votant) -> cible, dans l'ordre d'arrivée
+        self._pending: dict[tuple[int, int], int] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def has_pending(self, match_id: int, voter_id: int) -> bool:
+        return (int(match_id), int(voter_id)) in self._pending
+
+    def submit(self, match_id: int, voter_id: int, target_player_id: int) -> str | None:
+        """Même statuts que DataManager.add_mvp_vote ; le vote accepté part au prochain lot."""
+        match = self.data.get_match(match_id)
+        if match is None:
+            return None
+        if not match.get("mvp_open", True):
+            return MVP_VOTE_CLOSED
+        key = (int(match_id), int(voter_id))
+        if str(voter_id) in match.get("mvp_votes", {}) or key in self._pending:
+            return MVP_VOTE_DUPLICATE
+
+        self._pending[key] = int(target_player_id)
+        metrics.incr("mvp_votes_buffered_total")
+        self._schedule()
+        return MVP_VOTE_ACCEPTED
+
+    def _schedule(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None or len(self._pending) >= self.max_size:
+            self.flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self.flush_now)
+
+    def flush_now(self) -> int:
+        """Passe les votes en attente au DataManager (une modification) ; renvoie leur nombre."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return 0
+
+        batch = [(mid, voter, target) for (mid, voter), target in self._pending.items()]
+        self._pending.clear()
+        statuses = self.data.add_mvp_votes(batch)
+
+        metrics.incr("mvp_vote_flushes_total")
+        metrics.observe("mvp_vote_flush_batch_size", len(batch), buckets=(1, 2, 5, 10, 20, 50))
+        # Normalement impossible (validés à l'entrée), mais on le saura
+        for status in statuses:
+            if status != MVP_VOTE_ACCEPTED:
+                metrics.incr("mvp_votes_dropped_total", status=str(status))
+        return len(batch)
+
+    async def flush(self):
+        """Vide le tampon et attend que les votes soient écrits sur disque."""
+        self.flush_now()
+        await self.data.durable()
@@ -0,0 +1,192 @@
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+
+def normalize_name(name: str) -> str:
+    """Minuscules + sans accents : "Éloïse " -> "eloise"."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int | None:
+    """
+    Distance d'édition entre a et b (une inversion de deux lettres compte 1),
+    ou None si elle dépasse `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            cost = min(
+                previous[j] + 1,               # suppression
+                current[j - 1] + 1,            # insertion
+                previous[j - 1] + (ca != cb),  # substitution
+            )
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)  # inversion
+            current.append(cost)
+        # Toute la ligne dépasse déjà la borne : inutile de continuer
+        if min(current) > max_distance:
+            return None
+        before, previous = previous, current
+    distance = previous[-1]
+    return distance if distance <= max_distance else None
+
+
+def trigrams(key: str) -> set[str]:
+    """Trigrammes d'un nom normalisé, avec padding (façon pg_trgm)."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Index en mémoire des pseudos des joueurs.
+
+    - exact : nom normalisé -> ids (résolution en O(1))
+    - préfixe : liste triée des noms normalisés + bisect
+    - approximatif : index inversé trigramme -> ids
+
+    Mis à jour joueur par joueur (add/remove), jamais reconstruit
+    en entier sauf au chargement.
+    """
+
+    def __init__(self):
+        self._names: dict[int, str] = {}          # id -> nom affiché
+        self._keys: dict[int, str] = {}           # id -> nom normalisé
+        self._by_key: dict[str, list[int]] = {}   # nom normalisé -> ids
+        self._sorted: list[tuple[str, int]] = []  # (nom normalisé, id), trié
+        self._trigrams: dict[str, set[int]] = {}  # trigramme -> ids
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, pid: int):
+        return pid in self._keys
+
+    def build(self, players: dict):
+        """(Re)construit l'index depuis data["players"]."""
+        self.__init__()
+        for pid, player in players.items():
+            self.add(int(pid), player.get("name", ""))
+
+    def add(self, pid: int, name: str):
+        if pid in self._keys:
+            if self._names[pid] == name:
+                return
+            self.remove(pid)
+
+        key = normalize_name(name)
+        self._names[pid] = name
+        self._keys[pid] = key
+        self._by_key.setdefault(key, []).append(pid)
+        insort(self._sorted, (key, pid))
+        for tri in trigrams(key):
+            self._trigrams.setdefault(tri, set()).add(pid)
+
+    def remove(self, pid: int):
+        key = self._keys.pop(pid, None)
+        if key is None:
+            return
+        del self._names[pid]
+
+        same_name = self._by_key[key]
+        same_name.remove(pid)
+        if not same_name:
+            del self._by_key[key]
+
+        i = bisect_left(self._sorted, (key, pid))
+        if i < len(self._sorted) and self._sorted[i] == (key, pid):
+            del self._sorted[i]
+
+        for tri in trigrams(key):
+            ids = self._trigrams.get(tri)
+            if ids is not None:
+                ids.discard(pid)
+                if not ids:
+                    del self._trigrams[tri]
+
+    def name(self, pid: int) -> str | None:
+        return self._names.get(pid)
+
+    def lookup(self, name: str) -> int | None:
+        """Id du joueur portant ce nom (casse et accents ignorés), sinon None."""
+        ids = self._by_key.get(normalize_name(name))
+        return ids[0] if ids else None
+
+    def prefix(self, query: str, limit: int = 25) -> list[int]:
+        key = normalize_name(query)
+        i = bisect_left(self._sorted, (key,))
+        out = []
+        while i < len(self._sorted) and len(out) < limit:
+            k, pid = self._sorted[i]
+            if not k.startswith(key):
+                break
+            out.append(pid)
+            i += 1
+        return out
+
+    def fuzzy(self, query: str, limit: int = 25, min_score: float = 0.2) -> list[int]:
+        """Ids classés par similarité trigramme (Jaccard) avec la requête."""
+        key = normalize_name(query)
+        if not key:
+            return []
+        query_tris = trigrams(key)
+
+        shared: Counter[int] = Counter()
+        for tri in query_tris:
+            shared.update(self._trigrams.get(tri, ()))
+
+        scored = []
+        for pid, common in shared.items():
+            cand_size = len(self._keys[pid]) + 1  # nb de trigrammes d'un nom paddé
+            score = common / (len(query_tris) + cand_size - common)
+            if score >= min_score:
+                scored.append((-score, self._keys[pid], pid))
+
+        scored.sort()
+        return [pid for _s, _k, pid in scored[:limit]]
+
+    def search(self, query: str, limit: int = 25) -> list[tuple[int, str]]:
+        """Préfixe d'abord, complété par les correspondances approximatives."""
+        ids = self.prefix(query, limit)
+        if len(ids) < limit:
+            seen = set(ids)
+            for pid in self.fuzzy(query, limit):
+                if pid not in seen:
+                    ids.append(pid)
+                    seen.add(pid)
+                    if len(ids) >= limit:
+                        break
+        return [(pid, self._names[pid]) for pid in ids]
+
+    def suggest(self, query: str, limit: int = 3) -> list[str]:
+        """
+        Noms les plus proches de `query` ("tu voulais dire ...").
+        Distance d'édition bornée, calculée seulement sur les candidats
+        qui partagent des trigrammes avec la requête.
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+        max_distance = max(1, min(3, len(key) // 3))
+
+        scored = []
+        for pid in self.fuzzy(query, limit=50, min_score=0.1):
+            distance = bounded_levenshtein(key, self._keys[pid], max_distance)
+            if distance is not None:
+                scored.append((distance, self._keys[pid], pid))
+
+        scored.sort()
+        names = []
+        for _d, _k, pid in scored:
+            if self._names[pid] not in names:
+                names.append(self._names[pid])
+                if len(names) >= limit:
+                    break
+        return names
@@ -0,0 +1,111 @@
+"""
+Statistiques par paire de joueurs, tenues à jour à chaque résultat.
+
+  - ensemble : matchs joués dans la même équipe, victoires, nuls
+  - face à face : matchs joués l'un contre l'autre, victoires de chacun
+
+Matrices creuses : seules les paires qui ont déjà joué ensemble (ou l'une
+contre l'autre) ont une entrée. Un résultat coûte O(équipe²) ; un recalcul
+complet est un seul passage sur l'historique.
+"""
+from itertools import combinations
+
+# Matchs "virtuels" à 50 % ajoutés avant de calculer une synergie : une paire
+# qui a gagné ses 2 seuls matchs ensemble n'est pas encore une paire à séparer
+SYNERGY_PRIOR = 4
+
+
+def _pair(a: int, b: int) -> tuple[int, int]:
+    return (a, b) if a < b else (b, a)
+
+
+class PairStats:
+    """
+    together[(a, b)] = [matchs, victoires, nuls]            (a < b)
+    against[(a, b)]  = [matchs, victoires de a, victoires de b]  (a < b)
+    Les invités (id <= 0) ne sont pas comptés.
+    """
+
+    def __init__(self):
+        self.together: dict[tuple[int, int], list[int]] = {}
+        self.against: dict[tuple[int, int], list[int]] = {}
+
+    @classmethod
+    def from_matches(cls, matches) -> "PairStats":
+        """Recalcul complet à partir des matchs (itérable), en un passage."""
+        stats = cls()
+        for match in matches:
+            if match.get("result_recorded"):
+                stats.apply(match["team_a"], match["team_b"], match["score_a"], match["score_b"])
+        return stats
+
+    def apply(self, team_a, team_b, score_a: int, score_b: int, sign: int = 1):
+        """Ajoute (sign=1) ou retire (sign=-1) le résultat d'un match."""
+        known_a = [pid for pid in team_a if pid > 0]
+        known_b = [pid for pid in team_b if pid > 0]
+
+        for team, own, other in ((known_a, score_a, score_b), (known_b, score_b, score_a)):
+            won, drew = int(own > other), int(own == other)
+            for a, b in combinations(team, 2):
+                self._add(self.together, _pair(a, b), sign, won, drew)
+
+        for a in known_a:
+            for b in known_b:
+                a_won, b_won = int(score_a > score_b), int(score_b > score_a)
+                if a > b:
+                    a, b, a_won, b_won = b, a, b_won, a_won
+                self._add(self.against, (a, b), sign, a_won, b_won)
+
+    @staticmethod
+    def _add(matrix: dict, key: tuple[int, int], sign: int, x: int, y: int):
+        cell = matrix.get(key)
+        if cell is None:
+            cell = matrix[key] = [0, 0, 0]
+        cell[0] += sign
+        cell[1] += sign * x
+        cell[2] += sign * y
+        if cell[0] <= 0:
+            del matrix[key]
+
+    # ---------- LECTURE ----------
+
+    def duo(self, a: int, b: int) -> dict:
+        """Bilan de a et b dans la même équipe."""
+        games, wins, draws = self.together.get(_pair(a, b), (0, 0, 0))
+        return {
+            "matches": games,
+            "wins": wins,
+            "draws": draws,
+            "losses": games - wins - draws,
+            "win_rate": wins / games if games else 0.0,
+        }
+
+    def rivalry(self, a: int, b: int) -> dict:
+        """Bilan de a contre b (victoires vues du côté de a)."""
+        games, first, second = self.against.get(_pair(a, b), (0, 0, 0))
+        wins_a, wins_b = (first, second) if a < b else (second, first)
+        return {
+            "matches": games,
+            "wins_a": wins_a,
+            "wins_b": wins_b,
+            "draws": games - wins_a - wins_b,
+            "win_rate_a": wins_a / games if games else 0.0,
+        }
+
+    def synergy(self, a: int, b: int) -> float:
+        """
+        Écart au hasard du taux de "victoire" ensemble (nul = ½), lissé par
+        SYNERGY_PRIOR : entre -0.5 (perdent toujours) et +0.5 (gagnent toujours).
+        """
+        games, wins, draws = self.together.get(_pair(a, b), (0, 0, 0))
+        return (wins + draws / 2 + SYNERGY_PRIOR / 2) / (games + SYNERGY_PRIOR) - 0.5
+
+    def synergy_matrix(self, ids) -> dict[tuple[int, int], float]:
+        """Synergies non nulles entre les joueurs de `ids` (pour balance_teams)."""
+        out = {}
+        for a, b in combinations(ids, 2):
+            if a > 0 and b > 0 and _pair(a, b) in self.together:
+                value = self.synergy(a, b)
+                if value:
+                    out[_pair(a, b)] = value
+        return out
@@ -0,0 +1,219 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# Colonnes typées : entiers 64 bits, flottants, chaînes (internées)
+INT_FIELDS = (
+    "id", "tir", "passes", "physique", "influence", "gardien",
+    "wins", "losses", "draws", "matches", "goals", "assists", "mvps",
+)
+FLOAT_FIELDS = ("rating", "points")
+STR_FIELDS = ("name", "card_color", "card_tagline", "card_border")
+
+FIELDS = ("id", "name", "rating", "tir", "passes", "physique", "influence", "gardien",
+          "points", "wins", "losses", "draws", "matches", "goals", "assists", "mvps",
+          "card_color", "card_tagline", "card_border")
+
+_DEFAULTS = {**{f: 0 for f in INT_FIELDS}, **{f: 0.0 for f in FLOAT_FIELDS}, **{f: "" for f in STR_FIELDS}}
+
+
+def _as_int(field: str, value) -> int:
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"'{field}' attend un entier, reçu {value!r}")
+        return int(value)
+    return int(value)
+
+
+class Player:
+    """
+    Vue légère sur une ligne du PlayerStore, utilisable comme le dict d'un
+    joueur (`p["goals"]`, `p.get(...)`, `p["goals"] += 1`, `"name" in p`).
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "PlayerStore", row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str):
+        return self._store._get(self._row, key)
+
+    def __setitem__(self, key: str, value):
+        self._store._set(self._row, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._store._columns or key in self._store._extras[self._row]
+
+    def __iter__(self):
+        yield from FIELDS
+        yield from self._store._extras[self._row]
+
+    def __len__(self) -> int:
+        return len(FIELDS) + len(self._store._extras[self._row])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Player):
+            return self._store is other._store and self._row == other._row
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._row))
+
+    def __repr__(self) -> str:
+        return f"Player({self.to_dict()!r})"
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def to_dict(self) -> dict:
+        return {k: self[k] for k in self}
+
+
+class PlayerStore(MutableMapping):
+    """
+    Joueurs rangés en colonnes : un `array` par stat numérique, une liste de
+    chaînes internées par champ texte, et un index id (str) → ligne.
+
+    Se manipule comme le dict `players` de data.json (clé = id en str,
+    valeur = vue `Player`), mais les classements et moyennes peuvent
+    travailler directement sur les colonnes contiguës (`column`, `ranked`).
+    Pas de suppression de joueur : le bot n'en fait jamais.
+    """
+
+    def __init__(self):
+        self._columns: dict[str, array | list] = {}
+        for field in INT_FIELDS:
+            self._columns[field] = array("q")
+        for field in FLOAT_FIELDS:
+            self._columns[field] = array("d")
+        for field in STR_FIELDS:
+            self._columns[field] = []
+        self._rows: dict[str, int] = {}
+        self._keys: list[str] = []
+        self._extras: list[dict] = []   # clés inconnues (anciens / futurs champs)
+
+    @classmethod
+    def from_dicts(cls, players: dict) -> "PlayerStore":
+        store = cls()
+        for pid, player in players.items():
+            store[pid] = player
+        return store
+
+    def to_dicts(self) -> dict[str, dict]:
+        columns = [self._columns[f] for f in FIELDS]
+        out = {}
+        for pid, values, extras in zip(self._keys, zip(*columns), self._extras):
+            player = dict(zip(FIELDS, values))
+            if player["points"].is_integer():
+                player["points"] = int(player["points"])
+            if extras:
+                player.update(extras)
+            out[pid] = player
+        return out
+
+    # ---------- ACCÈS CELLULE ----------
+
+    def _get(self, row: int, key: str):
+        column = self._columns.get(key)
+        if column is None:
+            return self._extras[row][key]
+        value = column[row]
+        # Les points restent entiers tant qu'aucun MVP partagé n'est tombé :
+        # on garde l'affichage "3" plutôt que "3.0", comme avec les dicts
+        if key == "points" and value.is_integer():
+            return int(value)
+        return value
+
+    def _set(self, row: int, key: str, value):
+        column = self._columns.get(key)
+        if column is None:
+            self._extras[row][key] = value
+        elif key in STR_FIELDS:
+            column[row] = sys.intern(str(value))
+        elif key in FLOAT_FIELDS:
+            column[row] = float(value)
+        else:
+            column[row] = _as_int(key, value)
+
+    # ---------- MAPPING ----------
+
+    def __getitem__(self, pid: str) -> Player:
+        return Player(self, self._rows[pid])
+
+    def __setitem__(self, pid: str, player):
+        """Ajoute (ou écrase) un joueur à partir d'un dict / d'une vue."""
+        row = self._rows.get(pid)
+        if row is None:
+            row = len(self._keys)
+            self._rows[pid] = row
+            self._keys.append(pid)
+            self._extras.append({})
+            for field, column in self._columns.items():
+                column.append(sys.intern("") if field in STR_FIELDS else _DEFAULTS[field])
+
+        values = dict(player)
+        values.setdefault("id", int(pid))
+        for key, value in values.items():
+            self._set(row, key, value)
+
+    def __delitem__(self, pid: str):
+        raise TypeError("PlayerStore ne supporte pas la suppression de joueurs")
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, pid) -> bool:
+        return pid in self._rows
+
+    def values(self):
+        return [Player(self, row) for row in range(len(self._keys))]
+
+    def items(self):
+        return [(pid, Player(self, row)) for row, pid in enumerate(self._keys)]
+
+    # ---------- ANALYTIQUE ----------
+
+    def column(self, field: str) -> array | list:
+        """Colonne brute (ne pas modifier) : array('q') / array('d') / list[str]."""
+        return self._columns[field]
+
+    def ranked(self, *keys, by_name: bool = True) -> list[Player]:
+        """
+        Joueurs triés par ordre décroissant sur `keys` (noms de colonnes ou
+        séquences déjà calculées, une valeur par ligne).
+        Égalités : nom en minuscules (même ordre que le tri sur les dicts,
+        reverse=True), sinon ordre d'inscription.
+        """
+        columns = [self._columns[k] if isinstance(k, str) else k for k in keys]
+        n = len(self._keys)
+        if by_name:
+            tie = [name.lower() for name in self._columns["name"]]
+        else:
+            tie = range(0, -n, -1)
+        order = sorted(zip(*columns, tie, range(n)), reverse=True)
+        return [Player(self, entry[-1]) for entry in order]
+
+    def mean(self, field: str, pids) -> float:
+        """Moyenne d'une stat sur un groupe de joueurs (ex: une équipe)."""
+        column = self._columns[field]
+        rows = [self._rows[str(pid)] for pid in pids if str(pid) in self._rows]
+        if not rows:
+            return 0.0
+        return sum(column[r] for r in rows) / len(rows)
@@ -0,0 +1,103 @@
+import cProfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Nb d'allocations (par ligne) gardées dans le rapport tracemalloc
+TOP_ALLOCATIONS = 30
+
+# Profondeur de pile enregistrée par tracemalloc
+TRACEMALLOC_FRAMES = 10
+
+
+class CommandProfiler:
+    """
+    Profilage à la demande des slash commands.
+
+    Un admin "arme" une commande pour ses N prochaines exécutions : chacune
+    est encadrée par cProfile et tracemalloc, puis on écrit dans `out_dir` :
+      - <commande>_<horodatage>.pstats (à ouvrir avec pstats / snakeviz)
+      - <commande>_<horodatage>_alloc.txt (top des allocations)
+
+    Une seule exécution est profilée à la fois (cProfile n'aime pas
+    l'imbrication) ; les autres passent sans profilage.
+    cProfile mesure tout le thread : une autre commande qui tourne en
+    même temps apparaîtra aussi dans le profil.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = Path(out_dir)
+        self.armed: dict[str, int] = {}  # commande -> exécutions restantes
+        self._active: dict | None = None
+
+    def arm(self, command: str, count: int):
+        if count <= 0:
+            self.armed.pop(command, None)
+        else:
+            self.armed[command] = count
+
+    def begin(self, interaction_id: int, command: str) -> bool:
+        if self._active is not None or self.armed.get(command, 0) <= 0:
+            return False
+
+        self.armed[command] -= 1
+        if self.armed[command] <= 0:
+            del self.armed[command]
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = None if started_tracing else tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+
+        profile = cProfile.Profile()
+        self._active = {
+            "interaction_id": interaction_id,
+            "command": command,
+            "profile": profile,
+            "before": before,
+            "started_tracing": started_tracing,
+            "started": time.perf_counter(),
+        }
+        profile.enable()
+        return True
+
+    def end(self, interaction_id: int) -> Path | None:
+        """Termine le profil de cette interaction et écrit les rapports. Renvoie le .pstats."""
+        active = self._active
+        if active is None or active["interaction_id"] != interaction_id:
+            return None
+        self._active = None
+
+        active["profile"].disable()
+        elapsed = time.perf_counter() - active["started"]
+
+        after = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        _current, peak = tracemalloc.get_traced_memory()
+        if active["started_tracing"]:
+            tracemalloc.stop()
+
+        if active["before"] is not None:
+            stats = after.compare_to(active["before"], "lineno")
+        else:
+            stats = after.statistics("lineno")
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        base = self.out_dir / f"{active['command']}_{stamp}_{interaction_id}"
+
+        pstats_path = base.with_suffix(".pstats")
+        active["profile"].dump_stats(pstats_path)
+
+        with open(f"{base}_alloc.txt", "w", encoding="utf-8") as f:
+            f.write(f"Commande : /{active['command']}\n")
+            f.write(f"Durée : {elapsed:.3f}s\n")
+            f.write(f"Pic mémoire tracé : {peak / 1024:.1f} Ko\n\n")
+            f.write(f"Top {TOP_ALLOCATIONS} allocations (par ligne) :\n")
+            for stat in stats[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+        return pstats_path
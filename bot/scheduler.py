@@ -0,0 +1,101 @@
+import asyncio
+import heapq
+import time
+import traceback
+
+from metrics import registry as metrics
+
+
+class Scheduler:
+    """
+    Tâches différées persistées (clôture auto du MVP, rappels…).
+
+    Chaque tâche a une clé unique (ex: "mvp_close:42"), un type, une échéance
+    (timestamp) et un payload ; elles sont stockées dans data["jobs"] via le
+    DataManager, et un tas (échéance, clé) en mémoire donne la prochaine.
+    Au démarrage on ne relit que data["jobs"], jamais les matchs.
+
+    Les cogs déclarent ce qu'il faut faire pour un type avec `register` ;
+    une tâche dont le type n'a pas de handler reste stockée (cog non chargé).
+    """
+
+    def __init__(self, data_manager, ready=None):
+        self.data = data_manager
+        self._ready = ready
+        self._handlers: dict[str, callable] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def register(self, kind: str, handler):
+        """handler : coroutine appelée avec (payload) à l'échéance."""
+        self._handlers[kind] = handler
+
+    # ---------- PLANIFICATION ----------
+
+    def schedule(self, key: str, kind: str, delay: float, payload: dict | None = None):
+        """Planifie (ou replanifie) la tâche `key` dans `delay` secondes."""
+        due = time.time() + delay
+        self.data.add_job(key, kind, due, payload or {})
+        heapq.heappush(self._heap, (due, key))
+        if self._wake is not None:
+            self._wake.set()
+
+    def cancel(self, *keys: str):
+        """Annule des tâches ; leur entrée dans le tas sera ignorée."""
+        for key in keys:
+            self.data.remove_job(key)
+
+    # ---------- BOUCLE ----------
+
+    def start(self):
+        self._heap = [(job["due"], key) for key, job in self.data.get_jobs().items()]
+        heapq.heapify(self._heap)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        if self._ready is not None:
+            await self._ready()
+        while True:
+            self._wake.clear()
+            while self._heap and self._heap[0][0] <= time.time():
+                due, key = heapq.heappop(self._heap)
+                job = self.data.get_job(key)
+                if job is None or job["due"] != due:
+                    # Annulée, ou replanifiée : une autre entrée du tas la porte
+                    continue
+                await self._execute(key, job)
+
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, key: str, job: dict):
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            print(f"⚠️ Tâche {key} : aucun handler pour '{job['kind']}', gardée pour le prochain démarrage.")
+            return
+
+        try:
+            await handler(job["payload"])
+            result = "ok"
+        except Exception:
+            # Pas de nouvel essai : une tâche qui plante replanterait en boucle
+            print(f"❌ Tâche {key} en échec :")
+            traceback.print_exc()
+            result = "error"
+        metrics.incr("scheduler_jobs_total", kind=job["kind"], result=result)
+
+        # Retirée sauf si le handler l'a replanifiée entre-temps
+        current = self.data.get_job(key)
+        if current is not None and current["due"] == job["due"]:
+            self.data.remove_job(key)
+        await self.data.durable()
@@ -0,0 +1,98 @@
+import json
+from abc import ABC, abstractmethod
+
+# Dépendances optionnelles : on s'en sert si elles sont installées
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class Serializer(ABC):
+    """Format de fichier du DataManager : nom, extension, dumps / loads en bytes."""
+
+    name = ""
+    suffix = ""
+
+    @abstractmethod
+    def dumps(self, data) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, raw: bytes):
+        ...
+
+
+class JsonSerializer(Serializer):
+    """JSON compact, via la bibliothèque standard."""
+
+    name = "json"
+    suffix = ".json"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, raw: bytes):
+        return json.loads(raw)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """Même fichier JSON, lu / écrit par orjson (plusieurs fois plus rapide)."""
+
+    name = "orjson"
+
+    def dumps(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, raw: bytes):
+        return orjson.loads(raw)
+
+
+class MsgpackSerializer(Serializer):
+    """Snapshot binaire MessagePack : plus petit et plus rapide à relire que le JSON."""
+
+    name = "msgpack"
+    suffix = ".msgpack"
+
+    def dumps(self, data) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes):
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+def available_serializers() -> dict[str, Serializer]:
+    """Formats utilisables avec les dépendances installées."""
+    out: dict[str, Serializer] = {"json": JsonSerializer()}
+    if orjson is not None:
+        out["orjson"] = OrjsonSerializer()
+    if msgpack is not None:
+        out["msgpack"] = MsgpackSerializer()
+    return out
+
+
+def get_serializer(name: str = "json") -> Serializer:
+    """
+    "json" → orjson s'il est installé, sinon json standard (même fichier).
+    "msgpack" → nécessite le paquet `msgpack`.
+    """
+    name = (name or "json").lower()
+    serializers = available_serializers()
+    if name == "json":
+        return serializers.get("orjson", serializers["json"])
+    if name not in serializers:
+        raise ValueError(
+            f"Format de données '{name}' indisponible "
+            f"(installés : {', '.join(sorted(serializers))}). Pour msgpack : pip install msgpack"
+        )
+    return serializers[name]
+
+
+def serializer_for(path) -> Serializer:
+    """Format d'un fichier existant, d'après son extension."""
+    return get_serializer("msgpack" if str(path).endswith(".msgpack") else "json")